@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CatalogConfig(AppConfig):
     name = 'catalog'
+
+    def ready(self):
+        from catalog.counts import connect_signals
+        connect_signals()
@@ -0,0 +1,82 @@
+"""
+Linking the author names of a paper to the people in the DB.
+
+The candidates for an author name are the people in the same block, i.e., with the same
+last name and first initial (see catalog/names.py), found with an index seek on
+Person.block_key. Among the candidates with a compatible name, a person is chosen if
+
+- they have written papers with the other authors of the paper; the candidate with the
+  most such co-authors wins, or
+- otherwise, they are the only candidate with exactly the same name.
+
+If two people have the same name and neither has written with the co-authors, or the
+name only matches loosely, e.g., "A. Grover" and "Aditya Grover", the author is
+ambiguous and is not linked to anyone rather than to the wrong person.
+"""
+from catalog.backends import get_backend
+from catalog.models import Person
+from catalog.names import split_name, name_key, block_key, names_compatible
+
+
+# At most this many people with the same last name and first initial are compared
+MAX_CANDIDATES = 100
+
+
+def find_candidates(first_name, middle_name, last_name):
+    """
+    :return: <list> The people whose names are compatible with the given name.
+    """
+    nodes = get_backend().match_nodes("Person", dict(block_key=[block_key(first_name, last_name)]), MAX_CANDIDATES)
+    people = [Person.inflate(node) for node in nodes]
+
+    return [
+        person for person in people
+        if names_compatible((first_name, middle_name, last_name),
+                            (person.first_name, person.middle_name, person.last_name))
+    ]
+
+
+def co_author_overlap(people, co_authors):
+    """
+    :param people: <list> Person objects.
+    :param co_authors: <list> The names of other authors.
+    :return: <dict> The number of the co_authors each person has written a paper with, by
+    node ID, for the people with at least one.
+    """
+    keys = [name_key(*split_name(name)) for name in co_authors if name.strip()]
+    if len(people) == 0 or len(keys) == 0:
+        return {}
+
+    return get_backend().count_co_authors([person.id for person in people], keys)
+
+
+def resolve_author(author, co_authors=()):
+    """
+    Finds the person an author name refers to.
+    :param author: <str> The author's name, e.g., "Aditya Grover".
+    :param co_authors: <list> The names of the other authors of the same paper.
+    :return: <tuple> (person, ambiguous) where person is the Person the name refers to, or
+    None if there is no such person or it is ambiguous who the name refers to.
+    """
+    first_name, middle_name, last_name = split_name(author)
+    candidates = find_candidates(first_name, middle_name, last_name)
+    if len(candidates) == 0:
+        return None, False
+
+    key = name_key(first_name, middle_name, last_name)
+    exact = {
+        person.id: name_key(person.first_name, person.middle_name, person.last_name) == key for person in candidates
+    }
+    overlap = co_author_overlap(candidates, [name for name in co_authors if name.strip() != author.strip()])
+    if len(overlap) > 0:
+        # more shared co-authors first, then an exact name match
+        scores = {person.id: (overlap.get(person.id, 0), exact[person.id]) for person in candidates}
+        best = max(candidates, key=lambda person: scores[person.id])
+        if list(scores.values()).count(scores[best.id]) == 1:
+            return best, False
+
+    exact_matches = [person for person in candidates if exact[person.id]]
+    if len(exact_matches) == 1:
+        return exact_matches[0], False
+
+    return None, True
@@ -0,0 +1,44 @@
+"""
+Storage backends for the graph of papers, people, venues, etc.
+
+The helpers that the views use to read and link nodes go through the backend in the
+GRAPH_BACKEND setting, i.e., counting nodes (catalog/counts.py), linking nodes
+(catalog/linking.py), pages of nodes (catalog/pagination.py), loading nodes with their
+neighbours and neighbourhoods (catalog/queries.py), searching papers and people and
+autocomplete (catalog/search.py) and matching authors to people (catalog/authors.py).
+
+- catalog.backends.neo4j.Neo4jBackend, the default, stores the graph in Neo4j, and
+- catalog.backends.memory.MemoryBackend keeps it in the memory of the process, so tests
+  and benchmarks of these helpers and of the views built on them need no Neo4j server.
+
+With the memory backend, these views work without Neo4j:
+
+- home, and papers_index, persons_index, venues_index, datasets_index and codes_index,
+  with their searches for papers but not the searches for people, venues, datasets or codes,
+- paper_find and autocomplete,
+- paper_detail, paper_ego_network, person_detail, venue_detail and graph_neighbourhood,
+- paper_connect_author_selected, paper_connect_paper_selected, paper_connect_code_selected
+  and paper_connect_selected.
+
+Models saved with neomodel, e.g., Paper().save(), the create, update and delete views,
+and the other views with their own Cypher queries always use Neo4j.
+"""
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+DEFAULT_BACKEND = "catalog.backends.neo4j.Neo4jBackend"
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_backend():
+    """
+    :return: The instance of the backend in the GRAPH_BACKEND setting. There is one
+    instance of every backend class per process.
+    """
+    return _load_backend(getattr(settings, "GRAPH_BACKEND", DEFAULT_BACKEND))
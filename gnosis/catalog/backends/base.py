@@ -0,0 +1,229 @@
+from catalog.names import person_keys, title_key
+
+
+class GraphBackend:
+    """
+    The operations on the graph that the catalog needs from a storage backend.
+
+    Nodes are returned as objects with the attributes of the nodes of the Neo4j driver,
+    id, labels and properties, so that they can be inflated into models, e.g.,
+    Paper.inflate(node).
+    """
+
+    def transaction(self):
+        """
+        :return: A context manager for a block of operations that are applied together.
+        """
+        raise NotImplementedError
+
+    #
+    # Nodes
+    #
+    def create_node(self, label, properties):
+        """
+        :param label: The label of the node, e.g., Paper.
+        :param properties: <dict> The deflated properties of the node.
+        :return: The new node.
+        """
+        raise NotImplementedError
+
+    def get_node(self, node_id, label=None):
+        """
+        :param node_id: <int> The ID of the node.
+        :param label: If given, the node must have this label.
+        :return: The node or None if there is no such node.
+        """
+        raise NotImplementedError
+
+    def get_nodes(self, node_ids, label=None, neighbours=()):
+        """
+        :param node_ids: <list> The IDs of the nodes.
+        :param label: If given, the nodes must have this label.
+        :param neighbours: <list> (relationship type, label, outgoing) tuples, as for get_page.
+        :return: <list> (node, neighbour lists) tuples for the nodes that exist, in the
+        same order as node_ids.
+        """
+        raise NotImplementedError
+
+    def match_nodes(self, label, properties, limit):
+        """
+        :param label: The label of the nodes, e.g., Person.
+        :param properties: <dict> property name -> <list> of values. A node matches if the
+        value of every one of these properties is in its list, e.g., {"block_key": [key]}.
+        :param limit: <int> The maximum number of nodes to return.
+        :return: <list> The matching nodes.
+        """
+        raise NotImplementedError
+
+    def get_page(self, label, cursor, page_size, neighbours=()):
+        """
+        Retrieves one page of the nodes with a label ordered by (created, ID) from newest
+        to oldest, see catalog/pagination.py.
+        :param label: The label of the nodes, e.g., Paper.
+        :param cursor: <str> The cursor of the page or None for the first page.
+        :param page_size: <int> The number of nodes in a page.
+        :param neighbours: <list> (relationship type, label, outgoing) tuples, e.g.,
+        ("authors", "Person", False) for the authors of papers.
+        :return: <tuple> (rows, next_cursor) where rows is a list of (node, neighbour lists)
+        tuples, with a list of the neighbour nodes for every tuple in neighbours in the same
+        order, and next_cursor is None on the last page.
+        """
+        raise NotImplementedError
+
+    def update_node(self, node_id, properties):
+        """
+        Sets some of the properties of a node. Properties set to None are removed.
+        :param node_id: <int> The ID of the node.
+        :param properties: <dict> The deflated properties to set.
+        :return: The updated node or None if there is no such node.
+        """
+        raise NotImplementedError
+
+    def delete_node(self, node_id):
+        """
+        Deletes a node and all its relationships.
+        :param node_id: <int> The ID of the node.
+        :return: <bool> False if there was no such node.
+        """
+        raise NotImplementedError
+
+    def count_nodes(self, label):
+        """
+        :param label: A node label, e.g., Paper.
+        :return: <int> The number of nodes with the label.
+        """
+        raise NotImplementedError
+
+    def create_nodes(self, label, properties):
+        """
+        Creates many nodes with the same label at once, e.g., to load a large catalog.
+        :param label: The label of the nodes, e.g., Paper.
+        :param properties: <list> The deflated properties of every node.
+        :return: <list> The IDs of the new nodes in the same order.
+        """
+        raise NotImplementedError
+
+    def create(self, model, **properties):
+        """
+        Creates a node from the properties of a model, including the default values of
+        the properties that are not given.
+        :param model: The neomodel class of the node, e.g., Paper.
+        :return: The model object of the new node.
+        """
+        properties = model.deflate(properties, skip_empty=True)
+        if model.__label__ == "Person":
+            # the name keys are set by Person.pre_save, which is not called here
+            properties.update(person_keys(
+                properties.get("first_name"), properties.get("middle_name"), properties.get("last_name")
+            ))
+        elif model.__label__ == "Paper":
+            # as is the title key by Paper.pre_save
+            properties["title_key"] = title_key(properties.get("title"))
+        node = self.create_node(model.__label__, properties)
+        return model.inflate(node)
+
+    #
+    # Relationships
+    #
+    def merge_relationships(self, relationship, source_label, target_label, pairs):
+        """
+        Adds the relationships of the given type that do not exist already.
+        :param relationship: The type of the relationships, e.g., authors.
+        :param source_label: The label that the source nodes must have, e.g., Person.
+        :param target_label: The label that the target nodes must have, e.g., Paper.
+        :param pairs: <list> Distinct (source ID, target ID) pairs.
+        :return: <list> (source ID, target ID, added) for the pairs whose nodes exist with
+        the right labels, where added is False if the relationship existed already.
+        """
+        raise NotImplementedError
+
+    def create_relationships(self, relationship, pairs):
+        """
+        Adds a relationship of the given type for every pair without checking whether it
+        exists already, e.g., between nodes that were just created.
+        :param relationship: The type of the relationships, e.g., cites.
+        :param pairs: <list> (source ID, target ID) pairs of existing nodes.
+        """
+        raise NotImplementedError
+
+    def sample_relationships(self, node_ids, relationship_types=None, fan_out=50):
+        """
+        Retrieves a random sample of the relationships of some nodes in either direction.
+        :param node_ids: <list> The IDs of the nodes.
+        :param relationship_types: <list> Only relationships of these types, or all if None.
+        :param fan_out: <int> The maximum number of relationships of each node.
+        :return: <list> (source ID, target ID, relationship type, node at the other end)
+        tuples.
+        """
+        raise NotImplementedError
+
+    def count_co_authors(self, person_ids, name_keys):
+        """
+        :param person_ids: <list> The IDs of some people.
+        :param name_keys: <list> The name_key values of other people.
+        :return: <dict> For every one of the people with at least one, the number of the
+        people with the name keys that they have written a paper with, by node ID.
+        """
+        raise NotImplementedError
+
+    def get_node_with_neighbours(self, node_id, label=None):
+        """
+        :param node_id: <int> The ID of the node.
+        :param label: If given, the node must have this label.
+        :return: <tuple> (node, neighbours) where node is None if there is no such node and
+        neighbours is a list of (neighbour node, relationship type, outgoing) tuples for
+        every relationship of the node, with outgoing True if it points from the node to
+        the neighbour.
+        """
+        raise NotImplementedError
+
+    #
+    # Search
+    #
+    def search_nodes(self, index_name, query_string, skip=0, limit=25, field=None):
+        """
+        Finds the nodes of a full-text index in catalog.search.SEARCH_INDEXES with all the
+        words of a query, ignoring English stopwords, where the last word may be the
+        beginning of a word.
+        :param index_name: The name of the index, e.g., paper_search.
+        :param query_string: The text to search for.
+        :param skip: <int> The number of best matches to leave out.
+        :param limit: <int> The maximum number of nodes to return.
+        :param field: If given, only this property is searched, otherwise all the
+        properties of the index.
+        :return: <list> The nodes ranked from best to worst match.
+        """
+        raise NotImplementedError
+
+    def search_names(self, index_name, query_string, name_property, limit=10, field=None):
+        """
+        Like search_nodes but only reads the ID and one property of every node, e.g., to
+        suggest names while a user types.
+        :param name_property: The property to return, e.g., title.
+        :return: <list> (node ID, value of name_property) tuples from best to worst match.
+        """
+        raise NotImplementedError
+
+    def find_prefixes(self, label, properties, tokens, limit):
+        """
+        Finds the nodes with a property that starts with one of the tokens, with an index
+        seek per property in Neo4j.
+        :param label: The label of the nodes, e.g., Person.
+        :param properties: <list> The names of the properties, e.g., last_name_key.
+        :param tokens: <list> The beginnings of the values.
+        :param limit: <int> At most this many matches are returned per property.
+        :return: <list> (node ID, token, whole, property) tuples for every match, where
+        whole is True if the value is the whole token.
+        """
+        raise NotImplementedError
+
+    def search_similar(self, index_name, tokens, limit):
+        """
+        Finds the nodes of a full-text index with words spelled similarly to any of the
+        tokens, i.e., at most two edits away.
+        :param index_name: The name of the index, e.g., person_search.
+        :param tokens: <list> Folded words, only letters and digits.
+        :param limit: <int> The maximum number of nodes to return.
+        :return: <list> The nodes ranked from best to worst match.
+        """
+        raise NotImplementedError
@@ -0,0 +1,311 @@
+import itertools
+import random
+import threading
+from collections import defaultdict
+from nltk.corpus import stopwords
+from catalog.backends.base import GraphBackend
+from catalog.names import fold
+from catalog.pagination import decode_cursor, split_page
+from catalog.search import SEARCH_INDEXES
+
+
+class Node:
+    """
+    A node with the attributes of the nodes of the Neo4j driver.
+    """
+    __slots__ = ("id", "labels", "properties")
+
+    def __init__(self, node_id, labels, properties):
+        self.id = node_id
+        self.labels = set(labels)
+        self.properties = properties
+
+    def __repr__(self):
+        return "<Node id={} labels={} properties={}>".format(self.id, self.labels, self.properties)
+
+
+def _words(value):
+    # lower case words without accents or punctuation, like the full-text indexes
+    return fold(value).split() if isinstance(value, str) else []
+
+
+def _similar(word, token, max_edits=2):
+    # True if the word is at most max_edits insertions, deletions or substitutions away
+    # from the token, like a fuzzy query token~ of the full-text indexes
+    if abs(len(word) - len(token)) > max_edits:
+        return False
+    previous = list(range(len(token) + 1))
+    for i, c in enumerate(word, 1):
+        current = [i]
+        for j, t in enumerate(token, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (c != t)))
+        if min(current) > max_edits:
+            return False
+        previous = current
+    return previous[-1] <= max_edits
+
+
+class MemoryBackend(GraphBackend):
+    """
+    Keeps the graph in dictionaries in the memory of the process. It is meant for tests and
+    benchmarks; the graph is lost when the process ends and a transaction only keeps other
+    threads out, it does not roll back the operations of a block that fails.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all nodes and relationships.
+        """
+        with self._lock:
+            self._ids = itertools.count()
+            self._nodes = {}  # node ID -> Node
+            self._labels = defaultdict(set)  # label -> node IDs
+            # node ID -> relationship type -> IDs of the nodes at the other end
+            self._outgoing = defaultdict(lambda: defaultdict(set))
+            self._incoming = defaultdict(lambda: defaultdict(set))
+
+    def transaction(self):
+        return self._lock
+
+    #
+    # Nodes
+    #
+    def create_node(self, label, properties):
+        with self._lock:
+            node = Node(next(self._ids), [label], {k: v for k, v in properties.items() if v is not None})
+            self._nodes[node.id] = node
+            self._labels[label].add(node.id)
+            return node
+
+    def create_nodes(self, label, properties):
+        with self._lock:
+            return [self.create_node(label, node_properties).id for node_properties in properties]
+
+    def get_node(self, node_id, label=None):
+        node = self._nodes.get(node_id)
+        if node is None or (label is not None and label not in node.labels):
+            return None
+        return node
+
+    def _neighbours(self, node_id, relationship, label, outgoing):
+        ends = self._outgoing if outgoing else self._incoming
+        return [
+            self._nodes[other] for other in sorted(ends.get(node_id, {}).get(relationship, ()))
+            if label in self._nodes[other].labels
+        ]
+
+    def _with_neighbours(self, node, neighbours):
+        return node, [self._neighbours(node.id, *neighbour) for neighbour in neighbours]
+
+    def get_nodes(self, node_ids, label=None, neighbours=()):
+        with self._lock:
+            nodes = [self.get_node(node_id, label) for node_id in node_ids]
+            return [self._with_neighbours(node, neighbours) for node in nodes if node is not None]
+
+    def match_nodes(self, label, properties, limit):
+        matches = []
+        with self._lock:
+            for node_id in self.node_ids(label):
+                node = self._nodes[node_id]
+                if all(node.properties.get(name) in values for name, values in properties.items()):
+                    matches.append(node)
+                    if len(matches) == limit:
+                        break
+
+        return matches
+
+    def get_page(self, label, cursor, page_size, neighbours=()):
+        position = decode_cursor(cursor)
+        with self._lock:
+            keys = [
+                (node.properties["created"], node.id) for node in (self._nodes[i] for i in self.node_ids(label))
+                if node.properties.get("created") is not None
+            ]
+            if position is not None:
+                keys = [key for key in keys if key < position]
+            # one more node than the page size to find out if there is a next page
+            keys = sorted(keys, reverse=True)[:page_size + 1]
+            rows = [self._with_neighbours(self._nodes[node_id], neighbours) for created, node_id in keys]
+
+        return split_page(rows, page_size)
+
+    def update_node(self, node_id, properties):
+        with self._lock:
+            node = self._nodes.get(node_id)
+            if node is None:
+                return None
+            for key, value in properties.items():
+                if value is None:
+                    node.properties.pop(key, None)
+                else:
+                    node.properties[key] = value
+            return node
+
+    def delete_node(self, node_id):
+        with self._lock:
+            node = self._nodes.pop(node_id, None)
+            if node is None:
+                return False
+            for label in node.labels:
+                self._labels[label].discard(node_id)
+            for relationship, targets in self._outgoing.pop(node_id, {}).items():
+                for target in targets:
+                    self._incoming[target][relationship].discard(node_id)
+            for relationship, sources in self._incoming.pop(node_id, {}).items():
+                for source in sources:
+                    self._outgoing[source][relationship].discard(node_id)
+            return True
+
+    def node_ids(self, label):
+        """
+        :return: <list> The IDs of the nodes with the label in the order they were created.
+        """
+        return sorted(self._labels.get(label, ()))
+
+    def count_nodes(self, label):
+        return len(self._labels.get(label, ()))
+
+    #
+    # Relationships
+    #
+    def merge_relationships(self, relationship, source_label, target_label, pairs):
+        merged = []
+        with self._lock:
+            for source, target in pairs:
+                if self.get_node(source, source_label) is None or self.get_node(target, target_label) is None:
+                    continue
+                targets = self._outgoing[source][relationship]
+                merged.append((source, target, target not in targets))
+                targets.add(target)
+                self._incoming[target][relationship].add(source)
+
+        return merged
+
+    def create_relationships(self, relationship, pairs):
+        with self._lock:
+            for source, target in pairs:
+                self._outgoing[source][relationship].add(target)
+                self._incoming[target][relationship].add(source)
+
+    def sample_relationships(self, node_ids, relationship_types=None, fan_out=50):
+        sample = []
+        with self._lock:
+            for node_id in node_ids:
+                edges = [
+                    (node_id, other, relationship, self._nodes[other])
+                    for relationship, others in self._outgoing.get(node_id, {}).items()
+                    for other in others
+                ]
+                edges += [
+                    (other, node_id, relationship, self._nodes[other])
+                    for relationship, others in self._incoming.get(node_id, {}).items()
+                    for other in others
+                ]
+                if relationship_types is not None:
+                    edges = [edge for edge in edges if edge[2] in relationship_types]
+                sample += random.sample(edges, min(fan_out, len(edges)))
+
+        return sample
+
+    def count_co_authors(self, person_ids, name_keys):
+        counts = {}
+        with self._lock:
+            for person_id in person_ids:
+                co_authors = set(
+                    co_author
+                    for paper in self._neighbours(person_id, "authors", "Paper", True)
+                    for co_author in self._neighbours(paper.id, "authors", "Person", False)
+                    if co_author.id != person_id and co_author.properties.get("name_key") in name_keys
+                )
+                if len(co_authors) > 0:
+                    counts[person_id] = len(co_authors)
+
+        return counts
+
+    def get_node_with_neighbours(self, node_id, label=None):
+        with self._lock:
+            node = self.get_node(node_id, label)
+            if node is None:
+                return None, []
+            neighbours = [
+                (self._nodes[target], relationship, True)
+                for relationship, targets in self._outgoing.get(node_id, {}).items()
+                for target in targets
+            ]
+            neighbours += [
+                (self._nodes[source], relationship, False)
+                for relationship, sources in self._incoming.get(node_id, {}).items()
+                for source in sources
+            ]
+
+        return node, neighbours
+
+    #
+    # Search
+    #
+    def search_nodes(self, index_name, query_string, skip=0, limit=25, field=None):
+        english_stopwords = stopwords.words("english")
+        tokens = fold(" ".join(w for w in query_string.lower().split() if w not in english_stopwords)).split()
+        if len(tokens) == 0:
+            return []
+
+        labels, properties = SEARCH_INDEXES[index_name]
+        if field is not None:
+            properties = [field]
+
+        matches = []
+        with self._lock:
+            node_ids = set().union(*(self._labels.get(label, set()) for label in labels))
+            for node_id in sorted(node_ids):
+                node = self._nodes[node_id]
+                words = [word for name in properties for word in _words(node.properties.get(name))]
+                # every word must appear and the last one may be the beginning of a word
+                counts = [words.count(token) for token in tokens[:-1]]
+                counts.append(sum(1 for word in words if word.startswith(tokens[-1])))
+                if all(counts):
+                    # like the full-text indexes, more matches and shorter text rank higher
+                    matches.append(((-sum(counts), len(words), node_id), node))
+
+        matches.sort(key=lambda match: match[0])
+        return [node for rank, node in matches[skip:skip + limit]]
+
+    def search_names(self, index_name, query_string, name_property, limit=10, field=None):
+        return [
+            (node.id, node.properties.get(name_property))
+            for node in self.search_nodes(index_name, query_string, 0, limit, field)
+        ]
+
+    def find_prefixes(self, label, properties, tokens, limit):
+        matches = []
+        with self._lock:
+            for key in properties:
+                key_matches = [
+                    (node_id, token, value == token, key)
+                    for node_id in self.node_ids(label)
+                    for value in [self._nodes[node_id].properties.get(key)]
+                    for token in tokens
+                    if isinstance(value, str) and value.startswith(token)
+                ]
+                matches += key_matches[:limit]
+
+        return matches
+
+    def search_similar(self, index_name, tokens, limit):
+        labels, properties = SEARCH_INDEXES[index_name]
+
+        matches = []
+        with self._lock:
+            node_ids = set().union(*(self._labels.get(label, set()) for label in labels))
+            for node_id in sorted(node_ids):
+                node = self._nodes[node_id]
+                words = [word for name in properties for word in _words(node.properties.get(name))]
+                count = sum(1 for word in words for token in tokens if _similar(word, token))
+                if count > 0:
+                    matches.append(((-count, len(words), node_id), node))
+
+        matches.sort(key=lambda match: match[0])
+        return [node for rank, node in matches[:limit]]
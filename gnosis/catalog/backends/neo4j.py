@@ -0,0 +1,199 @@
+from neomodel import db
+from catalog.backends.base import GraphBackend
+from catalog.pagination import keyset_query, split_page
+from catalog.search import build_search_query
+
+
+def _label(label):
+    return ":" + label if label else ""
+
+
+def _neighbours_query(neighbours):
+    # collects the neighbours of n for every (relationship type, label, outgoing) tuple and
+    # returns them as a list of lists, e.g., [authors, venues], in one query
+    query = ""
+    columns = []
+    for i, (relationship, label, outgoing) in enumerate(neighbours):
+        pattern = "(n)-[:{}]->(m{}:{})" if outgoing else "(n)<-[:{}]-(m{}:{})"
+        query += "OPTIONAL MATCH " + pattern.format(relationship, i, label) + " "
+        query += "WITH " + ", ".join(["n"] + columns + ["collect(m{0}) AS neighbours{0}".format(i)]) + " "
+        columns.append("neighbours{}".format(i))
+
+    return query + "RETURN n, [{}] ".format(", ".join(columns))
+
+
+class Neo4jBackend(GraphBackend):
+    """
+    Stores the graph in the Neo4j database at NEOMODEL_NEO4J_BOLT_URL.
+    """
+
+    def transaction(self):
+        return db.transaction
+
+    def create_node(self, label, properties):
+        query = "CREATE (n:{}) SET n = {{properties}} RETURN n".format(label)
+        results, meta = db.cypher_query(query, dict(properties=properties))
+        return results[0][0]
+
+    def create_nodes(self, label, properties):
+        query = "UNWIND {{rows}} AS properties CREATE (n:{}) SET n = properties RETURN ID(n)".format(label)
+        results, meta = db.cypher_query(query, dict(rows=properties))
+        return [row[0] for row in results]
+
+    def get_node(self, node_id, label=None):
+        query = "MATCH (n{}) WHERE ID(n)={{id}} RETURN n".format(_label(label))
+        results, meta = db.cypher_query(query, dict(id=node_id))
+        return results[0][0] if len(results) > 0 else None
+
+    def get_nodes(self, node_ids, label=None, neighbours=()):
+        query = "UNWIND {{ids}} AS node_id MATCH (n{}) WHERE ID(n)=node_id ".format(_label(label))
+        results, meta = db.cypher_query(query + _neighbours_query(neighbours), dict(ids=list(node_ids)))
+
+        # aggregation does not preserve the order of the UNWIND so restore it here
+        rows = {row[0].id: (row[0], row[1]) for row in results}
+        return [rows[node_id] for node_id in node_ids if node_id in rows]
+
+    def match_nodes(self, label, properties, limit):
+        names = sorted(properties)
+        conditions = " AND ".join("n.{} IN {{values{}}}".format(name, i) for i, name in enumerate(names))
+        params = {"values{}".format(i): list(properties[name]) for i, name in enumerate(names)}
+        params["limit"] = limit
+        results, meta = db.cypher_query(
+            "MATCH (n:{}) WHERE {} RETURN n LIMIT {{limit}}".format(label, conditions or "true"), params
+        )
+        return [row[0] for row in results]
+
+    def get_page(self, label, cursor, page_size, neighbours=()):
+        query, params = keyset_query(label, "n", cursor, page_size)
+        query += _neighbours_query(neighbours) + "ORDER BY n.created DESC, ID(n) DESC"
+        results, meta = db.cypher_query(query, params)
+        return split_page([(row[0], row[1]) for row in results], page_size)
+
+    def update_node(self, node_id, properties):
+        results, meta = db.cypher_query(
+            "MATCH (n) WHERE ID(n)={id} SET n += {properties} RETURN n", dict(id=node_id, properties=properties)
+        )
+        return results[0][0] if len(results) > 0 else None
+
+    def delete_node(self, node_id):
+        results, meta = db.cypher_query(
+            "MATCH (n) WHERE ID(n)={id} DETACH DELETE n RETURN count(*)", dict(id=node_id)
+        )
+        return len(results) > 0 and results[0][0] > 0
+
+    def count_nodes(self, label):
+        # answered from the count store without touching the nodes
+        results, meta = db.cypher_query("MATCH (n:{}) RETURN count(n)".format(label))
+        return results[0][0]
+
+    def merge_relationships(self, relationship, source_label, target_label, pairs):
+        # existing relationships are counted before MERGE so that it is known which were added
+        query = (
+            "UNWIND {{pairs}} AS pair "
+            "MATCH (s:{source}) WHERE ID(s) = pair[0] "
+            "MATCH (t:{target}) WHERE ID(t) = pair[1] "
+            "OPTIONAL MATCH (s)-[e:{relationship}]->(t) "
+            "WITH pair, s, t, count(e) AS existing "
+            "MERGE (s)-[:{relationship}]->(t) "
+            "RETURN pair[0], pair[1], existing = 0"
+        ).format(source=source_label, target=target_label, relationship=relationship)
+        results, meta = db.cypher_query(query, dict(pairs=[[source, target] for source, target in pairs]))
+
+        return [tuple(row) for row in results]
+
+    def create_relationships(self, relationship, pairs):
+        query = (
+            "UNWIND {{pairs}} AS pair "
+            "MATCH (s) WHERE ID(s) = pair[0] "
+            "MATCH (t) WHERE ID(t) = pair[1] "
+            "CREATE (s)-[:{}]->(t)"
+        ).format(relationship)
+        db.cypher_query(query, dict(pairs=[[source, target] for source, target in pairs]))
+
+    def sample_relationships(self, node_ids, relationship_types=None, fan_out=50):
+        query = (
+            "UNWIND {frontier} AS node_id "
+            "MATCH (n)-[r]-(m) WHERE ID(n)=node_id AND ({types} IS NULL OR type(r) IN {types}) "
+            "WITH n, r, m ORDER BY rand() "
+            "WITH n, collect([ID(startNode(r)), ID(endNode(r)), type(r), m])[..{fan_out}] AS sample "
+            "UNWIND sample AS edge "
+            "RETURN edge[0], edge[1], edge[2], edge[3]"
+        )
+        results, meta = db.cypher_query(
+            query, dict(frontier=list(node_ids), types=relationship_types, fan_out=fan_out)
+        )
+        return [tuple(row) for row in results]
+
+    def count_co_authors(self, person_ids, name_keys):
+        results, meta = db.cypher_query(
+            "MATCH (p:Person)-[:authors]->(:Paper)<-[:authors]-(c:Person) "
+            "WHERE ID(p) IN {ids} AND c.name_key IN {keys} "
+            "RETURN ID(p), count(DISTINCT c)",
+            dict(ids=list(person_ids), keys=list(name_keys)),
+        )
+        return {row[0]: row[1] for row in results}
+
+    def get_node_with_neighbours(self, node_id, label=None):
+        query = (
+            "MATCH (n{}) WHERE ID(n)={{id}} "
+            "OPTIONAL MATCH (n)-[r]-(m) "
+            "RETURN n, collect([m, type(r), startNode(r) = n])"
+        ).format(_label(label))
+        results, meta = db.cypher_query(query, dict(id=node_id))
+        if len(results) == 0:
+            return None, []
+
+        # a node without neighbours has a single row of nulls from the OPTIONAL MATCH
+        return results[0][0], [tuple(neighbour) for neighbour in results[0][1] if neighbour[0] is not None]
+
+    def search_nodes(self, index_name, query_string, skip=0, limit=25, field=None):
+        search_query = build_search_query(query_string, field)
+        if search_query is None:
+            return []
+
+        query = (
+            "CALL db.index.fulltext.queryNodes({index_name}, {search_query}) YIELD node, score "
+            "RETURN node ORDER BY score DESC SKIP {skip} LIMIT {limit}"
+        )
+        results, meta = db.cypher_query(
+            query, dict(index_name=index_name, search_query=search_query, skip=skip, limit=limit)
+        )
+
+        return [row[0] for row in results]
+
+    def search_names(self, index_name, query_string, name_property, limit=10, field=None):
+        search_query = build_search_query(query_string, field)
+        if search_query is None:
+            return []
+
+        query = (
+            "CALL db.index.fulltext.queryNodes({{index_name}}, {{search_query}}) YIELD node, score "
+            "RETURN ID(node), node.{} ORDER BY score DESC LIMIT {{limit}}".format(name_property)
+        )
+        results, meta = db.cypher_query(query, dict(index_name=index_name, search_query=search_query, limit=limit))
+
+        return [(node_id, name) for node_id, name in results]
+
+    def find_prefixes(self, label, properties, tokens, limit):
+        # one index seek per property, since Neo4j does not use the indexes for an OR
+        query = " UNION ALL ".join(
+            "UNWIND {{tokens}} AS token "
+            "MATCH (n:{label}) WHERE n.{key} STARTS WITH token "
+            "WITH ID(n) AS id, token, n.{key} = token AS whole, '{key}' AS key LIMIT {{limit}} "
+            "RETURN id, token, whole, key".format(label=label, key=key)
+            for key in properties
+        )
+        results, meta = db.cypher_query(query, dict(tokens=list(tokens), limit=limit))
+
+        return [tuple(row) for row in results]
+
+    def search_similar(self, index_name, tokens, limit):
+        # folded words are only letters and digits so there is nothing to escape
+        search_query = " OR ".join(token + "~" for token in tokens)
+        results, meta = db.cypher_query(
+            "CALL db.index.fulltext.queryNodes({index_name}, {search_query}) YIELD node, score "
+            "RETURN node ORDER BY score DESC LIMIT {limit}",
+            dict(index_name=index_name, search_query=search_query, limit=limit),
+        )
+
+        return [row[0] for row in results]
@@ -0,0 +1,69 @@
+"""
+Counts of the nodes in the catalog, e.g., the number of papers shown on the home page.
+
+len(Paper.nodes.all()) inflates every paper in the DB into a Python object just to
+count them. MATCH (n:Paper) RETURN count(n) is answered by Neo4j from its count store
+without touching the nodes. The counts are also kept in the Django cache for a short
+time and removed from it when nodes are created or deleted, so most page views do not
+query the DB for them at all.
+
+The cache is not shared between processes unless a shared cache backend is configured
+so a count may be stale for up to COUNT_CACHE_TIMEOUT seconds in other processes.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from catalog.backends import get_backend
+from catalog.models import Paper, Person, Dataset, Venue, Comment, Code
+
+
+COUNT_CACHE_TIMEOUT = 60  # seconds
+
+# The models whose nodes are counted
+COUNTED_MODELS = [Paper, Person, Dataset, Venue, Comment, Code]
+
+
+def _cache_key(model):
+    return "node_count:{}".format(model.__label__)
+
+
+def count_nodes(model):
+    """
+    :param model: The neomodel class of the nodes to count, e.g., Paper.
+    :return: <int> The number of nodes with the model's label.
+    """
+    key = _cache_key(model)
+    count = cache.get(key)
+    if count is None:
+        count = get_backend().count_nodes(model.__label__)
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+
+    return count
+
+
+def invalidate_count(model):
+    """
+    Removes the cached count for a model. This must be called after nodes are created
+    or deleted with Cypher queries since these do not send any signals.
+    :param model: The neomodel class, e.g., Paper.
+    """
+    cache.delete(_cache_key(model))
+
+
+def _node_saved(sender, created=True, **kwargs):
+    # updating an existing node does not change the count
+    if created:
+        invalidate_count(sender)
+
+
+def _node_deleted(sender, **kwargs):
+    invalidate_count(sender)
+
+
+def connect_signals():
+    """
+    Invalidates the cached counts whenever a node is created or deleted through its
+    model. django_neomodel sends Django's post_save and post_delete signals for these.
+    """
+    for model in COUNTED_MODELS:
+        post_save.connect(_node_saved, sender=model, dispatch_uid="count_{}_saved".format(model.__label__))
+        post_delete.connect(_node_deleted, sender=model, dispatch_uid="count_{}_deleted".format(model.__label__))
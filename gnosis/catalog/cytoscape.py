@@ -0,0 +1,140 @@
+"""
+Serialization of graph neighbourhoods to Cytoscape.js elements.
+
+The functions below work directly on the raw nodes returned by db.cypher_query so
+that no model objects have to be inflated, and build a list of plain dictionaries in
+a single pass that can be handed to JsonResponse.
+"""
+from django.urls import reverse
+from catalog.names import middle_names
+
+
+# node label -> (name of detail view, property shown as the node's title)
+NODE_TYPES = {
+    "Paper": ("paper_detail", "title"),
+    "Person": ("person_detail", None),
+    "Venue": ("venue_detail", "name"),
+    "Dataset": ("dataset_detail", "name"),
+    "Code": ("code_detail", None),
+}
+
+
+def node_type(node):
+    """
+    :param node: A raw Neo4j node.
+    :return: The first of the node's labels that is in NODE_TYPES or None.
+    """
+    for label in node.labels:
+        if label in NODE_TYPES:
+            return label
+    return None
+
+
+def _middle_name(middle_name):
+    # middle names are stored either as the string "['mn1', 'mn2', ...]", for people added
+    # as paper authors, or as "mn1 mn2", so convert them to " mn1 mn2 ..."
+    return "".join(" " + name for name in middle_names(middle_name))
+
+
+def node_element(node_id, label, properties, relationship_label):
+    """
+    Creates the Cytoscape element for a node.
+    :param node_id: <int> The node's ID.
+    :param label: The node's label, one of NODE_TYPES.
+    :param properties: <dict> The node's properties.
+    :param relationship_label: How the node relates to the centre of the graph, e.g.,
+    "cites", or "origin" for the centre itself.
+    :return: <dict>
+    """
+    url_name, title_property = NODE_TYPES[label]
+    data = {
+        "id": str(node_id),
+        "href": reverse(url_name, kwargs={"id": node_id}),
+        "type": label,
+        "label": relationship_label,
+    }
+    if label == "Person":
+        data["first_name"] = properties.get("first_name", "")
+        data["middle_name"] = _middle_name(properties.get("middle_name"))
+        data["last_name"] = properties.get("last_name", "")
+    elif title_property is None:
+        data["title"] = label
+    else:
+        data["title"] = properties.get(title_property, "")
+
+    return {"data": data}
+
+
+def edge_element(source_id, target_id, relationship_label):
+    """
+    Creates the Cytoscape element for a directed edge.
+    :return: <dict>
+    """
+    return {
+        "data": {
+            # '-' distinguishes id e.g. 1-11 to 111 in relationships
+            "id": "{}-{}-{}".format(source_id, target_id, relationship_label),
+            "label": relationship_label,
+            "source": str(source_id),
+            "target": str(target_id),
+        }
+    }
+
+
+def ego_network_elements(centre_id, centre_label, centre_properties, neighbours):
+    """
+    Creates the Cytoscape elements for the ego network of a node.
+    :param centre_id: <int> The ID of the node at the centre of the ego network.
+    :param centre_label: The label of the centre node, one of NODE_TYPES.
+    :param centre_properties: <dict> The properties of the centre node.
+    :param neighbours: <list> (node, relationship_type, outgoing) tuples for the raw
+    neighbour nodes, e.g., as returned by catalog.queries.get_paper_with_neighbours.
+    :return: <list> The node and edge elements.
+    """
+    elements = [node_element(centre_id, centre_label, centre_properties, "origin")]
+    added_nodes = {centre_id}
+
+    for node, relationship_type, outgoing in neighbours:
+        label = node_type(node)
+        if label is None:
+            continue
+        relationship_label = relationship_type.replace("_", " ")
+        # a node can be connected to the centre by more than one relationship but must
+        # only be added to the graph once
+        if node.id not in added_nodes:
+            elements.append(node_element(node.id, label, node.properties, relationship_label))
+            added_nodes.add(node.id)
+        if outgoing:
+            elements.append(edge_element(centre_id, node.id, relationship_label))
+        else:
+            elements.append(edge_element(node.id, centre_id, relationship_label))
+
+    return elements
+
+
+def graph_elements(nodes, edges):
+    """
+    Creates the Cytoscape elements for a subgraph. Nodes with labels that are not in
+    NODE_TYPES are left out together with their edges.
+    :param nodes: <dict> Maps node ID to a tuple (raw node, relationship type) where the
+    relationship type describes how the node was reached, e.g., as returned by
+    catalog.queries.get_node_neighbourhood.
+    :param edges: <list> (source ID, target ID, relationship type) tuples.
+    :return: <list> The node and edge elements.
+    """
+    elements = []
+    added_nodes = set()
+    for node_id, (node, relationship_type) in nodes.items():
+        label = node_type(node)
+        if label is None:
+            continue
+        elements.append(
+            node_element(node_id, label, node.properties, relationship_type.replace("_", " "))
+        )
+        added_nodes.add(node_id)
+
+    for source_id, target_id, relationship_type in edges:
+        if source_id in added_nodes and target_id in added_nodes:
+            elements.append(edge_element(source_id, target_id, relationship_type.replace("_", " ")))
+
+    return elements
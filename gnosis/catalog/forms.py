@@ -170,6 +170,21 @@ class PaperImportForm(Form):
     )
 
 
+class PaperBulkImportForm(Form):
+    """
+    A form for importing many papers at once from a file with one paper URL or arXiv ID
+    per line, or a BibTeX file.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(Form, self).__init__(*args, **kwargs)
+
+        for visible in self.visible_fields():
+            visible.field.widget.attrs["class"] = "form-control"
+
+    papers_file = forms.FileField(label="URLs, arXiv IDs or BibTeX file*")
+
+
 class PersonForm(ModelForm):
     def __init__(self, *args, **kwargs):
         super(ModelForm, self).__init__(*args, **kwargs)
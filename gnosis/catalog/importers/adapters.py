@@ -0,0 +1,452 @@
+"""
+Source adapters that extract paper information from the paper pages of one website each.
+
+An adapter recognises the URLs of its website and turns a downloaded paper page into
+(title, authors, abstract, download_link) in one pass. The adapters in use, and the order
+in which they are tried, are set with PAPER_SOURCE_ADAPTERS, so support for a new website
+can be added without touching the rest of the importers.
+
+Parsing is done in two steps,
+
+- The <head> of the page is read with a streaming parser that only looks at the
+  citation_* meta tags that many publishers add for Google Scholar. If they have
+  everything that is needed, no document tree is built at all.
+- Otherwise, the page is parsed with BeautifulSoup, using lxml if it is installed, and
+  only the tags the adapter needs are kept in the tree.
+"""
+import json
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import UnicodeDammit
+from django.conf import settings
+from django.utils.module_loading import import_string
+from catalog.importers import http_cache
+
+
+# Seconds to wait for a source website when importing a paper
+URL_TIMEOUT = 10
+
+DEFAULT_ADAPTERS = [
+    "catalog.importers.adapters.ArxivAdapter",
+    "catalog.importers.adapters.NipsAdapter",
+    "catalog.importers.adapters.JmlrAdapter",
+    "catalog.importers.adapters.IeeeAdapter",
+    "catalog.importers.adapters.AcmAdapter",
+]
+
+# The start of the script that holds the metadata of an IEEE paper page
+IEEE_METADATA = re.compile(r"xplGlobal\.document\.metadata\s*=\s*")
+
+NO_PAPER = (None, None, None, None)
+
+
+def _html_parser():
+    parser = getattr(settings, "SCRAPER_HTML_PARSER", None)
+    if parser:
+        return parser
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+def make_soup(html, parse_only=None):
+    """
+    :param html: <str> A page.
+    :param parse_only: <SoupStrainer> The tags to keep in the tree, or None for all of them.
+    :return: <BeautifulSoup> The page parsed with SCRAPER_HTML_PARSER, by default lxml if it
+    is installed and html.parser otherwise.
+    """
+    return BeautifulSoup(html, features=_html_parser(), parse_only=parse_only)
+
+
+def decode_page(html):
+    """
+    :param html: <bytes> or <str> A downloaded page.
+    :return: <str> The page decoded with the encoding it declares or, failing that, the
+    one that BeautifulSoup guesses.
+    """
+    if isinstance(html, str):
+        return html
+    # nearly all pages are UTF-8 so try that before guessing
+    try:
+        return html.decode("utf-8")
+    except UnicodeDecodeError:
+        return UnicodeDammit(html, is_html=True).unicode_markup
+
+
+class _EndOfHead(Exception):
+    pass
+
+
+class CitationMetaParser(HTMLParser):
+    """
+    Collects the citation_* meta tags of a page and stops at the end of its <head>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            name = (attrs.get("name") or "").lower()
+            if name.startswith("citation_") and attrs.get("content") is not None:
+                self.meta.setdefault(name, []).append(attrs["content"].strip())
+        elif tag == "body":
+            raise _EndOfHead()
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            raise _EndOfHead()
+
+
+def read_citation_meta(html):
+    """
+    :param html: <str> A page.
+    :return: <dict> The content of the citation_* meta tags in the page's <head>, a list
+    for each tag name, e.g., {"citation_author": ["Bach, Francis"]}.
+    """
+    parser = CitationMetaParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _EndOfHead:
+        pass
+    return parser.meta
+
+
+def reverse_name(name):
+    """
+    :param name: <str> A name written as "Last, First".
+    :return: <str> The name written as "First Last".
+    """
+    return " ".join(part.strip() for part in reversed(name.split(",")) if part.strip())
+
+
+def _has_class(attrs, *classes):
+    # used in SoupStrainer functions, where attrs has the class attribute as written in the page
+    value = attrs.get("class") or ""
+    if isinstance(value, str):
+        value = value.split()
+    return any(c in value for c in classes)
+
+
+class SourceAdapter:
+    """
+    The base class of source adapters. A subclass sets name and url_prefixes and
+    implements parse_tree, and may override parse_meta to use the citation_* meta tags.
+    """
+    # the value stored as source_website, e.g., arxiv
+    name = None
+    # the URLs of paper pages start with one of these, after the scheme is set to https
+    url_prefixes = ()
+    # additional request headers needed to download the paper pages
+    headers = None
+    # the tags parse_tree needs, or None to build the tree of the whole page
+    parse_only = None
+    # the citation_* meta tags are only read if the page has this one, None to never read them
+    citation_meta = "citation_abstract"
+
+    def matches(self, url):
+        return url.startswith(self.url_prefixes)
+
+    def normalize_url(self, url):
+        """
+        :param url: <str> A https URL for which matches is True.
+        :return: <str> The URL to download the paper page from.
+        """
+        return url
+
+    def parse(self, html, url):
+        """
+        Extract paper information from a downloaded paper page.
+        :param html: <bytes> or <str> The paper page.
+        :param url: <str> The URL of the paper page.
+        :return: <tuple> (title, authors, abstract, download_link) that are all None if the
+        page is not a supported paper page.
+        """
+        html = decode_page(html)
+        if self.citation_meta and self.citation_meta in html:
+            paper = self.parse_meta(read_citation_meta(html), url)
+            if paper is not None:
+                return paper
+        return self.parse_tree(make_soup(html, self.parse_only), url)
+
+    def parse_meta(self, meta, url):
+        """
+        :param meta: <dict> The citation_* meta tags of the page as returned by read_citation_meta.
+        :param url: <str> The URL of the paper page.
+        :return: <tuple> (title, authors, abstract, download_link), or None if the meta tags
+        do not have all of them and the page has to be parsed.
+        """
+        title = meta.get("citation_title", [None])[0]
+        authors = ",".join(reverse_name(author) for author in meta.get("citation_author", []))
+        abstract = meta.get("citation_abstract", [None])[0]
+        if not (title and authors and abstract):
+            return None
+        download_link = meta.get("citation_pdf_url", [""])[0] or self.get_download_link(None, url)
+        return title, authors, abstract.replace('\r', '').replace('\n', ' '), download_link
+
+    def parse_tree(self, bs4obj, url):
+        """
+        :param bs4obj: <BeautifulSoup> The paper page, with only the tags in parse_only.
+        :param url: <str> The URL of the paper page.
+        :return: <tuple> (title, authors, abstract, download_link)
+        """
+        authors = self.get_authors(bs4obj)
+        title = self.get_title(bs4obj)
+        abstract = self.get_abstract(bs4obj)
+        if abstract is not None:
+            # remove all the leading and ending white space and line breaks in the abstract
+            abstract = abstract.strip().replace('\r', '').replace('\n', '')
+        download_link = ""
+        if authors and title and abstract:
+            download_link = self.get_download_link(bs4obj, url)
+        return title, authors, abstract, download_link
+
+    def get_title(self, bs4obj):
+        return None
+
+    def get_authors(self, bs4obj):
+        """
+        :return: None or a string with comma separated author names from first to last name
+        """
+        return None
+
+    def get_abstract(self, bs4obj):
+        return None
+
+    def get_download_link(self, bs4obj, url):
+        return url
+
+
+class ArxivAdapter(SourceAdapter):
+    name = "arxiv"
+    url_prefixes = ("https://arxiv.org",)
+    parse_only = SoupStrainer(lambda name, attrs: _has_class(attrs, "title", "authors", "abstract"))
+
+    def get_title(self, bs4obj):
+        title = bs4obj.find("h1", {"class": "title"})
+        if title is None:
+            return None
+        title = title.get_text()
+        if title.startswith("Title:"):
+            title = title[6:]
+        return title
+
+    def get_authors(self, bs4obj):
+        authors = bs4obj.find("div", {"class": "authors"})
+        if authors is None:
+            return None
+        authors = authors.get_text()
+        if authors.startswith("Authors:"):
+            authors = authors[8:]
+        return authors
+
+    def get_abstract(self, bs4obj):
+        abstract = bs4obj.find("blockquote", {"class": "abstract"})
+        if abstract is None:
+            return None
+        # drop the "Abstract:" label, and keep the line breaks as spaces
+        abstract = " ".join(abstract.get_text().split(" ")[1:])
+        return abstract.strip().replace('\n', ' ')
+
+    def get_download_link(self, bs4obj, url):
+        return url.rstrip("/").replace("/abs/", "/pdf/", 1) + ".pdf"
+
+
+class NipsAdapter(SourceAdapter):
+    name = "nips"
+    url_prefixes = ("https://papers.nips.cc/paper",)
+    parse_only = SoupStrainer(lambda name, attrs: name == "title" or _has_class(attrs, "author", "abstract"))
+
+    def get_title(self, bs4obj):
+        title = bs4obj.find("title")
+        return title.get_text() if title is not None else None
+
+    def get_authors(self, bs4obj):
+        authors = bs4obj.find_all("li", {"class": "author"})
+        if not authors:
+            return None
+        return ",".join(author.get_text() for author in authors)
+
+    def get_abstract(self, bs4obj):
+        abstract = bs4obj.find("p", {"class": "abstract"})
+        return abstract.get_text() if abstract is not None else None
+
+    def get_download_link(self, bs4obj, url):
+        return url.rstrip("/") + ".pdf"
+
+
+class JmlrAdapter(SourceAdapter):
+    name = "jmlr"
+    # JMLR does not support https
+    url_prefixes = ("https://www.jmlr.org/papers",)
+
+    def normalize_url(self, url):
+        return "http://" + url[len("https://"):]
+
+    def get_title(self, bs4obj):
+        title = bs4obj.find("h2")
+        return title.get_text() if title is not None else None
+
+    def get_authors(self, bs4obj):
+        # in JMLR authors are found in the html tag "i"
+        authors = bs4obj.find("i")
+        return authors.get_text() if authors is not None else None
+
+    def get_abstract(self, bs4obj):
+        abstract = bs4obj.find("p", {"class": "abstract"})
+        if abstract is not None:
+            return abstract.get_text()
+        # for some papers from JMLR, the abstract is stored without a tag right after the first h3
+        abstract = bs4obj.find("h3")
+        if abstract is not None and isinstance(abstract.next_sibling, str):
+            return abstract.next_sibling
+        return None
+
+    def get_download_link(self, bs4obj, url):
+        if bs4obj is None:
+            return url
+        download_link = bs4obj.find(href=re.compile("pdf"))
+        if download_link is None:
+            return url
+        download_link = download_link["href"]
+        if download_link.startswith("/papers/"):
+            download_link = "http://www.jmlr.org" + download_link
+        return download_link
+
+
+class IeeeAdapter(SourceAdapter):
+    """
+    IEEE paper pages are rendered in the browser from a JSON object assigned to
+    xplGlobal.document.metadata in one of the page's scripts, so only the scripts are
+    parsed and all the fields are read from that object.
+    """
+    name = "ieee"
+    url_prefixes = ("https://ieeexplore.ieee.org/document/",)
+    parse_only = SoupStrainer("script")
+    citation_meta = None
+
+    def get_metadata(self, bs4obj):
+        """
+        :param bs4obj:
+        :return: <dict> The metadata or None if the page does not have it.
+        """
+        script = bs4obj.find("script", text=IEEE_METADATA)
+        if script is None:
+            return None
+        text = script.string
+        try:
+            metadata, _ = json.JSONDecoder().raw_decode(text, IEEE_METADATA.search(text).end())
+        except ValueError:
+            return None
+        if not isinstance(metadata, dict):
+            return None
+        return metadata
+
+    def parse_tree(self, bs4obj, url):
+        metadata = self.get_metadata(bs4obj)
+        # only journal and magazine papers are supported
+        if metadata is None or metadata.get("xploreDocumentType") != "Journals & Magazine":
+            return NO_PAPER
+
+        title = metadata.get("title")
+        authors = ",".join(author["name"] for author in metadata.get("authors", []) if author.get("name"))
+        abstract = metadata.get("abstract")
+        if abstract is not None:
+            abstract = abstract.strip().replace('\r', '').replace('\n', '')
+        download_link = ""
+        if authors and title and abstract and metadata.get("pdfUrl"):
+            download_link = "https://ieeexplore.ieee.org" + metadata["pdfUrl"]
+
+        return title or None, authors or None, abstract or None, download_link
+
+
+class AcmAdapter(SourceAdapter):
+    name = "acm"
+    url_prefixes = ("https://dl.acm.org/",)
+    headers = {"User-Agent": "Mozilla/5.0 (X11; U; Linux i686) Gecko/20071127 Firefox/2.0.0.11"}
+    citation_meta = "citation_conference_title"
+
+    def parse_meta(self, meta, url):
+        # conference papers are not supported; books can only be recognised from the page body
+        if meta.get("citation_conference_title"):
+            return NO_PAPER
+        return None
+
+    def parse_tree(self, bs4obj, url):
+        if bs4obj.find("a", {"title": "Buy this Book"}) or bs4obj.find("a", {"ACM Magazines"}) \
+                or bs4obj.find("meta", {"name": "citation_conference_title"}):
+            return NO_PAPER
+        return super().parse_tree(bs4obj, url)
+
+    def _get_meta(self, bs4obj, name):
+        meta = bs4obj.find("meta", {"name": name})
+        if meta is None or not meta.get("content"):
+            return None
+        return meta["content"]
+
+    def get_title(self, bs4obj):
+        return self._get_meta(bs4obj, "citation_title")
+
+    def get_authors(self, bs4obj):
+        # names are "last, first" separated by semicolons so reverse them to first last
+        authors = self._get_meta(bs4obj, "citation_authors")
+        if authors is None:
+            return None
+        return ",".join(reverse_name(author) for author in authors.split(";") if author.strip())
+
+    def get_abstract(self, bs4obj):
+        abstract = bs4obj.find("div", {"style": "display:inline"})
+        if abstract is not None:
+            return abstract.get_text()
+        # the abstract is sometimes only on the flat layout of the page
+        abstract_url = self._get_meta(bs4obj, "citation_abstract_html_url")
+        if abstract_url is None:
+            return None
+        html = http_cache.fetch(abstract_url + "&preflayout=flat", self.headers, timeout=URL_TIMEOUT)
+        abstract = make_soup(decode_page(html)).find("div", {"style": "display:inline"})
+        return abstract.get_text() if abstract is not None else None
+
+    def get_download_link(self, bs4obj, url):
+        return self._get_meta(bs4obj, "citation_pdf_url") or url
+
+
+@lru_cache(maxsize=None)
+def _load_adapters(paths):
+    return tuple(import_string(path)() for path in paths)
+
+
+def get_adapters():
+    """
+    :return: <tuple> Instances of the adapters in PAPER_SOURCE_ADAPTERS, in order.
+    """
+    return _load_adapters(tuple(getattr(settings, "PAPER_SOURCE_ADAPTERS", DEFAULT_ADAPTERS)))
+
+
+def get_adapter(source_website):
+    """
+    :param source_website: <str> The name of an adapter, e.g., arxiv.
+    :return: <SourceAdapter> The adapter or None if there is no adapter with that name.
+    """
+    for adapter in get_adapters():
+        if adapter.name == source_website:
+            return adapter
+    return None
+
+
+def find_adapter(url):
+    """
+    :param url: <str> A https URL.
+    :return: <SourceAdapter> The first adapter that matches the URL, or None.
+    """
+    for adapter in get_adapters():
+        if adapter.matches(url):
+            return adapter
+    return None
@@ -0,0 +1,212 @@
+"""
+Harvesting of paper metadata from arXiv with its OAI-PMH interface.
+
+Importing arXiv papers by scraping their abstract pages downloads one page per paper.
+The OAI-PMH interface at export.arxiv.org returns the metadata of up to 1000 papers per
+response, and a resumption token to request the next response, so a whole category can
+be mirrored with a few hundred requests. Each response is parsed as it is read and its
+papers are written to the DB before the next one is requested.
+
+The date of the last harvest of every set, and the resumption token of an unfinished
+harvest, are kept in ARXIV_HARVEST_STATE_FILE so that a mirror can be updated with only
+the papers added or changed since, and an interrupted harvest can be resumed.
+
+This is used by the harvest_arxiv management command.
+"""
+import json
+import os
+import time
+import xml.etree.ElementTree as ElementTree
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen, Request
+from django.conf import settings
+from catalog.importers.bulk import write_papers
+
+
+ARXIV_OAI_URL = "http://export.arxiv.org/oai2"
+# Seconds to wait for a response, which can be several megabytes
+HARVEST_TIMEOUT = 120
+# Number of times a request is repeated when arXiv asks to retry later
+HARVEST_RETRIES = 5
+# Seconds to wait before retrying if arXiv does not say how long
+HARVEST_RETRY_AFTER = 30
+
+_OAI = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV = "{http://arxiv.org/OAI/arXiv/}"
+
+
+class HarvestError(Exception):
+    pass
+
+
+def _text(element, path):
+    value = element.findtext(path)
+    if value is None:
+        return None
+    return " ".join(value.split())
+
+
+def _paper_from_record(metadata):
+    # metadata is the arXiv element of a record in the arXiv metadata format
+    arxiv_id = _text(metadata, _ARXIV + "id")
+    authors = []
+    for author in metadata.iter(_ARXIV + "author"):
+        name = " ".join(
+            part for part in (_text(author, _ARXIV + "forenames"), _text(author, _ARXIV + "keyname")) if part
+        )
+        if name:
+            authors.append(name)
+
+    return dict(
+        title=_text(metadata, _ARXIV + "title"),
+        authors=authors,
+        abstract=_text(metadata, _ARXIV + "abstract"),
+        download_link="https://arxiv.org/pdf/" + arxiv_id,
+        source_link="https://arxiv.org/abs/" + arxiv_id,
+    )
+
+
+def parse_response(response):
+    """
+    Reads a ListRecords response in the arXiv metadata format. The records are parsed
+    one at a time and discarded so that memory use does not grow with the response.
+    :param response: A file object with the XML response.
+    :return: <tuple> (papers, resumption_token) where papers is a list of dictionaries with
+    keys title, authors (a list of names), abstract, download_link and source_link, and
+    resumption_token is None if this was the last response.
+    :raises HarvestError: If the response is an OAI-PMH error other than noRecordsMatch.
+    """
+    papers, resumption_token = [], None
+    for event, element in ElementTree.iterparse(response):
+        if element.tag == _OAI + "record":
+            header = element.find(_OAI + "header")
+            metadata = element.find(_OAI + "metadata/" + _ARXIV + "arXiv")
+            if header.get("status") != "deleted" and metadata is not None:
+                paper = _paper_from_record(metadata)
+                if paper["title"] and paper["abstract"] and paper["authors"]:
+                    papers.append(paper)
+            element.clear()
+        elif element.tag == _OAI + "resumptionToken":
+            resumption_token = (element.text or "").strip() or None
+        elif element.tag == _OAI + "error":
+            if element.get("code") != "noRecordsMatch":
+                raise HarvestError("{}: {}".format(element.get("code"), (element.text or "").strip()))
+
+    return papers, resumption_token
+
+
+def _request(url):
+    # arXiv answers 503 with Retry-After when requests come too quickly
+    for attempt in range(HARVEST_RETRIES + 1):
+        try:
+            return urlopen(Request(url, headers={"User-Agent": "Gnosis arXiv harvester"}), timeout=HARVEST_TIMEOUT)
+        except HTTPError as e:
+            if e.code != 503 or attempt == HARVEST_RETRIES:
+                raise
+            retry_after = e.headers.get("Retry-After")
+            delay = int(retry_after) if retry_after and retry_after.isdigit() else HARVEST_RETRY_AFTER
+            print("arXiv asked to retry in {} seconds".format(delay))
+            time.sleep(delay)
+
+
+def harvest_responses(set_spec=None, from_date=None, until_date=None, resumption_token=None, base_url=ARXIV_OAI_URL):
+    """
+    Requests the records of a set one response at a time.
+    :param set_spec: <str> An arXiv set, e.g., cs or physics:hep-th, or None for all of arXiv.
+    :param from_date: <str> Only records added or changed on or after this date, YYYY-MM-DD.
+    :param until_date: <str> Only records added or changed on or before this date, YYYY-MM-DD.
+    :param resumption_token: <str> Continue an earlier harvest from this token. The other
+    parameters are ignored since they are part of the token.
+    :param base_url: <str> The OAI-PMH endpoint.
+    :return: A generator of (papers, resumption_token) tuples, one per response, as
+    returned by parse_response.
+    """
+    if resumption_token is None:
+        params = dict(verb="ListRecords", metadataPrefix="arXiv")
+        if set_spec:
+            params["set"] = set_spec
+        if from_date:
+            params["from"] = from_date
+        if until_date:
+            params["until"] = until_date
+    else:
+        params = dict(verb="ListRecords", resumptionToken=resumption_token)
+
+    while True:
+        with _request(base_url + "?" + urlencode(params)) as response:
+            papers, resumption_token = parse_response(response)
+        yield papers, resumption_token
+        if resumption_token is None:
+            return
+        params = dict(verb="ListRecords", resumptionToken=resumption_token)
+
+
+def _state_file():
+    return getattr(settings, "ARXIV_HARVEST_STATE_FILE", "arxiv_harvest.json")
+
+
+def load_state():
+    """
+    :return: <dict> For every harvested set (the key is "" for all of arXiv), a dictionary
+    with the date of the last complete harvest, from, and the start date and
+    resumption_token of the current one.
+    """
+    try:
+        with open(_state_file(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(set_spec, **kwargs):
+    state = load_state()
+    state.setdefault(set_spec or "", {}).update(kwargs)
+    os.makedirs(os.path.dirname(os.path.abspath(_state_file())), exist_ok=True)
+    with open(_state_file(), "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def harvest(set_spec=None, from_date=None, until_date=None, resume=True, user_id=None, base_url=ARXIV_OAI_URL):
+    """
+    Adds the papers of an arXiv set to the DB, writing the papers of every response before
+    requesting the next.
+    :param set_spec: <str> An arXiv set, e.g., cs, or None for all of arXiv.
+    :param from_date: <str> Only papers added or changed on or after this date, YYYY-MM-DD.
+    By default, the date of the last complete harvest of the set, or all papers if there
+    was none.
+    :param until_date: <str> Only papers added or changed on or before this date, YYYY-MM-DD.
+    :param resume: <bool> Continue an unfinished harvest of the set if there is one.
+    :param user_id: <int> The ID of the user who harvested the papers.
+    :param base_url: <str> The OAI-PMH endpoint.
+    :return: <dict> A summary with the numbers of responses, papers added, people added,
+    papers skipped because they are duplicates and papers skipped because they have no
+    authors.
+    """
+    state = load_state().get(set_spec or "", {})
+    if from_date is None:
+        from_date = state.get("from")
+    resumption_token = state.get("resumption_token") if resume else None
+    if resumption_token is not None:
+        started = state.get("started")
+    else:
+        started = time.strftime("%Y-%m-%d", time.gmtime())
+        _save_state(set_spec, started=started)
+
+    summary = dict(responses=0, papers_added=0, people_added=0, papers_skipped=0, papers_without_authors=0)
+    responses = harvest_responses(set_spec, from_date, until_date, resumption_token, base_url)
+    for papers, resumption_token in responses:
+        num_papers, num_people, num_skipped, num_without_authors = write_papers(papers, user_id)
+        summary["responses"] += 1
+        summary["papers_added"] += num_papers
+        summary["people_added"] += num_people
+        summary["papers_skipped"] += num_skipped
+        summary["papers_without_authors"] += num_without_authors
+        _save_state(set_spec, resumption_token=resumption_token)
+        print("Harvested {} papers from arXiv, {} added".format(len(papers), num_papers))
+
+    if until_date is None:
+        # the next harvest only needs the papers added or changed since this one started
+        _save_state(set_spec, **{"from": started})
+
+    return summary
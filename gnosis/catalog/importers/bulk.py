@@ -0,0 +1,385 @@
+"""
+Bulk import of papers from a list of paper URLs, arXiv IDs or a BibTeX file.
+
+Importing one paper at a time saves every paper, author and authors edge with its own
+query. Here, paper pages are downloaded concurrently, with a minimum interval between
+requests to the same website, and the papers are written in batches with one UNWIND query
+per batch for papers, one for new authors and one for the authors edges. Authors are
+deduplicated across the whole import and linked to existing people with the same name
+key (see catalog/names.py).
+
+This is used by the import_papers management command and the bulk import page.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+from neomodel import db
+from catalog.models import Paper, Person
+from catalog.counts import invalidate_count
+from catalog.names import split_name, person_keys, title_key
+from catalog.importers.scrapers import get_paper_info, get_source_website
+
+
+IMPORT_WORKERS = 8
+# Minimum number of seconds between two requests to the same website
+HOST_INTERVAL = 1.0
+# Number of papers written to the DB in one transaction
+BATCH_SIZE = 500
+
+_ARXIV_ID = re.compile(r"^(?:arxiv:)?(\d{4}\.\d{4,5}(?:v\d+)?|[a-z\-]+(?:\.[a-z]{2})?/\d{7}(?:v\d+)?)$", re.IGNORECASE)
+_BIBTEX_ENTRY = re.compile(r"@(\w+)\s*\{\s*([^,\s]*)\s*,")
+_BIBTEX_FIELD = re.compile(r"\s*(\w+)\s*=\s*")
+
+
+#
+# Parsing the import file
+#
+def _read_bibtex_value(text, i):
+    # reads a value enclosed in {} or "", or a bare word, starting at text[i]
+    # and returns (value, index after the value)
+    if text[i] == "{":
+        depth, j = 0, i
+        while j < len(text):
+            if text[j] == "{":
+                depth += 1
+            elif text[j] == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[i + 1:j], j + 1
+            j += 1
+        return text[i + 1:], len(text)
+    if text[i] == '"':
+        j = text.find('"', i + 1)
+        if j == -1:
+            j = len(text)
+        return text[i + 1:j], j + 1
+    match = re.match(r"[^,}\s]*", text[i:])
+    return match.group(0), i + match.end()
+
+
+def parse_bibtex(text):
+    """
+    A minimal BibTeX parser that reads the fields of every entry. String macros,
+    concatenation with # and comments inside entries are not supported.
+    :param text: <str> The contents of a BibTeX file.
+    :return: <list> One dictionary per entry mapping the lower case field names to their
+    values with the outer braces or quotes removed.
+    """
+    entries = []
+    for entry_match in _BIBTEX_ENTRY.finditer(text):
+        if entry_match.group(1).lower() in ("comment", "preamble", "string"):
+            continue
+        fields = {}
+        i = entry_match.end()
+        while i < len(text):
+            field_match = _BIBTEX_FIELD.match(text, i)
+            if field_match is None:
+                break
+            value, i = _read_bibtex_value(text, field_match.end())
+            fields[field_match.group(1).lower()] = value
+            # skip to the next field or the end of the entry
+            while i < len(text) and text[i] in " \t\r\n":
+                i += 1
+            if i < len(text) and text[i] == ",":
+                i += 1
+            else:
+                break
+        entries.append(fields)
+
+    return entries
+
+
+def _clean_bibtex_text(value):
+    # removes the braces that protect capitalization and joins lines
+    return " ".join(value.replace("{", "").replace("}", "").split())
+
+
+def _bibtex_author(name):
+    # converts "Last, First Middle" to "First Middle Last"
+    name = _clean_bibtex_text(name)
+    if "," in name:
+        last_name, first_names = name.split(",", 1)
+        name = "{} {}".format(first_names.strip(), last_name.strip())
+    return name
+
+
+def _entry_from_bibtex(fields):
+    url = fields.get("url")
+    if url is None and "eprint" in fields and _ARXIV_ID.match(fields["eprint"].strip()):
+        url = "https://arxiv.org/abs/" + fields["eprint"].strip()
+
+    if "title" in fields and "author" in fields and "abstract" in fields:
+        # everything that is needed is in the file so there is no need to download the paper
+        authors = [_bibtex_author(name) for name in re.split(r"\s+and\s+", fields["author"])]
+        return dict(
+            paper=dict(
+                title=_clean_bibtex_text(fields["title"]),
+                authors=[author for author in authors if author],
+                abstract=_clean_bibtex_text(fields["abstract"]),
+                download_link=url or "",
+                source_link=url,
+            )
+        )
+
+    return dict(url=url)
+
+
+def parse_import_file(text):
+    """
+    Reads the papers to import from a BibTeX file or from a file with one paper URL or
+    arXiv ID, e.g., 1607.00653 or arXiv:astro-ph/9204001, per line. Empty lines and lines
+    starting with # are ignored.
+    :param text: <str> The contents of the file.
+    :return: <list> One dictionary per paper, either with key paper holding the complete
+    paper information or with key url holding the URL to download it from. The url is
+    None if it could not be found in a BibTeX entry.
+    """
+    if text.lstrip().startswith("@") or _BIBTEX_ENTRY.search(text):
+        return [_entry_from_bibtex(fields) for fields in parse_bibtex(text)]
+
+    entries = []
+    for line in text.splitlines():
+        line = line.strip()
+        if len(line) == 0 or line.startswith("#"):
+            continue
+        arxiv_id = _ARXIV_ID.match(line)
+        if arxiv_id:
+            line = "https://arxiv.org/abs/" + arxiv_id.group(1)
+        entries.append(dict(url=line))
+
+    return entries
+
+
+#
+# Downloading the papers
+#
+class HostRateLimiter:
+    """
+    Spaces out the requests to each website by a minimum interval. It is shared by all
+    download threads.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next_request = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Blocks until a request to the website of the given URL is allowed.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, now))
+            self._next_request[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _fetch_paper(url, rate_limiter):
+    # returns (paper, error) where exactly one is None
+    url, source_website = get_source_website(url)
+    if source_website is None:
+        return None, "Source website is not supported"
+
+    rate_limiter.wait(url)
+    try:
+        title, authors, abstract, download_link = get_paper_info(url, source_website)
+    except Exception as e:
+        return None, str(e)
+    if title is None or authors is None or abstract is None:
+        return None, "Paper information could not be extracted"
+
+    return dict(
+        title=title.strip(),
+        authors=[author.strip() for author in authors.split(",") if author.strip()],
+        abstract=abstract.strip(),
+        download_link=download_link,
+        source_link=url,
+    ), None
+
+
+def fetch_papers(entries, workers=IMPORT_WORKERS, host_interval=HOST_INTERVAL):
+    """
+    Downloads the papers of the entries that only have a URL.
+    :param entries: <list> Entries as returned by parse_import_file.
+    :param workers: <int> The number of papers downloaded at the same time.
+    :param host_interval: <float> The minimum number of seconds between requests to the same website.
+    :return: <tuple> (papers, failures) where papers is a list of dictionaries with keys
+    title, authors (a list of names), abstract, download_link and source_link, and
+    failures is a list of (url, reason) tuples.
+    """
+    papers, failures, urls = [], [], []
+    for entry in entries:
+        if "paper" in entry:
+            papers.append(entry["paper"])
+        elif entry["url"] is None:
+            failures.append((None, "No URL or abstract in BibTeX entry"))
+        else:
+            urls.append(entry["url"])
+
+    rate_limiter = HostRateLimiter(host_interval)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda url: _fetch_paper(url, rate_limiter), urls)
+        for url, (paper, error) in zip(urls, results):
+            if paper is None:
+                failures.append((url, error))
+            else:
+                papers.append(paper)
+
+    return papers, failures
+
+
+#
+# Writing the papers to the DB
+#
+def _match_people(people):
+    # finds the existing Person nodes with the same name key as each of the new authors
+    # and returns a dictionary from author row to node ID for the authors with exactly
+    # one match; authors with more than one match are left unmatched
+    query = (
+        "UNWIND {people} AS person "
+        "MATCH (p:Person {name_key: person.name_key}) "
+        "RETURN person.row, collect(ID(p))"
+    )
+    results, meta = db.cypher_query(query, dict(people=people))
+
+    return {row: node_ids[0] for row, node_ids in results if len(node_ids) == 1}
+
+
+def _existing_titles(title_keys):
+    # returns the title keys of the papers already in the DB, found by a seek in the index of
+    # Paper.title_key
+    query = (
+        "UNWIND {title_keys} AS title_key "
+        "MATCH (p:Paper {title_key: title_key}) "
+        "RETURN DISTINCT title_key"
+    )
+    results, meta = db.cypher_query(query, dict(title_keys=title_keys))
+
+    return set(row[0] for row in results)
+
+
+def _write_batch(papers, user_id, people_ids):
+    # people_ids maps author name to Person node ID and is updated with new authors
+    new_people = {}
+    for paper in papers:
+        for author in paper["authors"]:
+            if author not in people_ids and author not in new_people:
+                first_name, middle_name, last_name = split_name(author)
+                properties = Person.deflate(
+                    dict(first_name=first_name, middle_name=middle_name, last_name=last_name,
+                         created=datetime.now(), created_by=user_id,
+                         **person_keys(first_name, middle_name, last_name)),
+                    skip_empty=True,
+                )
+                new_people[author] = properties
+
+    authors = list(new_people.keys())
+    matches = _match_people(
+        [dict(new_people[author], row=row) for row, author in enumerate(authors)]
+    )
+    for row, node_id in matches.items():
+        people_ids[authors[row]] = node_id
+    unmatched = [author for author in authors if author not in people_ids]
+
+    paper_properties = [
+        Paper.deflate(
+            dict(title=paper["title"], title_key=title_key(paper["title"]), abstract=paper["abstract"], download_link=paper["download_link"],
+                 source_link=paper["source_link"], created=datetime.now(), created_by=user_id),
+            skip_empty=True,
+        )
+        for paper in papers
+    ]
+
+    with db.transaction:
+        results, meta = db.cypher_query(
+            "UNWIND {people} AS properties CREATE (p:Person) SET p = properties RETURN ID(p)",
+            dict(people=[new_people[author] for author in unmatched]),
+        )
+        for author, row in zip(unmatched, results):
+            people_ids[author] = row[0]
+
+        results, meta = db.cypher_query(
+            "UNWIND {papers} AS properties CREATE (p:Paper) SET p = properties RETURN ID(p)",
+            dict(papers=paper_properties),
+        )
+        edges = [
+            dict(person=people_ids[author], paper=row[0])
+            for paper, row in zip(papers, results)
+            for author in paper["authors"]
+        ]
+
+        db.cypher_query(
+            "UNWIND {edges} AS edge "
+            "MATCH (a:Person), (p:Paper) WHERE ID(a)=edge.person AND ID(p)=edge.paper "
+            "CREATE (a)-[:authors]->(p)",
+            dict(edges=edges),
+        )
+
+    return len(unmatched)
+
+
+def write_papers(papers, user_id=None, batch_size=BATCH_SIZE):
+    """
+    Adds papers and their authors to the DB. Papers with the same title, ignoring case,
+    accents and punctuation, as a paper in the DB or earlier in the list are skipped.
+    :param papers: <list> Papers as returned by fetch_papers.
+    :param user_id: <int> The ID of the user who imported the papers.
+    :param batch_size: <int> The number of papers written in one transaction.
+    :return: <tuple> (number of papers added, number of people added, number of papers
+    skipped because they are duplicates, number of papers skipped because they have no
+    authors)
+    """
+    unique_papers = {}
+    num_without_authors = 0
+    for paper in papers:
+        if len(paper["authors"]) > 0:
+            unique_papers.setdefault(title_key(paper["title"]), paper)
+        else:
+            num_without_authors += 1
+
+    num_papers, num_people = 0, 0
+    people_ids = {}
+    title_keys = list(unique_papers.keys())
+    for start in range(0, len(title_keys), batch_size):
+        batch_title_keys = title_keys[start:start + batch_size]
+        existing_title_keys = _existing_titles(batch_title_keys)
+        batch = [unique_papers[key] for key in batch_title_keys if key not in existing_title_keys]
+        if len(batch) > 0:
+            num_people += _write_batch(batch, user_id, people_ids)
+            num_papers += len(batch)
+
+    # the nodes were created without signals so the cached counts must be reset here
+    invalidate_count(Paper)
+    invalidate_count(Person)
+
+    return num_papers, num_people, len(papers) - num_without_authors - num_papers, num_without_authors
+
+
+def import_papers(text, user_id=None, workers=IMPORT_WORKERS, host_interval=HOST_INTERVAL):
+    """
+    Imports all papers in a file of URLs, arXiv IDs or BibTeX entries.
+    :param text: <str> The contents of the file.
+    :param user_id: <int> The ID of the user who imported the papers.
+    :param workers: <int> The number of papers downloaded at the same time.
+    :param host_interval: <float> The minimum number of seconds between requests to the same website.
+    :return: <dict> A summary with the numbers of papers added, people added, papers
+    skipped because they are duplicates and papers skipped because they have no authors,
+    and the list of (url, reason) failures.
+    """
+    entries = parse_import_file(text)
+    papers, failures = fetch_papers(entries, workers, host_interval)
+    num_papers, num_people, num_skipped, num_without_authors = write_papers(papers, user_id)
+
+    return dict(
+        papers_added=num_papers,
+        people_added=num_people,
+        papers_skipped=num_skipped,
+        papers_without_authors=num_without_authors,
+        failures=failures,
+    )
@@ -0,0 +1,221 @@
+"""
+An on-disk cache of the publisher pages downloaded when importing papers.
+
+Importing the same URL again, or parsing the saved pages again after fixing a scraper,
+should not download anything. Pages are stored by the SHA-256 hash of their content in
+SCRAPER_CACHE_DIR/objects, so identical pages are stored once, and every URL has a small
+JSON entry in SCRAPER_CACHE_DIR/entries, named by the hash of the normalized URL, that
+points to its page.
+
+- A page younger than SCRAPER_CACHE_TTL seconds is returned without contacting the
+  publisher.
+- An older page is revalidated with If-None-Match/If-Modified-Since using the ETag and
+  Last-Modified headers of the previous response, so an unchanged page is not downloaded
+  again.
+- When the pages take more than SCRAPER_CACHE_MAX_SIZE bytes, the least recently used
+  entries are removed.
+- With SCRAPER_CACHE_OFFLINE, only cached pages are returned, however old, and the
+  publishers are never contacted.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from urllib.request import urlopen, Request
+from django.conf import settings
+
+
+# The cache is checked against SCRAPER_CACHE_MAX_SIZE once every this many downloads
+EVICT_EVERY = 50
+
+_downloads = 0
+# pages are downloaded by several threads at once, e.g., in catalog/importers/bulk.py
+_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def normalize_url(url):
+    """
+    Normalizes a URL so that different ways of writing the same URL share a cache entry.
+    The scheme and host are lower cased, default ports and the fragment are removed and
+    the query parameters are sorted.
+    :param url: <str>
+    :return: <str>
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = parts.netloc.lower()
+    if (scheme == "http" and host.endswith(":80")) or (scheme == "https" and host.endswith(":443")):
+        host = host.rsplit(":", 1)[0]
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _entry_path(url):
+    return os.path.join(_setting("SCRAPER_CACHE_DIR", "scraper_cache"), "entries", _hash(url.encode("utf-8")) + ".json")
+
+
+def _object_path(digest):
+    return os.path.join(_setting("SCRAPER_CACHE_DIR", "scraper_cache"), "objects", digest)
+
+
+def _write_file(path, data):
+    # writes to a temporary file first so that other threads never read a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _read_entry(url):
+    # returns (entry, page) or (None, None) if the url is not cached
+    try:
+        with open(_entry_path(url), encoding="utf-8") as f:
+            entry = json.load(f)
+        with open(_object_path(entry["digest"]), "rb") as f:
+            page = f.read()
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+    return entry, page
+
+
+def _write_entry(url, entry, page=None):
+    if page is not None:
+        entry["digest"] = _hash(page)
+        if not os.path.exists(_object_path(entry["digest"])):
+            _write_file(_object_path(entry["digest"]), page)
+    _write_file(_entry_path(url), json.dumps(entry).encode("utf-8"))
+
+
+def _touch(url):
+    # the modification time of an entry is the time it was last used
+    try:
+        os.utime(_entry_path(url))
+    except OSError:
+        pass
+
+
+def _remove(path):
+    # another thread may have removed the file already
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def evict(max_size=None):
+    """
+    Removes the least recently used entries until the cached pages take at most max_size
+    bytes, and deletes the pages that no entry refers to any more.
+    :param max_size: <int> The size limit in bytes, SCRAPER_CACHE_MAX_SIZE by default.
+    """
+    if max_size is None:
+        max_size = _setting("SCRAPER_CACHE_MAX_SIZE", 500 * 1024 * 1024)
+    cache_dir = _setting("SCRAPER_CACHE_DIR", "scraper_cache")
+    entries_dir = os.path.join(cache_dir, "entries")
+    objects_dir = os.path.join(cache_dir, "objects")
+    if not os.path.isdir(entries_dir) or not os.path.isdir(objects_dir):
+        return
+
+    entries = []  # (last used, entry path, digest)
+    for name in os.listdir(entries_dir):
+        path = os.path.join(entries_dir, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries.append((os.path.getmtime(path), path, json.load(f)["digest"]))
+        except (OSError, ValueError, KeyError):
+            continue
+    sizes = {}
+    for name in os.listdir(objects_dir):
+        try:
+            sizes[name] = os.path.getsize(os.path.join(objects_dir, name))
+        except OSError:
+            continue
+
+    # the pages referred to by at least one entry, most recently used first
+    entries.sort(reverse=True)
+    kept, total = set(), 0
+    for last_used, path, digest in entries:
+        if digest in kept:
+            continue
+        if digest not in sizes or total + sizes[digest] > max_size:
+            _remove(path)
+            continue
+        kept.add(digest)
+        total += sizes[digest]
+
+    for digest in sizes:
+        if digest not in kept:
+            _remove(os.path.join(objects_dir, digest))
+
+
+def fetch(url, headers=None, timeout=None):
+    """
+    Returns the content at a URL from the cache, or downloads it and adds it to the cache.
+    :param url: <str> The URL of the page.
+    :param headers: <dict> Additional request headers, e.g., User-Agent.
+    :param timeout: <float> Seconds to wait for the website.
+    :return: <bytes> The content of the page.
+    :raises HTTPError, URLError, socket.timeout: As urlopen does if the page has to be
+    downloaded and cannot be. URLError is also raised for pages that are not cached in
+    offline mode.
+    """
+    key = normalize_url(url)
+    entry, page = _read_entry(key)
+
+    if page is not None:
+        if _setting("SCRAPER_CACHE_OFFLINE", False) or \
+                time.time() - entry["fetched"] < _setting("SCRAPER_CACHE_TTL", 7 * 24 * 60 * 60):
+            _touch(key)
+            return page
+    elif _setting("SCRAPER_CACHE_OFFLINE", False):
+        raise URLError("{} is not in the scraper cache".format(url))
+
+    headers = dict(headers or {})
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = urlopen(Request(url, headers=headers), timeout=timeout)
+        content = response.read()
+    except HTTPError as e:
+        if e.code != 304 or page is None:
+            raise
+        # not modified so the cached page is still valid
+        entry["fetched"] = time.time()
+        _write_entry(key, entry)
+        return page
+
+    entry = dict(
+        url=key,
+        fetched=time.time(),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    _write_entry(key, entry, content)
+
+    global _downloads
+    with _lock:
+        _downloads += 1
+        due = _downloads % EVICT_EVERY == 0
+    if due:
+        evict()
+
+    return content
@@ -0,0 +1,116 @@
+"""
+Background jobs for importing papers from publisher websites.
+
+Downloading and parsing a paper page can take many seconds when a publisher site is
+slow, and the web worker that handles the request would be blocked for all that time.
+Instead, the views submit the work as a job to a small pool of threads and the browser
+polls the job's status until the result is ready.
+
+The state of every job is kept in the Django cache, which settings.py shares between the
+web workers, so that any worker can report on it. The pool itself belongs to the process
+that submitted the job.
+"""
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+
+
+IMPORT_WORKERS = 4
+# A job that has not finished after this many seconds is reported as timed out
+IMPORT_JOB_TIMEOUT = 60
+# How long the state of a job is kept after it has timed out
+IMPORT_JOB_EXPIRY = 60 * 60
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TIMEOUT = "timeout"
+
+_executor = None
+_futures = {}
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="paper-import")
+    return _executor
+
+
+def _cache_key(job_id):
+    return "import_job:{}".format(job_id)
+
+
+def _update_job(job_id, **kwargs):
+    job = cache.get(_cache_key(job_id))
+    if job is not None:
+        job.update(kwargs)
+        cache.set(_cache_key(job_id), job, job["timeout"] + IMPORT_JOB_EXPIRY)
+
+
+def _run_job(job_id, function, args):
+    _update_job(job_id, status=RUNNING, started=time.time())
+    try:
+        result = function(*args)
+    except Exception as e:
+        print("Import job {} failed: {}".format(job_id, e))
+        _update_job(job_id, status=FAILED, error=str(e))
+    else:
+        _update_job(job_id, status=DONE, result=result)
+
+
+def submit(function, *args, user_id=None, timeout=IMPORT_JOB_TIMEOUT):
+    """
+    Runs function(*args) in the worker pool.
+    :param function: The function to run, e.g., get_paper_info.
+    :param args: The arguments of the function. They, and the function's return value,
+    must be picklable so that they can be stored in the cache.
+    :param user_id: <int> The ID of the user who submitted the job.
+    :param timeout: <int> The number of seconds after which the job is reported as timed out.
+    :return: <str> The ID of the job.
+    """
+    job_id = uuid.uuid4().hex
+    job = dict(
+        status=PENDING, submitted=time.time(), timeout=timeout, user_id=user_id, args=args, result=None
+    )
+    cache.set(_cache_key(job_id), job, timeout + IMPORT_JOB_EXPIRY)
+    future = _get_executor().submit(_run_job, job_id, function, args)
+    _futures[job_id] = future
+    future.add_done_callback(lambda f: _futures.pop(job_id, None))
+
+    return job_id
+
+
+def get_job(job_id):
+    """
+    :param job_id: <str> The ID of a job returned by submit.
+    :return: <dict> The job with keys status, submitted, timeout, user_id, args and result, where
+    result is the return value of the function once the status is DONE, or None if there
+    is no job with the given ID or it has expired.
+    """
+    job = cache.get(_cache_key(job_id))
+    if job is None:
+        return None
+
+    if job["status"] in (PENDING, RUNNING) and time.time() - job["submitted"] > job["timeout"]:
+        # the thread cannot be stopped but nobody is waiting for its result any more
+        job["status"] = TIMEOUT
+
+    return job
+
+
+def wait(job_id, timeout=None):
+    """
+    Blocks until a job submitted by this process has finished. This is meant for tests
+    and management commands; views must never wait for a job.
+    :param job_id: <str> The ID of the job.
+    :param timeout: <float> The maximum number of seconds to wait or None to wait forever.
+    :return: <dict> The job as returned by get_job.
+    """
+    future = _futures.get(job_id)
+    if future is not None:
+        future.result(timeout)
+
+    return get_job(job_id)
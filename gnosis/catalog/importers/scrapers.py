@@ -0,0 +1,77 @@
+"""
+Importing paper information from the paper pages of the supported source websites,
+by default arXiv.org, papers.nips.cc, jmlr.org, ieeexplore.ieee.org and dl.acm.org.
+The extraction itself is done by the source adapters in catalog/importers/adapters.py.
+"""
+import socket
+from urllib.error import HTTPError, URLError
+from catalog.importers import http_cache
+from catalog.importers.adapters import URL_TIMEOUT, find_adapter, get_adapter
+
+
+def get_source_website(url):
+    """
+    Normalizes the URL of a paper page and finds out which supported website it is from.
+    :param url: The URL entered by the user, with or without the scheme.
+    :return: <tuple> (url, source_website) where source_website is one of arxiv, nips,
+    jmlr, ieee or acm, or None if the website is not supported.
+    """
+    url = url.strip()
+    # check if a particular url starts with http , it is important as JMLR does not support https
+    if url.startswith("http://"):
+        url = url[7:]
+    # check if url includes https, and if not add it
+    if not url.startswith("https://"):
+        url = "https://" + url
+    # check whether the url is from a supported website
+    adapter = find_adapter(url)
+    if adapter is not None:
+        url = adapter.normalize_url(url)
+        source_website = adapter.name
+    else:
+        source_website = None
+
+    print("source from {}".format(source_website))
+
+    return url, source_website
+
+
+def parse_paper_page(html, url, source_website):
+    """
+    Extract paper information, title, abstract, and authors, from a downloaded source
+    website paper page.
+    :param html: <bytes> or <str> The paper page.
+    :param url: The URL of the paper page.
+    :param source_website: One of arxiv, nips, jmlr, ieee or acm.
+    :return: <tuple> (title, authors, abstract, download_link) that are all None if the
+    page is not a supported paper page.
+    """
+    adapter = get_adapter(source_website)
+    if adapter is None:
+        return None, None, None, None
+    return adapter.parse(html, url)
+
+
+def get_paper_info(url, source_website):
+    """
+    Download a source website paper page and extract paper information, title, abstract,
+    and authors, from it.
+    :param url, source_website:
+    :return:
+    """
+    try:
+        adapter = get_adapter(source_website)
+        headers = adapter.headers if adapter is not None else None
+        html = http_cache.fetch(url, headers, timeout=URL_TIMEOUT)
+    except HTTPError as e:
+        print(e)
+    except URLError as e:
+        print(e)
+        print("The server could not be found.")
+    except socket.timeout as e:
+        print(e)
+        print("The server did not respond in time.")
+    else:
+        return parse_paper_page(html, url, source_website)
+
+    return None, None, None, None
@@ -0,0 +1,151 @@
+"""
+Recording the Cypher queries sent to the DB, e.g., to find the views that make one
+query per row of a list.
+
+install() wraps neomodel's db.cypher_query, which every query goes through, including
+the queries of neomodel itself, e.g., for saving a node or following a relationship.
+While a record_queries() block is running in a thread, every query sent from the thread
+is recorded with
+
+- the query with its literals replaced by ?, its fingerprint, so that queries that only
+  differ in the values written into them are counted together,
+- the number of items in its parameters, counting every element of a list parameter,
+- the number of rows it returned, and
+- the time it took in milliseconds.
+
+Queries are only timed while they are being recorded so the wrapper costs nothing
+otherwise. This is used by catalog.middleware.CypherQueryMiddleware to report the
+queries of every request.
+"""
+import functools
+import hashlib
+import re
+import threading
+import time
+from collections import namedtuple, Counter
+from contextlib import contextmanager
+from neomodel import db
+
+
+# A query sent at least this many times in one request is reported as repeated, which is
+# usually a query per row of a list that could be one query for the whole list
+REPEATED_QUERY_THRESHOLD = 10
+# At most this many distinct fingerprints are remembered for the metrics
+MAX_FINGERPRINTS = 1000
+
+Query = namedtuple("Query", ["query", "params", "fingerprint", "digest", "param_items", "rows", "time_ms"])
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+_local = threading.local()
+_fingerprints = {}
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=MAX_FINGERPRINTS)
+def fingerprint(query):
+    """
+    :param query: <str> A Cypher query.
+    :return: <tuple> (fingerprint, digest) where fingerprint is the query with string and
+    number literals replaced by ? and whitespace collapsed, e.g.,
+    "MATCH (p:Paper) WHERE ID(p)=? RETURN p", and digest is a short hash of it.
+    """
+    text = _NUMBER.sub("?", _STRING.sub("?", query))
+    text = _SPACE.sub(" ", text).strip()
+
+    return text, hashlib.md5(text.encode("utf-8")).hexdigest()[:12]
+
+
+def get_fingerprints():
+    """
+    :return: <dict> The fingerprints of the recorded queries, digest -> fingerprint.
+    """
+    with _lock:
+        return dict(_fingerprints)
+
+
+def _param_items(params):
+    if not params:
+        return 0
+    return sum(len(value) if isinstance(value, (list, tuple, dict)) else 1 for value in params.values())
+
+
+def _record(query, params, rows, time_ms, recorders):
+    text, digest = fingerprint(query)
+    with _lock:
+        if digest not in _fingerprints and len(_fingerprints) < MAX_FINGERPRINTS:
+            _fingerprints[digest] = text
+    record = Query(query, params, text, digest, _param_items(params), rows, time_ms)
+    for queries in recorders:
+        queries.append(record)
+
+
+def _instrumented(cypher_query):
+    @functools.wraps(cypher_query)
+    def wrapper(query, params=None, *args, **kwargs):
+        recorders = getattr(_local, "recorders", None)
+        if not recorders:
+            return cypher_query(query, params, *args, **kwargs)
+
+        rows = None
+        start = time.perf_counter()
+        try:
+            results, meta = cypher_query(query, params, *args, **kwargs)
+            rows = len(results) if results is not None else 0
+            return results, meta
+        finally:
+            # failed queries are recorded too, with rows None
+            _record(query, params, rows, (time.perf_counter() - start) * 1000, recorders)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def install():
+    """
+    Wraps db.cypher_query so that queries can be recorded. Calling it again does nothing.
+    """
+    if not getattr(db.cypher_query, "instrumented", False):
+        db.cypher_query = _instrumented(db.cypher_query)
+
+
+@contextmanager
+def record_queries():
+    """
+    Records the queries sent from the current thread, e.g.,
+
+        with record_queries() as queries:
+            paper_detail(request, id)
+        print(len(queries))
+
+    Blocks can be nested and every block records all the queries sent while it runs.
+    :return: <list> The Query tuples of the queries, in the order they were sent.
+    """
+    install()
+    queries = []
+    recorders = getattr(_local, "recorders", [])
+    _local.recorders = recorders + [queries]
+    try:
+        yield queries
+    finally:
+        _local.recorders = recorders
+
+
+def summarize(queries):
+    """
+    :param queries: <list> Query tuples as recorded by record_queries.
+    :return: <dict> The number of queries, their total time in milliseconds, rows and
+    param_items, and repeated, the number of times each query sent at least
+    REPEATED_QUERY_THRESHOLD times was sent, by digest.
+    """
+    counts = Counter(query.digest for query in queries)
+
+    return dict(
+        queries=len(queries),
+        time_ms=sum(query.time_ms for query in queries),
+        rows=sum(query.rows or 0 for query in queries),
+        param_items=sum(query.param_items for query in queries),
+        repeated={digest: count for digest, count in counts.items() if count >= REPEATED_QUERY_THRESHOLD},
+    )
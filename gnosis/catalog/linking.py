@@ -0,0 +1,73 @@
+"""
+Linking nodes in the catalog, e.g., a paper with its authors or the papers it cites.
+
+Connecting one pair of nodes at a time takes a request per link and, in some views,
+separate queries to read the nodes and to check whether they are linked already. Here,
+any number of (source, relationship, target) triples are linked in one transaction with,
+in Neo4j, one UNWIND ... MERGE query per relationship type, since Cypher does not accept
+the type of a relationship as a parameter (see catalog/backends). MERGE only creates the
+edges that do not exist so linking the same nodes again does nothing.
+"""
+from catalog.backends import get_backend
+
+
+# The labels of the source and target nodes of every relationship that can be linked
+RELATIONSHIPS = {
+    "authors": ("Person", "Paper"),
+    "cites": ("Paper", "Paper"),
+    "uses": ("Paper", "Paper"),
+    "extends": ("Paper", "Paper"),
+    "evaluates_on": ("Paper", "Dataset"),
+    "published": ("Paper", "Dataset"),
+    "was_published_at": ("Paper", "Venue"),
+    "implements": ("Code", "Paper"),
+    "discusses": ("Comment", "Paper"),
+}
+
+# The relationships that are linked to a paper from the node, e.g., (person)-[:authors]->(paper)
+_TO_PAPER = ("authors", "implements", "discusses")
+
+
+def paper_triples(paper_id, relationship, node_ids):
+    """
+    :param paper_id: <int> The ID of a paper.
+    :param relationship: <str> The type of the links between the paper and the nodes, e.g., cites.
+    :param node_ids: <list> The IDs of the nodes to link with the paper.
+    :return: <list> The (source, relationship, target) triples that link the nodes with the
+    paper in the direction of the relationship, e.g., from a person to a paper for authors.
+    """
+    if relationship in _TO_PAPER:
+        return [(node_id, relationship, paper_id) for node_id in node_ids]
+
+    return [(paper_id, relationship, node_id) for node_id in node_ids]
+
+
+def link_nodes(triples):
+    """
+    Adds the edges that do not exist already for a list of triples in one transaction.
+    :param triples: <list> (source ID, relationship, target ID) tuples, e.g., (person.id,
+    "authors", paper.id).
+    :return: <dict> For every triple whose source and target exist with the labels of the
+    relationship, True if the edge was added or False if it existed already. The triples
+    of missing nodes are left out.
+    :raises ValueError: If a relationship is not in RELATIONSHIPS. Nothing is linked then.
+    """
+    pairs = {}  # the distinct (source, target) pairs of every relationship
+    for source, relationship, target in triples:
+        if relationship not in RELATIONSHIPS:
+            raise ValueError("Unknown relationship {}".format(relationship))
+        pairs.setdefault(relationship, {})[(source, target)] = None
+
+    linked = {}
+    if len(pairs) == 0:
+        return linked
+
+    backend = get_backend()
+    with backend.transaction():
+        for relationship, relationship_pairs in pairs.items():
+            source_label, target_label = RELATIONSHIPS[relationship]
+            merged = backend.merge_relationships(relationship, source_label, target_label, list(relationship_pairs))
+            for source, target, added in merged:
+                linked[(source, relationship, target)] = added
+
+    return linked
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import json
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from catalog.importers.scrapers import parse_paper_page
+
+
+class Command(BaseCommand):
+    help = "Measures how long the paper scrapers take to parse the saved publisher pages, and the memory they use."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fixtures", default=os.path.join(settings.BASE_DIR, "tests", "fixtures", "scrapers"),
+            help="The directory with the saved pages and their cases.json.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20,
+            help="The number of times each page is parsed.",
+        )
+
+    def handle(self, *args, **options):
+        with open(os.path.join(options["fixtures"], "cases.json"), encoding="utf-8") as f:
+            cases = json.load(f)
+
+        times = defaultdict(list)  # source website -> seconds per parse
+        peaks = defaultdict(int)  # source website -> largest peak memory in bytes
+        for case in cases:
+            with open(os.path.join(options["fixtures"], case["file"]), "rb") as f:
+                page = f.read()
+            # the scrapers print debugging messages that would drown the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    parse_paper_page(page, case["url"], case["source_website"])
+                    times[case["source_website"]].append(time.perf_counter() - start)
+                tracemalloc.start()
+                parse_paper_page(page, case["url"], case["source_website"])
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            peaks[case["source_website"]] = max(peaks[case["source_website"]], peak)
+
+        self.stdout.write("{:<8} {:>8} {:>12} {:>12}".format("source", "parses", "mean (ms)", "peak (KB)"))
+        for source in sorted(times):
+            self.stdout.write(
+                "{:<8} {:>8} {:>12.2f} {:>12.1f}".format(
+                    source,
+                    len(times[source]),
+                    1000 * sum(times[source]) / len(times[source]),
+                    peaks[source] / 1024,
+                )
+            )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from catalog.synthetic import generate_catalog, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Adds a reproducible synthetic catalog of papers, people, venues, datasets, codes and comments " \
+           "to the DB for performance testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("num_papers", type=int, help="The number of papers to generate.")
+        parser.add_argument("--seed", type=int, default=0, help="The same seed always gives the same catalog.")
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE, help="The number of papers written in one transaction."
+        )
+
+    def handle(self, *args, **options):
+        summary = generate_catalog(
+            options["num_papers"], seed=options["seed"], batch_size=options["batch_size"], verbose=True
+        )
+
+        num_nodes = sum(summary[label] for label in ("Paper", "Person", "Venue", "Dataset", "Code", "Comment"))
+        self.stdout.write(
+            "Added {Paper} papers, {Person} people, {Venue} venues, {Dataset} datasets, {Code} codes, "
+            "{Comment} comments and {relationships} relationships".format(**summary)
+        )
+        self.stdout.write("{} nodes in {:.1f} seconds, {:.0f} nodes per second".format(
+            num_nodes, summary["seconds"], num_nodes / max(summary["seconds"], 1e-9)
+        ))
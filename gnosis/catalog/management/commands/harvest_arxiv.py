@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from catalog.importers.arxiv import harvest, ARXIV_OAI_URL
+
+
+class Command(BaseCommand):
+    help = "Imports the papers of an arXiv set, or those added or changed since it was last harvested."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--set", dest="set_spec", help="The arXiv set, e.g., cs or physics:hep-th. All of arXiv by default.")
+        parser.add_argument("--from", dest="from_date", help="Only papers added or changed on or after this date, YYYY-MM-DD.")
+        parser.add_argument("--until", dest="until_date", help="Only papers added or changed on or before this date, YYYY-MM-DD.")
+        parser.add_argument(
+            "--restart", action="store_true",
+            help="Start again instead of continuing an unfinished harvest of the set.",
+        )
+        parser.add_argument("--url", default=ARXIV_OAI_URL, help="The arXiv OAI-PMH endpoint.")
+
+    def handle(self, *args, **options):
+        summary = harvest(
+            set_spec=options["set_spec"],
+            from_date=options["from_date"],
+            until_date=options["until_date"],
+            resume=not options["restart"],
+            base_url=options["url"],
+        )
+
+        self.stdout.write(
+            "Read {} responses. Added {} papers and {} people. Skipped {} duplicate papers and {} papers "
+            "without authors.".format(
+                summary["responses"],
+                summary["papers_added"],
+                summary["people_added"],
+                summary["papers_skipped"],
+                summary["papers_without_authors"],
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from catalog.importers.bulk import import_papers, IMPORT_WORKERS, HOST_INTERVAL
+
+
+class Command(BaseCommand):
+    help = "Imports papers from a file with one paper URL or arXiv ID per line, or a BibTeX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file with the papers to import.")
+        parser.add_argument(
+            "--workers", type=int, default=IMPORT_WORKERS,
+            help="The number of papers downloaded at the same time.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=HOST_INTERVAL,
+            help="The minimum number of seconds between requests to the same website.",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], encoding="utf-8") as f:
+            text = f.read()
+
+        summary = import_papers(text, workers=options["workers"], host_interval=options["interval"])
+
+        for url, reason in summary["failures"]:
+            self.stderr.write("Failed to import {}: {}".format(url, reason))
+        self.stdout.write(
+            "Added {} papers and {} people. Skipped {} duplicate papers and {} papers without authors. "
+            "{} papers failed.".format(
+                summary["papers_added"],
+                summary["people_added"],
+                summary["papers_skipped"],
+                summary["papers_without_authors"],
+                len(summary["failures"]),
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from neomodel import install_all_labels
+from catalog.search import install_search_indexes
+
+
+class Command(BaseCommand):
+    help = "Creates the Neo4j constraints, schema indexes and full-text indexes used by Gnosis. " \
+           "Run once per database at deploy time."
+
+    def handle(self, *args, **options):
+        # Unique constraints (e.g., Paper.uid, Person.uid) and schema indexes (e.g., Paper.created)
+        # declared on the models.
+        install_all_labels(stdout=self.stdout)
+
+        created = install_search_indexes()
+        for index_name in created:
+            self.stdout.write("Created full-text index {}".format(index_name))
+        if len(created) == 0:
+            self.stdout.write("All full-text indexes already exist.")
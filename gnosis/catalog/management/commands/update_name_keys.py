@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from neomodel import db
+from catalog.names import person_keys
+
+
+# Number of people updated in one query
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Sets the normalized name keys used to match authors and search people on every person. " \
+           "Run once after upgrading a database created before the keys were added."
+
+    def handle(self, *args, **options):
+        last_id, updated = -1, 0
+        while True:
+            results, meta = db.cypher_query(
+                "MATCH (p:Person) WHERE ID(p) > {last_id} "
+                "RETURN ID(p), p.first_name, p.middle_name, p.last_name ORDER BY ID(p) LIMIT {limit}",
+                dict(last_id=last_id, limit=BATCH_SIZE),
+            )
+            if len(results) == 0:
+                break
+            rows = [
+                dict(id=node_id, keys=person_keys(first_name, middle_name, last_name))
+                for node_id, first_name, middle_name, last_name in results
+            ]
+            db.cypher_query(
+                "UNWIND {rows} AS row MATCH (p:Person) WHERE ID(p) = row.id SET p += row.keys",
+                dict(rows=rows),
+            )
+            last_id = results[-1][0]
+            updated += len(results)
+
+        self.stdout.write("Updated the name keys of {} people.".format(updated))
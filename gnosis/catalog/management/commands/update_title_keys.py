@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from neomodel import db
+from catalog.names import title_key
+
+
+# Number of papers updated in one query
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Sets the normalized title key used to find duplicates of imported papers on every paper. " \
+           "Run once after upgrading a database created before the key was added."
+
+    def handle(self, *args, **options):
+        last_id, updated = -1, 0
+        while True:
+            results, meta = db.cypher_query(
+                "MATCH (p:Paper) WHERE ID(p) > {last_id} "
+                "RETURN ID(p), p.title ORDER BY ID(p) LIMIT {limit}",
+                dict(last_id=last_id, limit=BATCH_SIZE),
+            )
+            if len(results) == 0:
+                break
+            rows = [dict(id=node_id, title_key=title_key(title)) for node_id, title in results]
+            db.cypher_query(
+                "UNWIND {rows} AS row MATCH (p:Paper) WHERE ID(p) = row.id SET p.title_key = row.title_key",
+                dict(rows=rows),
+            )
+            last_id = results[-1][0]
+            updated += len(results)
+
+        self.stdout.write("Updated the title keys of {} papers.".format(updated))
@@ -0,0 +1,70 @@
+"""
+Simple in-process counters for monitoring the app, e.g., the number of requests for
+nodes that do not exist, and summaries of measured values, e.g., the time taken by the
+DB queries of a view.
+
+The counters and summaries are kept per process and start from zero when the process
+starts.
+"""
+import threading
+from collections import Counter
+
+
+_counters = Counter()
+_summaries = {}
+_lock = threading.Lock()
+
+
+def increment(name, value=1):
+    """
+    Adds to a counter, creating it if it does not exist.
+    :param name: The name of the counter, e.g., "detail_not_found.Paper".
+    :param value: <int> The amount to add.
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def get_counter(name):
+    """
+    :param name: The name of the counter.
+    :return: <int> The value of the counter or 0 if it does not exist.
+    """
+    with _lock:
+        return _counters[name]
+
+
+def get_counters():
+    """
+    :return: <dict> A copy of all counters, name -> value.
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def observe(name, value):
+    """
+    Adds a measurement to a summary, creating it if it does not exist.
+    :param name: The name of the summary, e.g., "cypher.time_ms.paper_detail".
+    :param value: <float> The measured value.
+    """
+    with _lock:
+        summary = _summaries.get(name)
+        if summary is None:
+            _summaries[name] = dict(count=1, total=value, max=value)
+        else:
+            summary["count"] += 1
+            summary["total"] += value
+            summary["max"] = max(summary["max"], value)
+
+
+def get_summaries():
+    """
+    :return: <dict> A copy of all summaries, name -> dictionary with the number of
+    measurements, count, and their total, mean and max.
+    """
+    with _lock:
+        return {
+            name: dict(summary, mean=summary["total"] / summary["count"])
+            for name, summary in _summaries.items()
+        }
@@ -0,0 +1,80 @@
+"""
+Reporting the Cypher queries of every request.
+
+For every request that queries the DB, CypherQueryMiddleware
+
+- writes one JSON line to the catalog.cypher logger with the name of the URL, the number
+  of queries, their time, rows and parameter items, and the queries sent many times,
+  logged as a warning since they are usually a query per row of a list,
+- adds the same numbers to the counters and summaries in catalog/metrics.py, which are
+  shown by the metrics_summary view, and
+- if DEBUG or CYPHER_QUERY_HEADER is set, adds them to the response in the
+  X-Cypher-Queries header.
+"""
+import json
+import logging
+import time
+from django.conf import settings
+from catalog import metrics
+from catalog.instrumentation import install, record_queries, summarize, get_fingerprints
+
+
+QUERY_HEADER = "X-Cypher-Queries"
+
+logger = logging.getLogger("catalog.cypher")
+
+
+def _update_metrics(url_name, summary, queries):
+    metrics.increment("cypher.requests.{}".format(url_name))
+    metrics.increment("cypher.queries.{}".format(url_name), summary["queries"])
+    metrics.observe("cypher.queries_per_request.{}".format(url_name), summary["queries"])
+    metrics.observe("cypher.time_ms.{}".format(url_name), summary["time_ms"])
+    if len(summary["repeated"]) > 0:
+        metrics.increment("cypher.repeated_queries.{}".format(url_name))
+    # only the queries with a remembered fingerprint are summarized, so that there are at
+    # most MAX_FINGERPRINTS of these summaries however many distinct queries are sent
+    fingerprints = get_fingerprints()
+    for query in queries:
+        if query.digest in fingerprints:
+            metrics.observe("cypher.query_time_ms.{}".format(query.digest), query.time_ms)
+
+
+class CypherQueryMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install()
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with record_queries() as queries:
+            response = self.get_response(request)
+        if len(queries) == 0:
+            return response
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        summary = summarize(queries)
+        _update_metrics(url_name or "unknown", summary, queries)
+
+        if settings.DEBUG or getattr(settings, "CYPHER_QUERY_HEADER", False):
+            response[QUERY_HEADER] = "count={}; time_ms={:.1f}; rows={}; repeated={}".format(
+                summary["queries"], summary["time_ms"], summary["rows"], sum(summary["repeated"].values())
+            )
+
+        fingerprints = {query.digest: query.fingerprint for query in queries}
+        line = json.dumps(dict(
+            summary,
+            repeated={fingerprints[digest]: count for digest, count in summary["repeated"].items()},
+            time_ms=round(summary["time_ms"], 1),
+            url_name=url_name,
+            path=request.path,
+            method=request.method,
+            status=response.status_code,
+            request_ms=round((time.perf_counter() - start) * 1000, 1),
+        ), sort_keys=True)
+        if len(summary["repeated"]) > 0:
+            logger.warning(line)
+        else:
+            logger.info(line)
+
+        return response
@@ -5,6 +5,7 @@ from django_neomodel import DjangoNode
 from django.urls import reverse
 from neomodel import StringProperty, DateTimeProperty, DateProperty, UniqueIdProperty, \
     IntegerProperty, RelationshipTo
+from catalog.names import person_keys, title_key
 
 
 # Create your models here.
@@ -12,7 +13,7 @@ class Paper(DjangoNode):
 
     uid = UniqueIdProperty()
 
-    created = DateTimeProperty(default=datetime.now())
+    created = DateTimeProperty(default=datetime.now, index=True)
     created_by = IntegerProperty()  # The uid of the user who created this node
 
     # These are always required
@@ -23,6 +24,9 @@ class Paper(DjangoNode):
     # added source link for a paper to record the source website which the information of paper is collected
     source_link = StringProperty(required=False)
 
+    # The normalized title used to find duplicates of imported papers, set on save,
+    # see catalog/names.py
+    title_key = StringProperty(index=True)
 
     # Links
     cites = RelationshipTo("Paper", "cites")
@@ -36,6 +40,10 @@ class Paper(DjangoNode):
         app_label = 'catalog'
         ordering = ["title", "-published"]  # title is A-Z and published is from newest to oldest
 
+    def pre_save(self):
+        super().pre_save()
+        self.title_key = title_key(self.title)
+
     def __str__(self):
         """
         String for representing the Paper object, e.g., in Admin site.
@@ -50,7 +58,7 @@ class Paper(DjangoNode):
 class Person(DjangoNode):
 
     uid = UniqueIdProperty()
-    created = DateTimeProperty(default=datetime.now())
+    created = DateTimeProperty(default=datetime.now, index=True)
     created_by = IntegerProperty()  # The uid of the user who created this node
 
     # These are always required
@@ -60,6 +68,14 @@ class Person(DjangoNode):
     affiliation = StringProperty()
     website = StringProperty()
 
+    # Normalized names used to find the people an author name may refer to, set on save,
+    # see catalog/names.py
+    name_key = StringProperty(index=True)
+    block_key = StringProperty(index=True)
+    first_name_key = StringProperty(index=True)
+    middle_name_key = StringProperty(index=True)
+    last_name_key = StringProperty(index=True)
+
     authors = RelationshipTo("Paper", "authors")
     co_authors_with = RelationshipTo("Person", "co_authors_with")
     advisor_of = RelationshipTo("Person", "advisor_of")
@@ -68,6 +84,11 @@ class Person(DjangoNode):
         app_label = 'catalog'
         ordering = ['last_name', 'first_name', 'affiliation']
 
+    def pre_save(self):
+        super().pre_save()
+        for name, value in person_keys(self.first_name, self.middle_name, self.last_name).items():
+            setattr(self, name, value)
+
     def __str__(self):
 
         if self.middle_name is not None and len(self.middle_name) > 0:
@@ -81,7 +102,7 @@ class Person(DjangoNode):
 class Dataset(DjangoNode):
 
     uid = UniqueIdProperty()
-    created = DateTimeProperty(default=datetime.now())
+    created = DateTimeProperty(default=datetime.now, index=True)
     created_by = IntegerProperty()  # The uid of the user who created this node
 
     # These are always required
@@ -131,7 +152,7 @@ class Venue(DjangoNode):
                     ('N', 'No'),)
 
     uid = UniqueIdProperty()
-    created = DateTimeProperty(default=datetime.now())
+    created = DateTimeProperty(default=datetime.now, index=True)
     created_by = IntegerProperty()  # The uid of the user who created this node
 
     # These are always required
@@ -158,7 +179,7 @@ class Venue(DjangoNode):
 class Comment(DjangoNode):
 
     uid = UniqueIdProperty()
-    created = DateTimeProperty(default=datetime.now())
+    created = DateTimeProperty(default=datetime.now, index=True)
     created_by = IntegerProperty()  # The uid of the user who created this node
 
     # These are always required
@@ -183,7 +204,7 @@ class Comment(DjangoNode):
 class Code(DjangoNode):
 
     uid = UniqueIdProperty()
-    created = DateTimeProperty(default=datetime.now())
+    created = DateTimeProperty(default=datetime.now, index=True)
     created_by = IntegerProperty()  # The uid of the user who created this node
 
     description = StringProperty(required=True)
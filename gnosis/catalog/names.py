@@ -0,0 +1,141 @@
+"""
+Normalized person names for finding the people an author name may refer to.
+
+Every Person stores two keys computed from its name when it is saved,
+
+- name_key, the folded last, first and middle names, e.g., "munoz medina|andres|".
+  Two names with the same key are written the same way apart from case, accents and
+  punctuation.
+- block_key, the folded last name and first initial, e.g., "munoz medina|a". It groups
+  the people whose names may be variants of each other, e.g., "A. Muñoz Medina" and
+  "Andrés Muñoz Medina", so only the people in one block have to be compared.
+
+Both are indexed so finding the candidates for an author name is an index seek.
+
+For searching people by name, every Person also stores its folded first, middle and last
+names, e.g., first_name_key "andres", which are indexed so that a search for a name or
+the beginning of a name is an index seek rather than a LOWER() over every person.
+
+Every Paper similarly stores its folded title, title_key, which is indexed so that the
+papers already in the DB with the title of an imported paper are found by an index seek.
+"""
+import ast
+import re
+import unicodedata
+
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text):
+    """
+    :param text: <str> A name or part of a name, or None.
+    :return: <str> The text in lower case without accents, with anything other than
+    letters and digits replaced by single spaces, e.g., "Muñoz-Medina" -> "munoz medina".
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+
+
+def middle_names(middle_name):
+    """
+    Person.middle_name is a string but people added as paper authors have their middle
+    names stored as the string of a list, e.g., "['Kumar']".
+    :param middle_name: <str>, <list> or None
+    :return: <list> The middle names.
+    """
+    if not middle_name:
+        return []
+    if isinstance(middle_name, (list, tuple)):
+        return [name for name in middle_name if name]
+    if middle_name.startswith("["):
+        try:
+            names = ast.literal_eval(middle_name)
+        except (ValueError, SyntaxError):
+            names = None
+        if isinstance(names, list):
+            return [str(name) for name in names if name]
+    return middle_name.split()
+
+
+def split_name(name):
+    """
+    Splits an author name into first, middle and last names. The first token is the first
+    name, the last token the last name and anything in between the middle names.
+    :param name: <str> e.g., "Aditya Grover"
+    :return: <tuple> (first_name, middle_name, last_name) where middle_name is a list of
+    names or None.
+    :raises ValueError: If the name is empty or only whitespace.
+    """
+    name_tokens = name.split()
+    if len(name_tokens) == 0:
+        raise ValueError("Empty author name")
+    middle_name = name_tokens[1:-1] if len(name_tokens) > 2 else None
+    return name_tokens[0], middle_name, name_tokens[-1]
+
+
+def name_key(first_name, middle_name, last_name):
+    """
+    :return: <str> The key of a name, equal for names that are written the same way apart
+    from case, accents and punctuation.
+    """
+    return "|".join([fold(last_name), fold(first_name), fold(" ".join(middle_names(middle_name)))])
+
+
+def block_key(first_name, last_name):
+    """
+    :return: <str> The folded last name and first initial shared by the variants of a name.
+    """
+    return "{}|{}".format(fold(last_name), fold(first_name)[:1])
+
+
+def person_keys(first_name, middle_name, last_name):
+    """
+    :return: <dict> The values of all the normalized name properties of a Person with the
+    given name.
+    """
+    return dict(
+        name_key=name_key(first_name, middle_name, last_name),
+        block_key=block_key(first_name, last_name),
+        first_name_key=fold(first_name) or None,
+        middle_name_key=fold(" ".join(middle_names(middle_name))) or None,
+        last_name_key=fold(last_name) or None,
+    )
+
+
+def title_key(title):
+    """
+    :return: <str> The key of a paper title, equal for titles that are written the same way
+    apart from case, accents and punctuation, or None if the title is empty.
+    """
+    return fold(title) or None
+
+
+def _given_names_compatible(name, other):
+    # "a" is compatible with "aditya" since it may be an initial
+    if len(name) == 1 or len(other) == 1:
+        return name[:1] == other[:1]
+    return name == other
+
+
+def names_compatible(name, other):
+    """
+    Two names are compatible if they may be written forms of the same person's name, e.g.,
+    "A. Grover" and "Aditya Grover", but not "Aditya Grover" and "Anna Grover".
+    :param name: <tuple> (first_name, middle_name, last_name)
+    :param other: <tuple> (first_name, middle_name, last_name)
+    :return: <bool>
+    """
+    first_name, middle_name, last_name = name
+    other_first_name, other_middle_name, other_last_name = other
+    if fold(last_name) != fold(other_last_name):
+        return False
+    if not _given_names_compatible(fold(first_name), fold(other_first_name)):
+        return False
+    # middle names are often left out, so they are only compared if both names have them
+    middle = [fold(n) for n in middle_names(middle_name)]
+    other_middle = [fold(n) for n in middle_names(other_middle_name)]
+    return all(_given_names_compatible(a, b) for a, b in zip(middle, other_middle))
@@ -0,0 +1,96 @@
+"""
+Keyset (cursor based) pagination for lists of graph nodes.
+
+Nodes are ordered by (created, ID) from newest to oldest. Instead of skipping over the
+nodes of all previous pages with SKIP, every page after the first seeks directly to the
+position after the last node of the previous page using the index on created. Deep
+pages are therefore as fast as the first page.
+
+The position is passed between requests as an opaque cursor string, e.g., in the
+query string as ?after=<cursor>. Nodes without a created property are not listed.
+
+get_page reads the page from the backend in the GRAPH_BACKEND setting, see
+catalog/backends. The Neo4j backend builds its query with keyset_query and split_page.
+"""
+from catalog.backends import get_backend
+
+
+PAGE_SIZE = 25
+
+
+def encode_cursor(node):
+    """
+    :param node: A raw Neo4j node, the last one on a page.
+    :return: <str> The cursor for the page that follows the node.
+    """
+    return "{!r}_{}".format(float(node.properties["created"]), node.id)
+
+
+def decode_cursor(cursor):
+    """
+    :param cursor: <str> A cursor created by encode_cursor or None.
+    :return: <tuple> (created, node ID) or None for the first page or an invalid cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        created, node_id = cursor.split("_")
+        return float(created), int(node_id)
+    except ValueError:
+        return None
+
+
+def keyset_query(label, alias, cursor, page_size):
+    """
+    Creates the first part of a query that matches one page of nodes.
+    :param label: The label of the nodes, e.g., Paper.
+    :param alias: The variable the nodes are bound to in the query, e.g., p.
+    :param cursor: <str> The cursor of the page or None for the first page.
+    :param page_size: <int> The number of nodes in a page.
+    :return: <tuple> (query, params) where the query ends with a WITH clause that binds
+    the page of nodes to alias, so it must be followed by at least a RETURN clause.
+    One more node than the page size is matched to find out if there is a next page.
+    """
+    query = "MATCH ({alias}:{label}) WHERE {alias}.created IS NOT NULL ".format(alias=alias, label=label)
+    params = dict(page_limit=page_size + 1)
+
+    position = decode_cursor(cursor)
+    if position is not None:
+        query += (
+            "AND {alias}.created <= {{cursor_created}} "
+            "AND ({alias}.created < {{cursor_created}} OR ID({alias}) < {{cursor_id}}) "
+        ).format(alias=alias)
+        params["cursor_created"], params["cursor_id"] = position
+
+    query += "WITH {alias} ORDER BY {alias}.created DESC, ID({alias}) DESC LIMIT {{page_limit}} ".format(alias=alias)
+
+    return query, params
+
+
+def split_page(results, page_size):
+    """
+    Splits the rows matched by a keyset query into the page and the cursor of the next page.
+    :param results: <list> Rows with the raw node as their first column.
+    :param page_size: <int> The number of nodes in a page.
+    :return: <tuple> (rows, next_cursor) where next_cursor is None on the last page.
+    """
+    if len(results) <= page_size:
+        return results, None
+
+    results = results[:page_size]
+
+    return results, encode_cursor(results[-1][0])
+
+
+def get_page(model, cursor=None, page_size=PAGE_SIZE):
+    """
+    Retrieves one page of nodes ordered from newest to oldest.
+    :param model: The neomodel class of the nodes, e.g., Person.
+    :param cursor: <str> The cursor of the page or None for the first page.
+    :param page_size: <int> The number of nodes in a page.
+    :return: <tuple> (nodes, next_cursor) where nodes is a list of model objects and
+    next_cursor is None on the last page.
+    """
+    rows, next_cursor = get_backend().get_page(model.__label__, cursor, page_size)
+
+    return [model.inflate(node) for node, neighbours in rows], next_cursor
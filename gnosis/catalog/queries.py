@@ -0,0 +1,186 @@
+from catalog.models import Paper, Person, Venue
+from catalog.backends import get_backend
+from catalog.pagination import PAGE_SIZE
+
+
+#
+# Helpers for loading lists of papers together with their neighbours.
+#
+# The list views (papers index, home page, search results) show each paper with its
+# authors and venue. Retrieving these with one query per paper makes the cost of a page
+# grow linearly with the number of papers shown, so the helpers below collect everything
+# in a single round trip to the DB.
+#
+# (relationship type, label, outgoing) of the authors and the venue of a paper
+_AUTHORS_AND_VENUE = [("authors", "Person", False), ("was_published_at", "Venue", True)]
+
+
+def format_authors(author_nodes):
+    """
+    Formats Person nodes as a comma separated list of names, e.g., "A. Grover, J. Leskovec".
+    :param author_nodes: <list> Raw Neo4j nodes with label Person.
+    :return: <str>
+    """
+    authors = [Person.inflate(node) for node in author_nodes]
+    return ", ".join(
+        "{}. {}".format(author.first_name[0], author.last_name) for author in authors
+    )
+
+
+def _format_venue(venue_nodes):
+    # there should only be one venue associated with a paper
+    if len(venue_nodes) != 1:
+        return ""
+    venue = Venue.inflate(venue_nodes[0])
+    return "{}, {}".format(venue.name, venue.publication_date)
+
+
+def _inflate_rows(rows):
+    return [
+        (Paper.inflate(node), format_authors(authors), _format_venue(venues))
+        for node, (authors, venues) in rows
+    ]
+
+
+def get_papers_with_authors_and_venue(paper_ids):
+    """
+    Retrieves the papers with the given IDs together with their authors and venue
+    using a single Cypher query with the Neo4j backend.
+    :param paper_ids: <list> The IDs of the papers to retrieve.
+    :return: <list> List of (paper, authors, venue) tuples in the same order as paper_ids
+    where authors is a comma separated string of names and venue is a string that is empty
+    if the paper is not linked to exactly one venue.
+    """
+    paper_ids = list(paper_ids)
+    if len(paper_ids) == 0:
+        return []
+
+    return _inflate_rows(get_backend().get_nodes(paper_ids, "Paper", _AUTHORS_AND_VENUE))
+
+
+def get_recent_papers_with_authors_and_venue(limit):
+    """
+    Retrieves the most recently added papers together with their authors and venue
+    using a single Cypher query with the Neo4j backend.
+    :param limit: <int> The maximum number of papers to retrieve.
+    :return: <list> List of (paper, authors, venue) tuples ordered from newest to oldest.
+    """
+    rows, next_cursor = get_backend().get_page("Paper", None, limit, _AUTHORS_AND_VENUE)
+
+    return _inflate_rows(rows)
+
+
+def get_papers_page_with_authors_and_venue(cursor=None, page_size=PAGE_SIZE):
+    """
+    Retrieves one page of papers, ordered from newest to oldest, together with their
+    authors and venue using a single Cypher query with the Neo4j backend.
+    :param cursor: <str> The cursor of the page, see catalog.pagination, or None for
+    the first page.
+    :param page_size: <int> The number of papers in a page.
+    :return: <tuple> (papers, next_cursor) where papers is a list of (paper, authors, venue)
+    tuples and next_cursor is None on the last page.
+    """
+    rows, next_cursor = get_backend().get_page("Paper", cursor, page_size, _AUTHORS_AND_VENUE)
+
+    return _inflate_rows(rows), next_cursor
+
+
+#
+# Helpers for loading a single paper together with its neighbours.
+#
+def get_paper_with_neighbours(paper_id):
+    """
+    Retrieves a paper and every node directly connected to it, in either direction,
+    using a single Cypher query with the Neo4j backend.
+    :param paper_id: <int> The ID of the paper.
+    :return: <tuple> (paper, neighbours) where paper is a Paper object, or None if there
+    is no paper with the given ID, and neighbours is a list of (node, relationship_type,
+    outgoing) tuples. node is the raw Neo4j node and outgoing is True if the relationship
+    points from the paper to the node.
+    """
+    node, neighbours = get_backend().get_node_with_neighbours(paper_id, "Paper")
+    if node is None:
+        return None, []
+
+    return Paper.inflate(node), neighbours
+
+
+def select_neighbours(neighbours, label, outgoing):
+    """
+    Selects the neighbours with the given label that are connected in the given direction.
+    :param neighbours: <list> Neighbours as returned by get_paper_with_neighbours.
+    :param label: The node label, e.g., Person.
+    :param outgoing: <bool> True for relationships from the paper to the neighbour.
+    :return: <list> The raw Neo4j nodes.
+    """
+    return [
+        node for node, relationship_type, is_outgoing in neighbours
+        if is_outgoing == outgoing and label in node.labels
+    ]
+
+
+#
+# Helpers for exploring the graph around any node.
+#
+# The types of all relationships between nodes in the catalog.
+RELATIONSHIP_TYPES = [
+    "cites",
+    "uses",
+    "extends",
+    "evaluates_on",
+    "was_published_at",
+    "published",
+    "authors",
+    "co_authors_with",
+    "advisor_of",
+    "discusses",
+    "implements",
+]
+
+
+def get_node_neighbourhood(node_id, hops=1, relationship_types=None, limit=500, fan_out=50):
+    """
+    Retrieves the nodes within the given number of hops from a node with one query
+    per hop. The expansion is bounded so that exploring the graph around a highly
+    connected node does not retrieve a large part of the DB:
+
+    - at most fan_out relationships are followed from each node at every hop; when a
+      node has more relationships a random sample is taken, and
+    - no more than limit nodes in total are returned.
+
+    :param node_id: <int> The ID of the node at the centre of the neighbourhood.
+    :param hops: <int> The maximum distance from the centre node.
+    :param relationship_types: <list> Only follow relationships of these types, or all
+    relationships if None.
+    :param limit: <int> The maximum number of nodes to return.
+    :param fan_out: <int> The maximum number of relationships followed from each node.
+    :return: <tuple> (nodes, edges, truncated) where nodes maps node ID to a tuple
+    (raw node, relationship type) giving the relationship through which the node was
+    first reached ("origin" for the centre node), edges is a list of (source ID,
+    target ID, relationship type) tuples and truncated is True if the limit was
+    reached. nodes is empty if there is no node with the given ID.
+    """
+    backend = get_backend()
+    centre = backend.get_node(node_id)
+    if centre is None:
+        return {}, [], False
+
+    nodes = {node_id: (centre, "origin")}
+    edges = set()
+    truncated = False
+    frontier = [node_id]
+    for hop in range(hops):
+        if len(frontier) == 0:
+            break
+        sample = backend.sample_relationships(frontier, relationship_types, fan_out)
+        frontier = []
+        for source_id, target_id, relationship_type, node in sample:
+            if node.id not in nodes:
+                if len(nodes) >= limit:
+                    truncated = True
+                    continue
+                nodes[node.id] = (node, relationship_type)
+                frontier.append(node.id)
+            edges.add((source_id, target_id, relationship_type))
+
+    return nodes, sorted(edges), truncated
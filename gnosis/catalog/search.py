@@ -0,0 +1,194 @@
+"""
+Full-text search for the catalog.
+
+Searching with a case-insensitive regular expression, e.g., p.title =~ '(?i).*graph.*',
+forces Neo4j to scan every node with the given label. Instead, we keep Neo4j full-text
+indexes (Neo4j 3.5 or later) over the searchable properties and query those. Neo4j
+updates the indexes whenever nodes are created, updated or deleted so there is nothing
+to keep in sync on save or delete.
+
+The indexes must be created once for every database using,
+
+    python manage.py install_indexes
+"""
+import re
+from neomodel import db
+from nltk.corpus import stopwords
+from catalog.models import Paper, Person
+from catalog.names import fold
+from catalog.backends import get_backend
+
+
+PAPER_SEARCH_INDEX = "paper_search"
+PERSON_SEARCH_INDEX = "person_search"
+VENUE_SEARCH_INDEX = "venue_search"
+DATASET_SEARCH_INDEX = "dataset_search"
+CODE_SEARCH_INDEX = "code_search"
+
+# index name -> (node labels, node properties)
+SEARCH_INDEXES = {
+    PAPER_SEARCH_INDEX: (["Paper"], ["title", "abstract", "keywords"]),
+    PERSON_SEARCH_INDEX: (["Person"], ["first_name_key", "middle_name_key", "last_name_key"]),
+    VENUE_SEARCH_INDEX: (["Venue"], ["name", "publisher", "keywords"]),
+    DATASET_SEARCH_INDEX: (["Dataset"], ["name", "keywords", "description"]),
+    CODE_SEARCH_INDEX: (["Code"], ["website", "description", "keywords"]),
+}
+
+# What autocomplete searches for each kind of node,
+# kind -> (index name, property searched or None for all, property shown)
+AUTOCOMPLETE_SOURCES = {
+    "papers": (PAPER_SEARCH_INDEX, "title", "title"),
+    "venues": (VENUE_SEARCH_INDEX, "name", "name"),
+    "datasets": (DATASET_SEARCH_INDEX, "name", "name"),
+    "codes": (CODE_SEARCH_INDEX, None, "website"),
+}
+
+# How much a match on each name counts when ranking people
+_NAME_WEIGHTS = {"last_name_key": 3, "first_name_key": 2, "middle_name_key": 1}
+# At most this many matches of a single word are ranked
+_MAX_NAME_MATCHES = 1000
+
+# Characters with special meaning in the Lucene query syntax
+_LUCENE_SPECIAL_CHARACTERS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def install_search_indexes():
+    """
+    Creates the full-text indexes in SEARCH_INDEXES unless they already exist.
+    :return: <list> The names of the indexes that were created.
+    """
+    results, meta = db.cypher_query("CALL db.indexes() YIELD indexName RETURN indexName")
+    existing_indexes = set(row[0] for row in results)
+
+    created = []
+    for index_name, (labels, properties) in SEARCH_INDEXES.items():
+        if index_name not in existing_indexes:
+            query = "CALL db.index.fulltext.createNodeIndex({index_name}, {labels}, {properties})"
+            db.cypher_query(query, dict(index_name=index_name, labels=labels, properties=properties))
+            created.append(index_name)
+
+    return created
+
+
+def build_search_query(query_string, field=None):
+    """
+    Converts the text entered by a user into a Lucene query that requires every word
+    (ignoring English stopwords) to appear. The last word is matched as a prefix so that
+    partially typed words return results.
+    :param query_string: The text to search for, e.g., part of a paper title.
+    :param field: If given, only this property is searched, otherwise all indexed properties.
+    :return: The Lucene query string or None if there is nothing to search for.
+    """
+    english_stopwords = stopwords.words("english")
+    tokens = [
+        _LUCENE_SPECIAL_CHARACTERS.sub(r"\\\1", w)
+        for w in query_string.lower().split()
+        if w not in english_stopwords
+    ]
+    if len(tokens) == 0:
+        return None
+
+    tokens[-1] = tokens[-1] + "*"
+
+    search_query = " AND ".join(tokens)
+    if field is not None:
+        search_query = "{}:({})".format(field, search_query)
+
+    return search_query
+
+
+def search_index(index_name, query_string, page=1, page_size=25, field=None):
+    """
+    Queries a full-text index and returns one page of matching nodes ranked by score.
+    :param index_name: The name of one of the indexes in SEARCH_INDEXES.
+    :param query_string: The text to search for.
+    :param page: <int> The page of results to return starting from 1.
+    :param page_size: <int> The number of results per page.
+    :param field: If given, only this property is searched, otherwise all indexed properties.
+    :return: <tuple> (nodes, has_next) where nodes is a list of raw Neo4j nodes and
+    has_next is True if there are more results after this page.
+    """
+    page = max(page, 1)
+    # ask for one more result than we need to find out if there is a next page
+    nodes = get_backend().search_nodes(index_name, query_string, (page - 1) * page_size, page_size + 1, field)
+
+    return nodes[:page_size], len(nodes) > page_size
+
+
+def search_papers(query_string, page=1, page_size=25, field=None):
+    """
+    Searches the title, abstract and keywords of all papers.
+    :param query_string: The text to search for, e.g., part of a paper title.
+    :param page: <int> The page of results to return starting from 1.
+    :param page_size: <int> The number of results per page.
+    :param field: If given, e.g., "title", only this property is searched.
+    :return: <tuple> (papers, has_next) where papers is a list of Paper objects ranked
+    from best to worst match.
+    """
+    nodes, has_next = search_index(PAPER_SEARCH_INDEX, query_string, page, page_size, field)
+
+    return [Paper.inflate(node) for node in nodes], has_next
+
+
+def _people_by_id(node_ids):
+    return [Person.inflate(node) for node, neighbours in get_backend().get_nodes(node_ids, "Person")]
+
+
+def search_people(person_name, exact_match=False, limit=20):
+    """
+    Searches people by name, ignoring case, accents and punctuation. Every word matches the
+    first, middle or last names that start with it with the schema indexes on the folded
+    names of Person. People are ranked by how many words match, whole names ranking above
+    prefixes and last names above first and middle names. If no name starts with any of
+    the words, the person_search full-text index is used to find similarly spelled names.
+    :param person_name: <str> The name to search for, e.g., "grover" or "aditya grov".
+    :param exact_match: <bool> If True, only people whose first and last names, and middle
+    name if three or more words are given, are all among the words are returned.
+    :param limit: <int> The maximum number of people to return.
+    :return: <list> The matching Person objects from best to worst match.
+    """
+    tokens = fold(person_name).split()
+    if len(tokens) == 0:
+        return []
+
+    backend = get_backend()
+    if exact_match:
+        properties = dict(last_name_key=tokens, first_name_key=tokens)
+        if len(tokens) > 2:
+            properties["middle_name_key"] = tokens
+        return [Person.inflate(node) for node in backend.match_nodes("Person", properties, limit)]
+
+    results = backend.find_prefixes("Person", list(_NAME_WEIGHTS), tokens, _MAX_NAME_MATCHES)
+
+    scores = {}
+    for node_id, token, whole, key in results:
+        # each word counts once per person, for the name it matches best
+        best = scores.setdefault(node_id, {})
+        score = _NAME_WEIGHTS[key] * (2 if whole else 1)
+        best[token] = max(best.get(token, 0), score)
+
+    if len(scores) > 0:
+        ranked = sorted(
+            scores, key=lambda node_id: (len(scores[node_id]), sum(scores[node_id].values())), reverse=True
+        )
+        return _people_by_id(ranked[:limit])
+
+    # nothing starts with the words so look for misspellings
+    return [Person.inflate(node) for node in backend.search_similar(PERSON_SEARCH_INDEX, tokens, limit)]
+
+
+def autocomplete(kind, query_string, limit=10):
+    """
+    Finds the nodes whose names start with the text typed so far, for suggesting them
+    while the user types. Only the node IDs and names are read from the DB.
+    :param kind: <str> One of people or the keys of AUTOCOMPLETE_SOURCES, e.g., papers.
+    :param query_string: <str> The text typed so far, the last word may be incomplete.
+    :param limit: <int> The maximum number of suggestions.
+    :return: <list> (node ID, name) tuples from best to worst match.
+    """
+    if kind == "people":
+        return [(person.id, str(person)) for person in search_people(query_string, limit=limit)]
+
+    index_name, field, name_property = AUTOCOMPLETE_SOURCES[kind]
+
+    return get_backend().search_names(index_name, query_string, name_property, limit, field)
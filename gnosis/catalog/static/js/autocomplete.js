@@ -0,0 +1,55 @@
+// Suggests papers, people, venues, datasets or codes while typing in a search form.
+//
+// gnosis_autocomplete(input, source_url, select_url) asks source_url, e.g.,
+// /catalog/autocomplete/people/, for suggestions matching the text in the input and
+// lists them below it. Picking a suggestion opens select_url with {id} replaced by the ID
+// of the suggested node, e.g., to connect it to a paper without submitting the form. If
+// select_url is not given, the name of the suggestion is copied into the input instead.
+function gnosis_autocomplete(input, source_url, select_url) {
+    input = $(input);
+    var results = $('<div class="list-group autocomplete-results"></div>').insertAfter(input);
+    var timer = null;
+    var last_query = null;
+
+    input.attr("autocomplete", "off");
+
+    function show(query, suggestions) {
+        // an older request may finish after a newer one
+        if (query !== input.val().trim()) {
+            return;
+        }
+        results.empty();
+        $.each(suggestions, function (i, suggestion) {
+            var item = $('<a class="list-group-item list-group-item-action"></a>').text(suggestion.label);
+            if (select_url) {
+                item.attr("href", select_url(suggestion.id));
+            } else {
+                item.attr("href", "#").on("click", function (event) {
+                    event.preventDefault();
+                    input.val(suggestion.label);
+                    results.empty();
+                });
+            }
+            results.append(item);
+        });
+    }
+
+    input.on("input", function () {
+        clearTimeout(timer);
+        // wait until the user stops typing for a moment
+        timer = setTimeout(function () {
+            var query = input.val().trim();
+            if (query === last_query) {
+                return;
+            }
+            last_query = query;
+            if (query.length < 2) {
+                results.empty();
+                return;
+            }
+            $.getJSON(source_url, {q: query}, function (response) {
+                show(query, response.results);
+            });
+        }, 150);
+    });
+}
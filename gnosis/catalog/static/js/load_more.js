@@ -0,0 +1,36 @@
+// Loads the next page of an index (papers, people, datasets, venues, codes) in place.
+//
+// Every page ends with a "More" link to ?after=<cursor>. Without JavaScript the link
+// opens the next page. With JavaScript the next page is requested as an HTML fragment,
+// which again ends with a "More" link unless it is the last page, and replaces the link.
+// The link is followed automatically when it is scrolled into view.
+$(function () {
+    var loading = false;
+
+    function load_more(link) {
+        if (loading) {
+            return;
+        }
+        loading = true;
+        // jQuery marks the request with X-Requested-With so the view only renders the fragment
+        $.get(link.attr("href"))
+            .done(function (html) {
+                link.closest(".load-more").replaceWith(html);
+            })
+            .always(function () {
+                loading = false;
+            });
+    }
+
+    $(document).on("click", ".load-more a", function (event) {
+        event.preventDefault();
+        load_more($(this));
+    });
+
+    $(window).on("scroll", function () {
+        var link = $(".load-more a");
+        if (link.length > 0 && link.offset().top < $(window).scrollTop() + $(window).height() + 200) {
+            load_more(link.first());
+        }
+    });
+});
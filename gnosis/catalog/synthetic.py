@@ -0,0 +1,273 @@
+"""
+A generator of large synthetic catalogs for measuring the performance of the app.
+
+The catalog has the shape of a real one,
+
+- the number of authors of a paper is 1 plus an exponentially distributed number with
+  mean AUTHORS_MEAN - 1, and a few people write many papers while most write one or two,
+- papers cite earlier papers, mostly the papers that are already cited often, so the
+  numbers of citations follow a power law,
+- most papers are published at a venue, some evaluate on datasets and have code, and a
+  few have comments.
+
+The same num_papers and seed always give the same catalog. Nodes are created in batches
+with one query per label and relationship type, and one transaction per batch of papers,
+through the storage backend (see catalog/backends), so a catalog can also be generated
+in memory for benchmarks.
+
+This is used by the generate_catalog management command and the build view.
+"""
+import random
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from catalog.backends import get_backend
+from catalog.counts import invalidate_count, COUNTED_MODELS
+from catalog.names import person_keys, title_key
+
+
+# Number of papers created in one transaction
+BATCH_SIZE = 10000
+# Mean and maximum number of authors of a paper
+AUTHORS_MEAN = 3.5
+MAX_AUTHORS = 30
+# Mean number of papers cited by a paper
+CITATIONS_MEAN = 10
+# Probability that a citation goes to a paper in proportion to the citations it already has
+PREFERENTIAL_CITATIONS = 0.8
+# Numbers of other nodes per paper
+PEOPLE_PER_PAPER = 1.0
+VENUES_PER_PAPER = 1 / 500
+DATASETS_PER_PAPER = 1 / 200
+# Fractions of papers with a venue and with code
+VENUE_FRACTION = 0.8
+CODE_FRACTION = 0.2
+# Mean numbers of datasets and comments of a paper
+DATASETS_MEAN = 0.5
+COMMENTS_MEAN = 0.3
+
+# The first paper is created at START_DATE and every following paper PAPER_INTERVAL later
+START_DATE = datetime(2010, 1, 1)
+PAPER_INTERVAL = timedelta(minutes=10)
+
+_ADJECTIVES = [
+    "Scalable", "Robust", "Efficient", "Deep", "Stochastic", "Hierarchical", "Sparse", "Adaptive",
+    "Bayesian", "Inductive", "Semi-supervised", "Unsupervised", "Distributed", "Online", "Provable",
+]
+_METHODS = [
+    "graph convolutional networks", "random walks", "matrix factorization", "variational inference",
+    "attention", "kernel methods", "message passing", "contrastive learning", "spectral clustering",
+    "gradient boosting", "embeddings", "generative models", "label propagation", "transformers",
+]
+_TASKS = [
+    "node classification", "link prediction", "community detection", "recommendation",
+    "anomaly detection", "graph classification", "entity resolution", "knowledge base completion",
+    "traffic forecasting", "molecule generation", "citation analysis", "fraud detection",
+]
+_OBJECTS = [
+    "large graphs", "heterogeneous networks", "social networks", "citation networks",
+    "dynamic graphs", "knowledge graphs", "road networks", "protein interaction networks",
+]
+_SENTENCES = [
+    "We propose {adjective} {method} for {task}.",
+    "Existing approaches to {task} do not scale to {object}.",
+    "Our method combines {method} with {other_method} in a single model.",
+    "Experiments on {object} show that it outperforms the state of the art on {task}.",
+    "We also show that {method} can be trained in time linear in the size of the graph.",
+    "Code and data are publicly available.",
+]
+_FIRST_NAMES = [
+    "Aditya", "Alice", "Andrés", "Anna", "Bryan", "Chen", "Daniel", "David", "Elena", "Emma", "Fatima",
+    "Hiroshi", "Ivan", "James", "Jure", "Ke", "Laura", "Li", "Maria", "Mohammed", "Olga", "Pantelis",
+    "Priya", "Rahul", "Sara", "Thomas", "Wei", "Yuki", "Zoe", "Lucas", "Noah", "Amir", "Ingrid", "Kwame",
+]
+_SYLLABLES = [
+    "ba", "ko", "ri", "sen", "ta", "mu", "lin", "ga", "dor", "vi", "na", "pe", "zhu", "ka", "mor",
+    "el", "an", "ste", "ro", "wa", "chi", "lo", "ber", "ny", "ha", "ven", "so", "ti", "gru", "de",
+]
+_PUBLISHERS = ["ACM", "IEEE", "Springer", "Elsevier", "PMLR", "NeurIPS Foundation", "AAAI Press"]
+_VENUE_TYPES = ["C", "J", "W", "R"]
+_DATASET_TYPES = ["N", "I", "V", "M"]
+_EPOCH = datetime(1970, 1, 1)
+
+
+# Properties are written in the format neomodel stores them in rather than with
+# Model.deflate, which takes longer than writing the nodes, e.g., dates as ISO strings
+# and times as seconds since the epoch in UTC
+def _timestamp(index):
+    return (START_DATE + index * PAPER_INTERVAL - _EPOCH).total_seconds()
+
+
+def _uid(rng):
+    return "{:032x}".format(rng.getrandbits(128))
+
+
+def _last_name(rng):
+    return "".join(rng.choice(_SYLLABLES) for i in range(rng.randint(2, 3))).capitalize()
+
+
+def _title(rng):
+    return "{} {} for {} on {}".format(
+        rng.choice(_ADJECTIVES), rng.choice(_METHODS), rng.choice(_TASKS), rng.choice(_OBJECTS)
+    )
+
+
+def _abstract(rng):
+    words = dict(
+        adjective=rng.choice(_ADJECTIVES).lower(), method=rng.choice(_METHODS),
+        other_method=rng.choice(_METHODS), task=rng.choice(_TASKS), object=rng.choice(_OBJECTS),
+    )
+    return " ".join(sentence.format(**words) for sentence in _SENTENCES)
+
+
+def _skewed_index(rng, n, skew=3):
+    # an index in [0, n) where small indices are much more likely, e.g., prolific authors
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def _person(rng, index):
+    first_name, last_name = rng.choice(_FIRST_NAMES), _last_name(rng)
+    middle_name = rng.choice(_FIRST_NAMES) if rng.random() < 0.2 else None
+    properties = dict(uid=_uid(rng), first_name=first_name, last_name=last_name, created=_timestamp(index),
+                      **person_keys(first_name, middle_name, last_name))
+    if middle_name is not None:
+        properties["middle_name"] = middle_name
+    # people without a middle name have no middle_name_key
+    return {key: value for key, value in properties.items() if value is not None}
+
+
+def _venue(rng, index):
+    name = "{} Conference on {}".format(rng.choice(["International", "European", "Asian", "Annual"]),
+                                        rng.choice(_TASKS).title())
+    return dict(uid=_uid(rng), name=name, publication_date=date(2010 + index % 12, rng.randint(1, 12), 1).isoformat(),
+                type=rng.choice(_VENUE_TYPES), publisher=rng.choice(_PUBLISHERS),
+                keywords=", ".join(rng.sample(_TASKS, 3)), peer_reviewed="Y", created=_timestamp(0))
+
+
+def _dataset(rng, index):
+    return dict(uid=_uid(rng), name="{} {}".format(rng.choice(_OBJECTS).title(), index),
+                keywords=", ".join(rng.sample(_TASKS, 2)), description=_abstract(rng),
+                source_type=rng.choice(_DATASET_TYPES), created=_timestamp(0))
+
+
+def _paper(rng, index):
+    title = _title(rng)
+    return dict(uid=_uid(rng), title=title, title_key=title_key(title), abstract=_abstract(rng),
+                keywords=", ".join(rng.sample(_TASKS, 2)),
+                download_link="https://example.org/papers/{}.pdf".format(index), created=_timestamp(index))
+
+
+def _code(rng, index):
+    return dict(uid=_uid(rng), website="https://github.com/gnosis-synthetic/repo-{}".format(index),
+                description="An implementation of the paper.", keywords=", ".join(rng.sample(_METHODS, 2)),
+                created=_timestamp(index))
+
+
+def _comment(rng, index):
+    return dict(uid=_uid(rng), author="{} {}".format(rng.choice(_FIRST_NAMES), _last_name(rng)),
+                text="Does {} also work on {}?".format(rng.choice(_METHODS), rng.choice(_OBJECTS)),
+                publication_date=_timestamp(index), created=_timestamp(index))
+
+
+def _create_nodes(backend, label, make_properties, rng, count, batch_size):
+    # the properties are made one batch at a time so that memory use does not grow with count
+    ids = array("q")
+    for start in range(0, count, batch_size):
+        rows = [make_properties(rng, i) for i in range(start, min(count, start + batch_size))]
+        with backend.transaction():
+            ids.extend(backend.create_nodes(label, rows))
+    return ids
+
+
+def _cited_papers(rng, index, cited):
+    # the earlier papers cited by paper index; cited holds one entry per citation so far
+    num_citations = min(index, int(rng.expovariate(1 / CITATIONS_MEAN)))
+    targets = set()
+    for attempt in range(2 * num_citations):
+        if len(targets) == num_citations:
+            break
+        if len(cited) > 0 and rng.random() < PREFERENTIAL_CITATIONS:
+            targets.add(cited[rng.randrange(len(cited))])
+        else:
+            targets.add(rng.randrange(index))
+    return targets
+
+
+def generate_catalog(num_papers, seed=0, batch_size=BATCH_SIZE, verbose=False):
+    """
+    Adds a synthetic catalog to the DB.
+    :param num_papers: <int> The number of papers. The numbers of the other nodes are
+    proportional to it.
+    :param seed: <int> The seed of the random numbers. The same seed gives the same catalog.
+    :param batch_size: <int> The number of papers created in one transaction.
+    :param verbose: <bool> Print the progress after every batch.
+    :return: <dict> The number of nodes created of every label, the number of
+    relationships and the number of seconds it took.
+    """
+    rng = random.Random(seed)
+    backend = get_backend()
+    start_time = time.perf_counter()
+    summary = dict(relationships=0)
+
+    num_people = max(1, int(num_papers * PEOPLE_PER_PAPER))
+    person_ids = _create_nodes(backend, "Person", _person, rng, num_people, batch_size)
+    venue_ids = _create_nodes(backend, "Venue", _venue, rng, max(1, int(num_papers * VENUES_PER_PAPER)), batch_size)
+    dataset_ids = _create_nodes(
+        backend, "Dataset", _dataset, rng, max(1, int(num_papers * DATASETS_PER_PAPER)), batch_size
+    )
+    summary.update(Person=len(person_ids), Venue=len(venue_ids), Dataset=len(dataset_ids), Paper=0, Code=0, Comment=0)
+
+    paper_ids = array("q")
+    cited = array("q")  # the index of the cited paper of every citation so far
+    for batch_start in range(0, num_papers, batch_size):
+        indices = range(batch_start, min(num_papers, batch_start + batch_size))
+        papers = [_paper(rng, i) for i in indices]
+        relationships = dict(authors=[], was_published_at=[], evaluates_on=[], cites=[])
+        codes, comments = [], []  # (properties, paper index)
+        for i in indices:
+            num_authors = min(MAX_AUTHORS, 1 + int(rng.expovariate(1 / (AUTHORS_MEAN - 1))))
+            for author in set(_skewed_index(rng, num_people) for a in range(num_authors)):
+                relationships["authors"].append((person_ids[author], i))
+            if rng.random() < VENUE_FRACTION:
+                relationships["was_published_at"].append((i, venue_ids[rng.randrange(len(venue_ids))]))
+            for dataset in set(_skewed_index(rng, len(dataset_ids), 2)
+                               for d in range(int(rng.expovariate(1 / DATASETS_MEAN)))):
+                relationships["evaluates_on"].append((i, dataset_ids[dataset]))
+            targets = _cited_papers(rng, i, cited)
+            relationships["cites"].extend((i, target) for target in targets)
+            cited.extend(targets)
+            if rng.random() < CODE_FRACTION:
+                codes.append((_code(rng, i), i))
+            for c in range(int(rng.expovariate(1 / COMMENTS_MEAN))):
+                comments.append((_comment(rng, i), i))
+
+        with backend.transaction():
+            paper_ids.extend(backend.create_nodes("Paper", papers))
+            code_ids = backend.create_nodes("Code", [properties for properties, i in codes])
+            comment_ids = backend.create_nodes("Comment", [properties for properties, i in comments])
+            # replace the indices of the papers by their IDs
+            pairs = dict(
+                authors=[(source, paper_ids[i]) for source, i in relationships["authors"]],
+                was_published_at=[(paper_ids[i], target) for i, target in relationships["was_published_at"]],
+                evaluates_on=[(paper_ids[i], target) for i, target in relationships["evaluates_on"]],
+                cites=[(paper_ids[i], paper_ids[target]) for i, target in relationships["cites"]],
+                implements=[(code_id, paper_ids[i]) for code_id, (properties, i) in zip(code_ids, codes)],
+                discusses=[(comment_id, paper_ids[i]) for comment_id, (properties, i) in zip(comment_ids, comments)],
+            )
+            for relationship, relationship_pairs in pairs.items():
+                backend.create_relationships(relationship, relationship_pairs)
+                summary["relationships"] += len(relationship_pairs)
+
+        summary["Paper"] += len(papers)
+        summary["Code"] += len(codes)
+        summary["Comment"] += len(comments)
+        if verbose:
+            print("Generated {} of {} papers in {:.1f} seconds".format(
+                summary["Paper"], num_papers, time.perf_counter() - start_time
+            ))
+
+    for model in COUNTED_MODELS:
+        invalidate_count(model)
+    summary["seconds"] = time.perf_counter() - start_time
+
+    return summary
@@ -6,6 +6,7 @@ urlpatterns = [
     path('papers/', views.papers, name='papers_index'),
     path('persons/', views.persons, name='persons_index'),
     path('paper/<int:id>/', views.paper_detail, name='paper_detail'),
+    path('paper/<int:id>/ego.json', views.paper_ego_network, name='paper_ego_network'),
     path('build', views.build, name='build_db'),
 ]
 
@@ -21,10 +22,14 @@ urlpatterns += [
     path('paper/<int:id>/connect/dataset', views.paper_connect_dataset, name='paper_connect_dataset'),
     path('paper/<int:id>/connect/code', views.paper_connect_code, name='paper_connect_code'),
     path('paper/<int:id>/connect/code/<int:cid>', views.paper_connect_code_selected, name='paper_connect_code_selected'),
+    path('paper/<int:id>/connect/selected', views.paper_connect_selected, name='paper_connect_selected'),
     path('paper/<int:id>/authors', views.paper_authors, name='paper_authors'),
     path('paper/<int:id>/remove/author/<int:rid>', views.paper_remove_author, name='paper_remove_author'),
     path('paper/create/', views.paper_create, name='paper_create'),
     path('paper/import/', views.paper_create_from_url, name='paper_create_from_url'),
+    path('paper/import/bulk/', views.paper_bulk_import, name='paper_bulk_import'),
+    path('paper/import/bulk/<str:job_id>/', views.paper_bulk_import_status, name='paper_bulk_import_status'),
+    path('paper/import/<str:job_id>/', views.paper_import_status, name='paper_import_status'),
     path('paper/find/', views.paper_find, name='paper_find'),
     path('paper/<int:id>/group/add', views.paper_add_to_group, name='paper_add_to_group'),
     path('paper/<int:id>/group/add/<int:gid>', views.paper_add_to_group_selected, name='paper_add_to_group_selected'),
@@ -99,4 +104,19 @@ urlpatterns += [
     path('collection/<int:id>/delete', views.collection_delete, name='collection_delete'),
     # path('collection/<int:id>/entry/<int:eid>/update', views.collection_entry_update, name='collection_entry_update'),
     path('collection/<int:id>/entry/<int:eid>/remove', views.collection_entry_remove, name='collection_entry_remove'),
-]
\ No newline at end of file
+]
+
+# for exploring the graph around any node
+urlpatterns += [
+    path('graph/<int:id>/neighbourhood', views.graph_neighbourhood, name='graph_neighbourhood'),
+]
+
+# JSON suggestions while typing in search forms
+urlpatterns += [
+    path('autocomplete/<str:kind>/', views.autocomplete, name='autocomplete'),
+]
+
+# Counters and query timings of this process for monitoring
+urlpatterns += [
+    path('metrics/', views.metrics_summary, name='metrics_summary'),
+]
@@ -2,4 +2,7 @@ from catalog.views.views import *
 from catalog.views.views_people import *
 from catalog.views.views_codes import *
 from catalog.views.views_group import *
-from catalog.views.views_collection import *
\ No newline at end of file
+from catalog.views.views_collection import *
+from catalog.views.views_graph import *
+from catalog.views.views_autocomplete import *
+from catalog.views.views_metrics import *
@@ -0,0 +1,70 @@
+"""
+The response of the detail views when there is no node with the requested ID.
+
+The detail views used to render the index with every node of the label when the ID did
+not exist. Requests for stale IDs, e.g., from a crawler, could then load the whole catalog
+on every request. Instead, we redirect to the index, which only loads its first page, and
+refuse clients that keep asking for missing nodes.
+
+Clients are told apart by their IP address. Behind reverse proxies, every request comes
+from the address of a proxy, so NUM_PROXIES in settings.py must be set to the number of
+proxies, which add the address of the client to the X-Forwarded-For header.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from catalog import metrics
+
+
+# At most NOT_FOUND_LIMIT missed lookups per client every NOT_FOUND_WINDOW seconds
+NOT_FOUND_LIMIT = 30
+NOT_FOUND_WINDOW = 60  # seconds
+
+
+def _client_ip(request):
+    # every proxy appends the address it received the request from to X-Forwarded-For, so
+    # the client is NUM_PROXIES addresses from the end; the addresses before it are set by
+    # the client and cannot be trusted
+    num_proxies = getattr(settings, "NUM_PROXIES", 0)
+    if num_proxies > 0:
+        addresses = [address.strip() for address in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")]
+        addresses = [address for address in addresses if address]
+        if len(addresses) > 0:
+            return addresses[-min(num_proxies, len(addresses))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _is_rate_limited(request):
+    # counts the misses of the client in the current window; cache.add only sets the
+    # key if it is missing so the window starts with the first miss
+    key = "not_found:{}".format(_client_ip(request))
+    cache.add(key, 0, NOT_FOUND_WINDOW)
+    try:
+        misses = cache.incr(key)
+    except ValueError:  # the key expired between add and incr
+        cache.add(key, 1, NOT_FOUND_WINDOW)
+        misses = 1
+
+    return misses > NOT_FOUND_LIMIT
+
+
+def detail_not_found(request, label, index_url_name):
+    """
+    Creates the response for a detail page of a node that does not exist.
+    :param request: The request for the detail page.
+    :param label: The label of the requested node, e.g., Paper.
+    :param index_url_name: The name of the URL of the index for the label, e.g., papers_index.
+    :return: A redirect to the index or a 429 response if the client has requested too
+    many missing nodes recently.
+    """
+    metrics.increment("detail_not_found")
+    metrics.increment("detail_not_found.{}".format(label))
+
+    if _is_rate_limited(request):
+        metrics.increment("detail_not_found.rate_limited")
+        response = HttpResponse("Too many requests for missing pages.", status=429)
+        response["Retry-After"] = str(NOT_FOUND_WINDOW)
+        return response
+
+    return HttpResponseRedirect(reverse(index_url_name))
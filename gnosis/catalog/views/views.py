@@ -1,7 +1,9 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import Http404
+from django.http import Http404, JsonResponse
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_POST
 from catalog.models import Paper, Person, Dataset, Venue, Comment, Code
 from catalog.models import ReadingGroup, ReadingGroupEntry
 from catalog.models import Collection, CollectionEntry
@@ -13,6 +15,7 @@ from catalog.forms import (
     VenueForm,
     CommentForm,
     PaperImportForm,
+    PaperBulkImportForm,
 )
 from catalog.forms import (
     SearchVenuesForm,
@@ -25,96 +28,59 @@ from catalog.forms import (
 from django.urls import reverse
 from django.http import HttpResponseRedirect
 from neomodel import db
-from datetime import date
+from catalog.views.not_found import detail_not_found
+from catalog.counts import count_nodes, invalidate_count
 from nltk.corpus import stopwords
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
-from bs4 import BeautifulSoup
 from django.contrib import messages
 from catalog.views.views_codes import _code_find
-import re
+from catalog.views.views_people import _person_find
+from catalog.queries import get_papers_page_with_authors_and_venue
+from catalog.pagination import get_page
+from catalog.queries import get_paper_with_neighbours, select_neighbours, format_authors
+from catalog.search import search_papers
+from catalog.cytoscape import ego_network_elements
+from catalog.importers import jobs as import_jobs
+from catalog.importers.scrapers import get_paper_info, get_source_website
+from catalog.importers.bulk import import_papers
+from catalog.authors import resolve_author
+from catalog.names import split_name
+from catalog.linking import link_nodes, paper_triples
+from catalog.backends import get_backend
+from catalog.synthetic import generate_catalog
+import random
+
+
+# Seconds after which a bulk import is reported as timed out
+BULK_IMPORT_TIMEOUT = 6 * 60 * 60
+# The number of papers added by the build view
+BUILD_NUM_PAPERS = 50
 
 
 #
 # Paper Views
 #
-def get_paper_authors(paper):
-    query = "MATCH (:Paper {title: {paper_title}})<--(a:Person) RETURN a"
-    results, meta = db.cypher_query(query, dict(paper_title=paper.title))
-    if len(results) > 0:
-        authors = [Person.inflate(row[0]) for row in results]
-    else:
-        authors = []
-    # pdb.set_trace()
-    authors = [
-        "{}. {}".format(author.first_name[0], author.last_name) for author in authors
-    ]
-
-    return authors
-
-
-def _get_paper_codes(paper):
-    query = "MATCH (:Paper {title: {paper_title}})<--(c:Code) RETURN c"
-    results, meta = db.cypher_query(query, dict(paper_title=paper.title))
-    if len(results) > 0:
-        codes = [Code.inflate(row[0]) for row in results]
-    else:
-        codes = []
-    # pdb.set_trace()
-    # authors = ['{}. {}'.format(author.first_name[0], author.last_name) for author in authors]
-
-    return codes
-
-
-def get_paper_venue(paper):
-    query = "MATCH (:Paper {title: {paper_title}})--(v:Venue) RETURN v"
-    results, meta = db.cypher_query(query, dict(paper_title=paper.title))
-    if len(results) == 1:  # there should only be one venue associated with a paper
-        venue = [Venue.inflate(row[0]) for row in results][0]
-    else:
-        venue = None
-    # pdb.set_trace()
-    if venue is not None:
-        return "{}, {}".format(venue.name, venue.publication_date)
-    else:
-        return ""
-
-
 def papers(request):
-    # Retrieve the papers ordered by newest addition to DB first.
-    # limit to maximum 50 papers until we get pagination to work.
-    # However, even with pagination, we are going to want to limit
-    # the number of papers retrieved for speed, especially when the
-    # the DB grows large.
-    all_papers = Paper.nodes.order_by("-created")[:50]
-    # Retrieve all comments about this paper.
-    all_authors = [", ".join(get_paper_authors(paper)) for paper in all_papers]
-    all_venues = [get_paper_venue(paper) for paper in all_papers]
-
-    papers = list(zip(all_papers, all_authors, all_venues))
-
     message = None
     if request.method == "POST":
         form = SearchPapersForm(request.POST)
         print("Received POST request")
         if form.is_valid():
-            english_stopwords = stopwords.words("english")
-            paper_title = form.cleaned_data["paper_title"].lower()
-            paper_title_tokens = [
-                w for w in paper_title.split(" ") if not w in english_stopwords
-            ]
-            paper_query = (
-                    "(?i).*" + "+.*".join("(" + w + ")" for w in paper_title_tokens) + "+.*"
-            )
-            query = (
-                "MATCH (p:Paper) WHERE  p.title =~ { paper_query } RETURN p LIMIT 25"
-            )
-            print("Cypher query string {}".format(query))
-            results, meta = db.cypher_query(query, dict(paper_query=paper_query))
-            if len(results) > 0:
-                print("Found {} matching papers".format(len(results)))
-                papers = [Paper.inflate(row[0]) for row in results]
-                return render(request, "paper_results.html", {"papers": papers, "form": form, "message": ""})
+            paper_title = form.cleaned_data["paper_title"]
+            papers_found, has_next = search_papers(paper_title)
+            if len(papers_found) > 0:
+                print("Found {} matching papers".format(len(papers_found)))
+                return render(
+                    request,
+                    "paper_results.html",
+                    {
+                        "papers": papers_found,
+                        "form": form,
+                        "message": "",
+                        "query": paper_title,
+                        "page": 1,
+                        "has_next": has_next,
+                    },
+                )
             else:
                 message = "No results found. Please try again!"
 
@@ -122,13 +88,27 @@ def papers(request):
         print("Received GET request")
         form = SearchPapersForm()
 
+    # Retrieve one page of papers ordered by newest addition to DB first, only when it is
+    # shown and not for a search that finds something.
+    # The page starts after the cursor in ?after= so that the DB seeks to it instead
+    # of skipping over all previous pages.
+    # The authors and venue of each paper are retrieved in the same query.
+    papers, next_cursor = get_papers_page_with_authors_and_venue(request.GET.get("after"))
+    if request.is_ajax() and request.method == "GET":
+        # load more/infinite scroll only needs the next page of the list
+        return render(
+            request, "papers_page.html", {"papers": papers, "next_cursor": next_cursor}
+        )
+    all_papers = [paper for paper, authors, venue in papers]
+
     return render(
         request,
         "papers.html",
         {
             "papers": papers,
             "papers_only": all_papers,
-            "num_papers": len(Paper.nodes.all()),
+            "next_cursor": next_cursor,
+            "num_papers": count_nodes(Paper),
             "form": form,
             "message": message,
         },
@@ -188,6 +168,7 @@ def paper_delete(request, id):
     # Cypher query to delete the paper node
     query = "MATCH (p:Paper) WHERE ID(p)={id} DETACH DELETE p"
     results, meta = db.cypher_query(query, dict(id=id))
+    invalidate_count(Paper)
 
     return HttpResponseRedirect(reverse("papers_index"))
 
@@ -204,54 +185,34 @@ def _get_paper_by_id(id):
 
 
 def paper_detail(request, id):
-    # Retrieve the paper from the database
-    query = "MATCH (a) WHERE ID(a)={id} RETURN a"
-    results, meta = db.cypher_query(query, dict(id=id))
-    if len(results) > 0:
-        all_papers = [Paper.inflate(row[0]) for row in results]
-        paper = all_papers[0]
-    else:  # go back to the paper index page
-        return render(
-            request,
-            "papers.html",
-            {"papers": Paper.nodes.all(), "num_papers": len(Paper.nodes.all())},
-        )
+    # Retrieve the paper and all of its neighbours from the database with a single query.
+    # Authors, comments, codes, venue and the ego network are all derived from the result.
+    paper, neighbours = get_paper_with_neighbours(id)
+    if paper is None:  # go back to the paper index page
+        return detail_not_found(request, "Paper", "papers_index")
 
-    # Retrieve the paper's authors
-    authors = get_paper_authors(paper)
-    # authors is a list of strings so just concatenate the strings.
-    authors = ", ".join(authors)
+    # Retrieve the paper's authors as a string of comma separated names.
+    authors = format_authors(select_neighbours(neighbours, "Person", outgoing=False))
 
     # Retrieve all comments about this paper.
-    query = "MATCH (:Paper {title: {paper_title}})<--(c:Comment) RETURN c"
-
-    results, meta = db.cypher_query(query, dict(paper_title=paper.title))
-    if len(results) > 0:
-        comments = [Comment.inflate(row[0]) for row in results]
-        num_comments = len(comments)
-    else:
-        comments = []
-        num_comments = 0
+    comments = [Comment.inflate(node) for node in select_neighbours(neighbours, "Comment", outgoing=False)]
+    num_comments = len(comments)
 
     # Retrieve the code repos that implement the algorithm(s) in this paper
-    codes = _get_paper_codes(paper)
+    codes = [Code.inflate(node) for node in select_neighbours(neighbours, "Code", outgoing=False)]
 
     # Retrieve venue where paper was published.
-    query = "MATCH (:Paper {title: {paper_title}})-->(v:Venue) RETURN v"
-    results, meta = db.cypher_query(query, dict(paper_title=paper.title))
-    if len(results) > 0:
-        venues = [Venue.inflate(row[0]) for row in results]
+    venues = [Venue.inflate(node) for node in select_neighbours(neighbours, "Venue", outgoing=True)]
+    if len(venues) > 0:
         venue = venues[0]
     else:
         venue = None
 
     request.session["last-viewed-paper"] = id
 
-    ego_network_json = _get_node_ego_network(paper.id, paper.title)
-
+    # The ego network is retrieved by the page from paper_ego_network
     main_paper_id = paper.id
 
-    print("ego_network_json: {}".format(ego_network_json))
     return render(
         request,
         "paper_detail.html",
@@ -262,198 +223,65 @@ def paper_detail(request, id):
             "comments": comments,
             "codes": codes,
             "num_comments": num_comments,
-            "ego_network": ego_network_json,
             "main_paper_id": main_paper_id,
         },
     )
 
 
-def _get_node_ego_network(id, paper_title):
+@cache_page(60 * 5)
+def paper_ego_network(request, id):
     """
-    Returns a json formatted string of the nodes ego network
-    :param id:
-    :return:
+    Returns the ego network of a paper as a JSON list of Cytoscape elements. The paper
+    detail page requests it asynchronously.
     """
-    # query for everything that points to the paper
-    query_all_in = "MATCH (s:Paper {title: {paper_title}}) <-[relationship_type]- (p) RETURN p, " \
-                   "Type(relationship_type) "
-
-    # query for everything the paper points to
-    query_all_out = "MATCH (s:Paper {title: {paper_title}}) -[relationship_type]-> (p) RETURN p, " \
-                    "Type(relationship_type) "
-
-    results_all_in, meta = db.cypher_query(query_all_in, dict(paper_title=paper_title))
-
-    results_all_out, meta = db.cypher_query(query_all_out, dict(paper_title=paper_title))
-
-    print("Results out are: ", results_all_out)
-
-    print("Results in are: ", results_all_in)
-
-    ego_json = "{{data : {{id: '{}', title: '{}', href: '{}', type: '{}', label: '{}'}} }}".format(
-        id, paper_title, reverse("paper_detail", kwargs={"id": id}), 'Paper', 'origin'
-    )
-    target_papers = []
-    target_people = []
-    target_venues = []
-    target_datasets = []
-    target_codes = []
-
-    # Assort nodes and store them in arrays accordingly
-    # 'out' refers to being from the paper to the object
-    if len(results_all_out) > 0:
-        for row in results_all_out:
-            new_rela = row[1].replace("_", " ")
-            for label in row[0].labels:
-                if label == 'Paper':
-                    target_papers.append([Paper.inflate(row[0]), new_rela, 'out'])
-                if label == 'Person':
-                    target_people.append([Person.inflate(row[0]), new_rela, 'out'])
-                if label == 'Venue':
-                    target_venues.append([Venue.inflate(row[0]), new_rela, 'out'])
-                if label == 'Dataset':
-                    target_datasets.append([Dataset.inflate(row[0]), new_rela, 'out'])
-                if label == 'Code':
-                    target_codes.append([Code.inflate(row[0]), new_rela, 'out'])
-
-    if len(results_all_in) > 0:
-        for row in results_all_in:
-            new_rela = row[1].replace("_", " ")
-            for label in row[0].labels:
-                if label == 'Paper':
-                    target_papers.append([Paper.inflate(row[0]), new_rela, 'in'])
-                if label == 'Person':
-                    target_people.append([Person.inflate(row[0]), new_rela, 'in'])
-                if label == 'Venue':
-                    target_venues.append([Venue.inflate(row[0]), new_rela, 'in'])
-                if label == 'Dataset':
-                    target_datasets.append([Dataset.inflate(row[0]), new_rela, 'in'])
-                if label == 'Code':
-                    target_codes.append([Code.inflate(row[0]), new_rela, 'in'])
-
-    print("length of connected papers: ", len(target_papers))
-    print("length of connected people: ", len(target_people))
-    print("length of connected venues: ", len(target_venues))
-    print("length of connected datasets: ", len(target_datasets))
-    print("length of connected codes: ", len(target_codes))
-
-    for tp in target_papers:
-        ego_json += ", {{data : {{id: '{}', title: '{}', href: '{}', type: '{}', label: '{}' }} }}".format(
-            tp[0].id, tp[0].title, reverse("paper_detail", kwargs={"id": tp[0].id}), 'Paper', tp[1]
-        )
-
-        # '-' distinguishes id e.g. 1-11 to 111 in relationships
-        if tp[2] == 'out':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }}}}".format(
-                id, '-', tp[0].id, tp[1], id, tp[0].id
-            )
-        if tp[2] == 'in':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }} }}".format(
-                tp[0].id, "-", id, tp[1], tp[0].id, id
-            )
-
-    for tpc in target_codes:
-        ego_json += ", {{data : {{id: '{}', title: '{}', href: '{}', type: '{}', label: '{}' }} }}".format(
-            tpc[0].id, 'Code', reverse("code_detail", kwargs={"id": tpc[0].id}), 'Code', tpc[1]
-        )
-
-        if tpc[2] == 'out':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }}}}".format(
-                id, '-', tpc[0].id, tpc[1], id, tpc[0].id
-            )
-        if tpc[2] == 'in':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }} }}".format(
-                tpc[0].id, "-", id, tpc[1], tpc[0].id, id
-            )
-
-    for tpv in target_venues:
-        ego_json += ", {{data : {{id: '{}', title: '{}', href: '{}', type: '{}', label: '{}' }} }}".format(
-            tpv[0].id, tpv[0].name, reverse("venue_detail", kwargs={"id": tpv[0].id}), 'Venue', tpv[1]
-        )
-
-        if tpv[2] == 'out':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }}}}".format(
-                id, '-', tpv[0].id, tpv[1], id, tpv[0].id
-            )
-        if tpv[2] == 'in':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }} }}".format(
-                tpv[0].id, "-", id, tpv[1], tpv[0].id, id
-            )
-
-    for tpd in target_datasets:
-        ego_json += ", {{data : {{id: '{}', title: '{}', href: '{}', type: '{}', label: '{}' }} }}".format(
-            tpd[0].id, tpd[0].name, reverse("dataset_detail", kwargs={"id": tpd[0].id}), 'Dataset', tpd[1]
-        )
-
-        if tpd[2] == 'out':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }}}}".format(
-                id, '-', tpd[0].id, tpd[1], id, tpd[0].id
-            )
-        if tpd[2] == 'in':
-            ego_json += ",{{data: {{ id: '{}{}{}', label: '{}', source: '{}', target: '{}' }} }}".format(
-                tpd[0].id, "-", id, tpd[1], tpd[0].id, id
-            )
-
-    for tpe in target_people:
-        middleName = ''
-        # reformat middle name from string "['mn1', 'mn2', ...]" to array ['mn1', 'mn2', ...]
-        if tpe[0].middle_name != None:
-            middleNames = tpe[0].middle_name[1:-1].split(', ')
-            # concatenate middle names to get 'mn1 mn2 ...'
-            for i in range(len(middleNames)):
-                middleName = middleName + " " + middleNames[i][1:-1]
-
-        ego_json += ", {{data : {{id: '{}', first_name: '{}', middle_name: '{}', last_name: '{}', href: '{}', " \
-                    "type: '{}', " \
-                    "label: '{}'}} }}".format(
-            tpe[0].id, tpe[0].first_name, middleName, tpe[0].last_name,
-            reverse("person_detail", kwargs={"id": tpe[0].id}), 'Person', tpe[1]
-        )
+    paper, neighbours = get_paper_with_neighbours(id)
+    if paper is None:
+        raise Http404
 
-        if tpe[2] == 'in':
-            ego_json += ", {{data : {{id: '{}{}{}', label: '{}', source: '{}', target: '{}' }} }}".format(
-                tpe[0].id, "-", id, tpe[1], tpe[0].id, id
-            )
+    elements = ego_network_elements(paper.id, "Paper", {"title": paper.title}, neighbours)
 
-        if tpe[2] == 'out':
-            ego_json += ", {{data : {{id: '{}{}{}', label: '{}', source: '{}', target: '{}' }} }}".format(
-                id, "-", tpe[0].id, tpe[1], id, tpe[0].id
-            )
-
-    return "[" + ego_json + "]"
+    return JsonResponse(elements, safe=False)
 
 
 def paper_find(request):
     message = None
+    query_string = None
+    page = 1
     if request.method == "POST":
         form = SearchPapersForm(request.POST)
         print("Received POST request")
         if form.is_valid():
-            english_stopwords = stopwords.words("english")
-            paper_title = form.cleaned_data["paper_title"].lower()
-            paper_title_tokens = [
-                w for w in paper_title.split(" ") if not w in english_stopwords
-            ]
-            paper_query = (
-                    "(?i).*" + "+.*".join("(" + w + ")" for w in paper_title_tokens) + "+.*"
-            )
-            query = (
-                "MATCH (p:Paper) WHERE  p.title =~ { paper_query } RETURN p LIMIT 25"
-            )
-            print("Cypher query string {}".format(query))
-            results, meta = db.cypher_query(query, dict(paper_query=paper_query))
-            if len(results) > 0:
-                print("Found {} matching papers".format(len(results)))
-                papers = [Paper.inflate(row[0]) for row in results]
-                return render(request, "papers_index.html", {"papers": papers, "form": form, "message": message})
-            else:
-                message = "No results found. Please try again!"
-
+            query_string = form.cleaned_data["paper_title"]
     elif request.method == "GET":
         print("Received GET request")
-        form = SearchPapersForm()
+        # Links to the next and previous pages of search results are GET requests
+        query_string = request.GET.get("q", None)
+        try:
+            page = int(request.GET.get("page", 1))
+        except ValueError:
+            page = 1
+        form = SearchPapersForm(initial={"paper_title": query_string})
+
+    if query_string:
+        papers_found, has_next = search_papers(query_string, page=page)
+        if len(papers_found) > 0:
+            print("Found {} matching papers".format(len(papers_found)))
+            return render(
+                request,
+                "paper_results.html",
+                {
+                    "papers": papers_found,
+                    "form": form,
+                    "message": message,
+                    "query": query_string,
+                    "page": page,
+                    "has_next": has_next,
+                },
+            )
+        else:
+            message = "No results found. Please try again!"
 
-    return render(request, "papers_index.html", {"form": form, "message": message})
+    return render(request, "paper_find.html", {"form": form, "message": message})
 
 
 @login_required
@@ -665,10 +493,9 @@ def paper_add_to_group(request, id):
 
 @login_required
 def paper_connect_author_selected(request, id, aid):
-    query = "MATCH (p:Paper), (a:Person) WHERE ID(p)={id} AND ID(a)={aid} MERGE (a)-[r:authors]->(p) RETURN r"
-    results, meta = db.cypher_query(query, dict(id=id, aid=aid))
+    linked = link_nodes([(aid, "authors", id)])
 
-    if len(results) > 0:
+    if len(linked) > 0:
         messages.add_message(request, messages.INFO, "Linked with author.")
     else:
         messages.add_message(request, messages.INFO, "Link to author failed!")
@@ -676,6 +503,36 @@ def paper_connect_author_selected(request, id, aid):
     return HttpResponseRedirect(reverse("paper_detail", kwargs={"id": id}))
 
 
+@login_required
+def paper_connect_selected(request, id):
+    """
+    View function for linking a paper with all the nodes selected in the search results of
+    a connect page, e.g., 30 cited papers, in one request.
+    :param request: A POST request with the type of the links, link_type, and the IDs of the
+    selected nodes, ids.
+    :param id: The ID of the paper.
+    :return:
+    """
+    if request.method != "POST":
+        return HttpResponseRedirect(reverse("paper_detail", kwargs={"id": id}))
+
+    link_type = request.POST.get("link_type")
+    try:
+        node_ids = [int(node_id) for node_id in request.POST.getlist("ids")]
+        linked = link_nodes(paper_triples(id, link_type, node_ids))
+    except ValueError:
+        messages.add_message(request, messages.INFO, "Invalid selection!")
+        return HttpResponseRedirect(reverse("paper_detail", kwargs={"id": id}))
+
+    num_added = list(linked.values()).count(True)
+    message = "Added {} links, {} already existed.".format(num_added, len(linked) - num_added)
+    if len(linked) < len(set(node_ids)):
+        message += " {} could not be found!".format(len(set(node_ids)) - len(linked))
+    messages.add_message(request, messages.INFO, message)
+
+    return HttpResponseRedirect(reverse("paper_detail", kwargs={"id": id}))
+
+
 @login_required
 def paper_connect_author(request, id):
     if request.method == "POST":
@@ -714,7 +571,7 @@ def paper_connect_author(request, id):
                     return render(
                         request,
                         "paper_connect_author.html",
-                        {"form": form, "people": authors, "message": ""},
+                        {"form": form, "people": authors, "paper_id": id, "message": ""},
                     )
             else:
                 message = "No matching people found"
@@ -732,54 +589,23 @@ def paper_connect_author(request, id):
 
 @login_required
 def paper_connect_paper_selected(request, id, pid):
-
-    query = "MATCH (a) WHERE ID(a)={id} RETURN a"
-    results, meta = db.cypher_query(query, dict(id=id))
-    if len(results) > 0:
-        all_papers = [Paper.inflate(row[0]) for row in results]
-        paper_source = all_papers[
-            0
-        ]  # since we search by id only one paper should have been returned.
-        print("Found source paper: {}".format(paper_source.title))
-        query = "MATCH (a) WHERE ID(a)={id} RETURN a"
-        results, meta = db.cypher_query(query, dict(id=pid))
-        if len(results) > 0:
-            all_papers = [Paper.inflate(row[0]) for row in results]
-            paper_target = all_papers[
-                0
-            ]  # since we search by id only one paper should have been returned.
-            print("Found target paper: {}".format(paper_target.title))
-
-            # check if the papers are already connected with a cites link; if yes, then
-            # do nothing. Otherwise, add the link.
-            query = "MATCH (q:Paper)<-[r]-(p:Paper) where id(p)={source_id} and id(q)={target_id} return p"
-            results, meta = db.cypher_query(
-                query,
-                dict(source_id=id, target_id=pid),
-            )
-            if len(results) == 0:
-                link_type = request.session["link_type"]
-                # papers are not linked so add the edge
-                print("Connection link not found, adding it!")
-                if link_type == 'cites':
-                    paper_source.cites.connect(paper_target)
-                elif link_type == 'uses':
-                    paper_source.uses.connect(paper_target)
-                elif link_type == 'extends':
-                    paper_source.extends.connect(paper_target)
-                messages.add_message(request, messages.INFO, "Connection Added!")
-            else:
-                print("Connection link found not adding it!")
-                messages.add_message(
-                    request, messages.INFO, "Papers are already linked!"
-                )
+    # the link type comes from the search form or, for a suggestion picked
+    # while typing, from the URL
+    link_type = request.GET.get("link_type", request.session.get("link_type", "cites"))
+    if link_type not in ("cites", "uses", "extends"):
+        link_type = "cites"
+
+    linked = link_nodes([(id, link_type, pid)])
+    if len(linked) == 0:
+        messages.add_message(request, messages.INFO, "Could not find paper!")
+    elif linked[(id, link_type, pid)]:
+        messages.add_message(request, messages.INFO, "Connection Added!")
     else:
-        print("Could not find paper!")
-        messages.add_message(
-            request, messages.INFO, "Could not find paper!"
-        )
+        messages.add_message(request, messages.INFO, "Papers are already linked!")
+
     return redirect("paper_detail", id=id)
 
+
 @login_required
 def paper_connect_paper(request, id):
     """
@@ -822,7 +648,7 @@ def paper_connect_paper(request, id):
                     return render(
                         request,
                         "paper_connect_paper.html",
-                        {"form": form, "papers": papers, "message": ""},
+                        {"form": form, "papers": papers, "paper_id": id, "link_type": paper_connected, "message": ""},
                     )
              # if len(papers_found) > 1:
                 #     return render(
@@ -919,40 +745,25 @@ def paper_connect_dataset(request, id):
                         {
                             "form": form,
                             "datasets": datasets_found,
-                            "message": "Found more than one matching datasets. Please narrow your search",
+                            "paper_id": id,
+                            "message": "Found more than one matching datasets. Select the ones to link or narrow your search",
                         },
                     )
                 else:
                     dataset_target = datasets_found[0]  # one person found
                     print("Selected dataset: {}".format(dataset_target.name))
 
-                # retrieve the paper
-                query = "MATCH (a) WHERE ID(a)={id} RETURN a"
-                results, meta = db.cypher_query(query, dict(id=id))
-                if len(results) > 0:
-                    all_papers = [Paper.inflate(row[0]) for row in results]
-                    paper_source = all_papers[
-                        0
-                    ]  # since we search by id only one paper should have been returned.
-                    print("Found paper: {}".format(paper_source.title))
-                    # check if the papers are already connected with a cites link; if yes, then
-                    # do nothing. Otherwise, add the link.
-                    query = "MATCH (d:Dataset)<-[r:evaluates_on]-(p:Paper) where id(p)={id} and id(d)={dataset_id} return p"
-                    results, meta = db.cypher_query(
-                        query, dict(id=id, dataset_id=dataset_target.id)
+                linked = link_nodes([(id, "evaluates_on", dataset_target.id)])
+                if len(linked) == 0:
+                    messages.add_message(request, messages.INFO, "Could not find paper!")
+                elif linked[(id, "evaluates_on", dataset_target.id)]:
+                    messages.add_message(
+                        request, messages.INFO, "Link to dataset added!"
                     )
-                    if len(results) == 0:
-                        # dataset is not linked with paper so add the edge
-                        paper_source.evaluates_on.connect(dataset_target)
-                        messages.add_message(
-                            request, messages.INFO, "Link to dataset added!"
-                        )
-                    else:
-                        messages.add_message(
-                            request, messages.INFO, "Link to dataset already exists!"
-                        )
                 else:
-                    print("Could not find paper!")
+                    messages.add_message(
+                        request, messages.INFO, "Link to dataset already exists!"
+                    )
                 return redirect("paper_detail", id=id)
 
             else:
@@ -971,10 +782,9 @@ def paper_connect_dataset(request, id):
 
 @login_required
 def paper_connect_code_selected(request, id, cid):
-    query = "MATCH (p:Paper), (c:Code) WHERE ID(p)={id} AND ID(c)={cid} MERGE (c)-[r:implements]->(p) RETURN r"
-    results, meta = db.cypher_query(query, dict(id=id, cid=cid))
+    linked = link_nodes([(cid, "implements", id)])
 
-    if len(results) > 0:
+    if len(linked) > 0:
         messages.add_message(request, messages.INFO, "Linked with code repo.")
     else:
         messages.add_message(request, messages.INFO, "Link to code repo failed!")
@@ -1023,7 +833,7 @@ def paper_connect_code(request, id):
                     return render(
                         request,
                         "paper_connect_code.html",
-                        {"form": form, "codes": codes, "message": ""},
+                        {"form": form, "codes": codes, "paper_id": id, "message": ""},
                     )
             else:
                 message = "No matching codes found"
@@ -1091,64 +901,34 @@ def _find_paper(query_string):
     :param query_string: The query string, e.g., title of paper to search for
     :return: <list> List of papers that match the query or empty list if none match.
     """
-    papers_found = []
-
-    english_stopwords = stopwords.words("english")
-    paper_title = query_string.lower()
-    paper_title_tokens = [
-        w for w in paper_title.split(" ") if not w in english_stopwords
-    ]
-    paper_query = (
-            "(?i).*" + "+.*".join("(" + w + ")" for w in paper_title_tokens) + "+.*"
-    )
-    query = "MATCH (p:Paper) WHERE  p.title =~ { paper_query } RETURN p LIMIT 25"
-    print("Cypher query string {}".format(query))
-    results, meta = db.cypher_query(query, dict(paper_query=paper_query))
-
-    if len(results) > 0:
-        papers_found = [Paper.inflate(row[0]) for row in results]
+    papers_found, has_next = search_papers(query_string, field="title")
 
     return papers_found
 
 
-def _add_author(author, paper=None):
+def _add_author(author, paper=None, co_authors=()):
     """
     Adds author to the DB if author does not already exist and links to paper
     as author if paper is not None
     :param author:
     :param paper:
+    :param co_authors: The names of the other authors of the paper, used to tell apart
+    people with the same name.
     """
-    link_with_paper = False
-    p = None
-    people_found = _person_find(author, exact_match=True)
-    author_name = author.strip().split(" ")
-    if people_found is None:  # not in DB
+    p, ambiguous = resolve_author(author, co_authors)
+    if ambiguous:
+        print("Person with similar but not exactly the same name is already in DB.")
+        return
+    if p is None:  # not in DB
         print("Author {} not in DB".format(author))
+        first_name, middle_name, last_name = split_name(author)
         p = Person()
-        p.first_name = author_name[0]
-        if len(author_name) > 2:  # has middle name(s)
-            p.middle_name = author_name[1:-1]
-        else:
-            p.middle_name = None
-        p.last_name = author_name[-1]
-        #print("**** Person {} ***".format(p))
+        p.first_name = first_name
+        p.middle_name = middle_name
+        p.last_name = last_name
         p.save()  # save to DB
-        link_with_paper = True
-    elif len(people_found) == 1:
-        # Exactly one person found. Check if name is an exact match.
-        p = people_found[0]
-        # NOTE: The problem with this simple check is that if two people have
-        # the same name then the wrong person will be linked to the paper.
-        if p.first_name == author_name[0] and p.last_name == author_name[-1]:
-            if len(author_name) > 2:
-                if p.middle_name == author_name[1:-1]:
-                    link_with_paper = True
-            else:
-                link_with_paper = True
-    else:
-        print("Person with similar but not exactly the same name is already in DB.")
 
-    if link_with_paper and paper is not None:
+    if paper is not None:
         print("Adding authors link to paper {}".format(paper.title[:50]))
         # link author with paper
         p.authors.connect(paper)
@@ -1179,10 +959,13 @@ def paper_create(request):
                 # Now, add the authors and link each author to the paper with an "authors"
                 # type edge.
                 if request.session.get("from_external", False):
-                    paper_authors = request.session["external_authors"]
-                    for paper_author in reversed(paper_authors.split(",")):
+                    # a trailing or doubled comma gives blank names, which are skipped
+                    paper_authors = [
+                        author for author in request.session["external_authors"].split(",") if author.strip()
+                    ]
+                    for paper_author in reversed(paper_authors):
                         print("Adding author {}".format(paper_author))
-                        _add_author(paper_author, paper)
+                        _add_author(paper_author, paper, co_authors=paper_authors)
 
                 request.session["from_external"] = False  # reset
                 # go back to paper index page.
@@ -1208,374 +991,6 @@ def paper_create(request):
     return render(request, "paper_form.html", {"form": form, "message": message})
 
 
-# the two functions below are used to abstract author names from IEEE
-# to abstract the author name from a format of "name":"author_name"
-def find_author_from_IEEE_author_info(text):
-    i = text.find('''"name":''')
-    start = i + 8
-    i = i + 8
-    while text[i] != '''"''':
-        i = i + 1
-    author = text[start:i]
-    return author
-
-
-# to find the author names as a list
-def find_author_list_from_IEEE(bs4obj):
-    text = bs4obj.get_text()
-    # to find the string which stores information of authors, which is stored in a
-    # format of "authors":[{author 1 info},{author 2 info}]
-    i = text.find('''"authors":[''')
-    if i == -1:
-        return []
-    while text[i] != '[':
-        i = i + 1
-    i = i + 1
-    array_count = 1
-    bracket_count = 0
-    bracket_start = 0
-    author_list = []
-    while array_count != 0:
-        if text[i] == '{':
-            if bracket_count == 0:
-                bracket_start = i
-            bracket_count = bracket_count + 1
-        if text[i] == '}':
-            bracket_count = bracket_count - 1
-            if bracket_count == 0:
-                author_list.append(find_author_from_IEEE_author_info(text[bracket_start:i]))
-        if text[i] == ']':
-            array_count = array_count - 1
-        if text[i] == '[':
-            array_count = array_count + 1
-        i = i + 1
-    return author_list
-
-
-def get_authors(bs4obj, source_website):
-    """
-    Extract authors from the source website
-    :param bs4obj, source_website；
-    :return: None or a string with comma separated author names from first to last name
-    """
-    if source_website == "arxiv":
-        authorList = bs4obj.findAll("div", {"class": "authors"})
-        if authorList:
-            if len(authorList) > 1:
-                # there should be just one but let's just take the first one
-                authorList = authorList[0]
-            # for author in authorList:
-            #     print("type of author {}".format(type(author)))
-            author_str = authorList[0].get_text()
-            if author_str.startswith("Authors:"):
-                author_str = author_str[8:]
-            return author_str
-    elif source_website == 'nips':
-        # authors are found to be list objects , so needs to join them to get the author string
-        authorList = bs4obj.findAll("li", {"class": "author"})
-        if authorList:
-            authorList = [author.text for author in authorList]
-            author_str = ','.join(authorList)
-            return author_str
-    elif source_website == "jmlr":
-        # in JMLR authors are found in the html tag "i"
-        authorList = bs4obj.findAll("i")
-        if authorList:
-            if len(authorList) >= 1:
-                author_str = authorList[0].text
-                return author_str
-    elif source_website == "ieee":
-        authorList = find_author_list_from_IEEE(bs4obj)
-        if authorList:
-            authorList = [author for author in authorList]
-            author_str = ','.join(authorList)
-            return author_str
-    elif source_website == "acm":
-        author_str = bs4obj.find("meta", {"name": "citation_authors"})
-        author_str = str(author_str)
-        # print("get_authors() downloaded author_str: {}".format(author_str))
-        start = author_str.find('"')
-        end = author_str.find('"', start + 1)
-        author_str = author_str[start + 1:end]
-
-        author_str_rev = ""
-        for n in author_str.split(";"):
-            if len(author_str_rev) == 0:
-                author_str_rev = ", ".join(n.split(",")[::-1])
-            else:
-                author_str_rev = author_str_rev + "; " + ",".join(n.split(", ")[::-1])
-        #print("get_authors() author_str_rev: {}".format(author_str_rev))
-        author_str = author_str_rev.replace(",", "")
-        author_str = author_str.replace("; ", ",")
-        #print("get_authors() cleaned author_str: {}".format(author_str))
-        # names are last, first so reverse to first, last
-        return author_str
-    # if source website is not supported or the autherlist is none , return none
-    return None
-
-
-def get_title(bs4obj, source_website):
-    """
-    Extract paper title from the source web.
-    :param bs4obj:
-    :return:
-    """
-    if source_website == "arxiv":
-        titleList = bs4obj.findAll("h1", {"class": "title"})
-    elif source_website == 'nips':
-        titleList = bs4obj.findAll("title")
-    elif source_website == "jmlr":
-        titleList = bs4obj.findAll("h2")
-    elif source_website == "ieee":
-        title = bs4obj.find("title").get_text()
-        i = title.find("- IEEE")
-        if i != -1:
-            title = title[0:i]
-        return title
-    elif source_website == "acm":
-        titleList = bs4obj.find("meta", {"name": "citation_title"})
-        title = str(titleList)
-        start = title.find('"')
-        end = title.find('"', start + 1)
-        title = title[start + 1:end]
-        if title == "Non":
-            return None
-        return title
-    else:
-        titleList = []
-    # check the validity of the abstracted titlelist
-    if titleList:
-        if len(titleList) == 0:
-            return None
-        else:
-            if len(titleList) > 1:
-                print("WARNING: Found more than one title. Returning the first one.")
-            # return " ".join(titleList[0].get_text().split()[1:])
-            title_text = titleList[0].get_text()
-            if title_text.startswith("Title:"):
-                return title_text[6:]
-            else:
-                return title_text
-    return None
-
-
-# this function is used to find the abstract for a paper from IEEE
-def get_abstract_from_IEEE(bs4obj):
-    """
-        Extract paper abstract from the source website.
-        :param bs4obj:
-        :return: abstract
-    """
-    text = bs4obj.get_text()
-    i = text.find('''"abstract":"''')
-    start = None
-    count = 0
-    abstract = None
-    if text[i + 12:i + 16] == "true":
-        i = text.find('''"abstract":"''', i + 16)
-        start = i + 12
-        i = start
-        count = 1
-    while count != 0:
-        if text[i] == '''"''':
-            if text[i + 1] == "," and text[i + 2] == '''"''':
-                count = 0
-        i += 1
-        abstract = text[start:i]
-    return abstract
-
-
-# this function is used to find the abstract for a paper from IEEE
-def get_abstract_from_ACM(bs4obj):
-    """
-        Extract paper abstract from the source website.
-        :param bs4obj:
-        :return: abstract
-    """
-    abstract = bs4obj.find("div", {"style": "display:inline"})
-    if abstract:
-        abstract = abstract.get_text()
-    else:
-        abstract = bs4obj.find("meta", {"name": "citation_abstract_html_url"})
-        abstract_url = str(abstract)
-        start = abstract_url.find('"')
-        end = abstract_url.find('"', start + 1)
-        abstract_url = abstract_url[start + 1:end]
-        if abstract_url == "Non":
-            return None
-        abstract_url += "&preflayout=flat"
-        headers = {"User-Agent": "Mozilla/5.0 (X11; U; Linux i686) Gecko/20071127 Firefox/2.0.0.11"}
-        req = Request(abstract_url, headers=headers)
-        html = urlopen(req)
-        bs4obj1 = BeautifulSoup(html,features="html.parser")
-        abstract = bs4obj1.findAll("div", {"style": "display:inline"})
-        abstract = abstract[0]
-        if abstract:
-            abstract = abstract.get_text()
-    return abstract
-
-
-def get_abstract(bs4obj, source_website):
-    """
-    Extract paper abstract from the source website.
-    :param bs4obj, source_website:
-    :return:
-    """
-    if source_website == "arxiv":
-        abstract = bs4obj.find("blockquote", {"class": "abstract"})
-        if abstract is not None:
-            abstract = " ".join(abstract.get_text().split(" ")[1:])
-    elif source_website == 'nips':
-        abstract = bs4obj.find("p", {"class": "abstract"})
-        if abstract is not None:
-            abstract = abstract.get_text()
-    elif source_website == "jmlr":
-        abstract = bs4obj.find("p", {"class": "abstract"})
-        if abstract is not None:
-            abstract = abstract.get_text()
-        else:
-            # for some papers from JMLR , the abstract is stored without a tag,so this will find the abstract
-            abstract = bs4obj.find("h3")
-            if abstract is not None:
-                abstract = abstract.next_sibling
-    elif source_website == "ieee":
-        abstract = get_abstract_from_IEEE(bs4obj)
-    elif source_website == "acm":
-        abstract = get_abstract_from_ACM(bs4obj)
-    else:
-        abstract = None
-    # want to remove all the leading and ending white space and line breakers in the abstract
-    if abstract is not None:
-        abstract = abstract.strip()
-        if source_website != "arxiv":
-            abstract = abstract.replace('\r', '').replace('\n', '')
-        else:
-            abstract = abstract.replace('\n', ' ')
-    return abstract
-
-
-def get_venue(bs4obj):
-    """
-    Extract publication venue from arXiv.org paper page.
-    :param bs4obj:
-    :return:
-    """
-    venue = bs4obj.find("td", {"class": "tablecell comments mathjax"})
-    if venue is not None:
-        venue = venue.get_text().split(";")[0]
-    return venue
-
-
-# this function is used to find the download_link for a paper from IEEE
-def get_ddl_from_IEEE(bs4obj):
-    text = bs4obj.get_text()
-    # the ddl link is stored in a format of "pdfUrl":"download_link"
-    i = text.find('''"pdfUrl":"''')
-    start = i + 10
-    i = start
-    count = 1
-    while count != 0:
-        if text[i] == '''"''':
-            count = 0
-        i += 1
-    ddl = text[start:i - 1]
-    ddl = "https://ieeexplore.ieee.org" + ddl
-    return ddl
-
-
-def get_download_link(bs4obj, source_website, url):
-    """
-    Extract download link from paper page1
-    :param bs4obj:
-    return: download link of paper
-    """
-    if url.endswith("/"):
-        url = url[:-1]
-    if source_website == "arxiv":
-        download_link = url.replace("/abs/", "/pdf/", 1) + ".pdf"
-    elif source_website == "nips":
-        download_link = url + ".pdf"
-    elif source_website == "jmlr":
-        download_link = bs4obj.find(href=re.compile("pdf"))['href']
-        print(download_link)
-        if download_link.startswith("/papers/"):
-            download_link = "http://www.jmlr.org" + download_link
-    elif source_website == "ieee":
-        download_link = get_ddl_from_IEEE(bs4obj)
-    elif source_website == "acm":
-        download_link = bs4obj.find("meta", {"name": "citation_pdf_url"})
-        download_link = str(download_link)
-        start = download_link.find('"')
-        end = download_link.find('"', start + 1)
-        download_link = download_link[start + 1:end]
-        return download_link
-    else:
-        download_link = None
-    return download_link
-
-
-def check_valid_paper_type_ieee(bs4obj):
-    text = bs4obj.get_text()
-    # the paper type is stored in a format of "xploreDocumentType":"paper_type"
-    i = text.find('''"xploreDocumentType":"''')
-    start = i + 22
-    i = start
-    count = 1
-    while count != 0:
-        if text[i] == '''"''':
-            count = 0
-        i += 1
-    paper_type = text[start:i - 1]
-    print(paper_type)
-    if paper_type == "Journals & Magazine":
-        return True
-    return False
-
-
-def get_paper_info(url, source_website):
-    """
-    Extract paper information, title, abstract, and authors, from source website
-    paper page.
-    :param url, source_website:
-    :return:
-    """
-    try:
-        # html = urlopen("http://pythonscraping.com/pages/page1.html")
-        url_copy = url
-        if source_website == "acm":
-            headers = {"User-Agent": "Mozilla/5.0 (X11; U; Linux i686) Gecko/20071127 Firefox/2.0.0.11"}
-            url = Request(url, headers=headers)
-        html = urlopen(url)
-    except HTTPError as e:
-        print(e)
-    except URLError as e:
-        print(e)
-        print("The server could not be found.")
-    else:
-        bs4obj = BeautifulSoup(html,features="html.parser")
-        if source_website == "ieee":
-            if check_valid_paper_type_ieee(bs4obj) == False:
-                return None, None, None, None
-        if source_website == "acm":
-            url = ""
-            if bs4obj.find("a", {"title": "Buy this Book"}) or bs4obj.find("a", {"ACM Magazines"}) \
-                    or bs4obj.find_all("meta", {"name": "citation_conference_title"}):
-                return None, None, None, None
-        # Now, we can access individual element in the page
-        authors = get_authors(bs4obj, source_website)
-        title = get_title(bs4obj, source_website)
-        abstract = get_abstract(bs4obj, source_website)
-        download_link = ""
-        if authors and title and abstract:
-            download_link = get_download_link(bs4obj, source_website, url)
-        if download_link == "Non":
-            download_link = url_copy
-        # venue = get_venue(bs4obj)
-        return title, authors, abstract, download_link
-
-    return None, None, None, None
-
-
 @login_required
 def paper_create_from_url(request):
     user = request.user
@@ -1586,65 +1001,21 @@ def paper_create_from_url(request):
         print("{}".format(request.POST["url"]))
         # get the data from arxiv
         url = request.POST["url"]
-        # check if a particular url starts with http , it is important as JMLR does not support https
-        if url.startswith("http://"):
-            url = url[7:]
-        # check if url includes https, and if not add it
-        if not url.startswith("https://"):
-            url = "https://" + url
-        # check whether the url is from a supported website
-        # from arXiv.org
-        if url.startswith("https://arxiv.org"):
-            source_website = "arxiv"
-            print("source from arXiv")
-        # from NeurlIPS
-        elif url.startswith("https://papers.nips.cc/paper"):
-            source_website = "nips"
-            print("source from nips")
-        # for urls of JMLR, they do not support https , so we need to change it to http instead
-        elif url.startswith("https://www.jmlr.org/papers"):
-            url = "http://" + url[8:]
-            source_website = "jmlr"
-            print("source from jmlr")
-        # from IEEE
-        elif url.startswith("https://ieeexplore.ieee.org/document/"):
-            source_website = "ieee"
-            print("source from ieee")
-        # from ACM
-        elif url.startswith("https://dl.acm.org/"):
-            source_website = "acm"
-            print("source from acm")
+        url, source_website = get_source_website(url)
         # return error message if the website is not supported
-        else:
+        if source_website is None:
             form = PaperImportForm()
             return render(
                 request,
                 "paper_form.html",
                 {"form": form, "message": "Source website is not supported"},
             )
-        # retrieve paper info. If the information cannot be retrieved from remote
-        # server, then we will return an error message and redirect to paper_form.html.
-        title, authors, abstract, download_link = get_paper_info(url, source_website)
-        if title is None or authors is None or abstract is None:
-            form = PaperImportForm()
-            return render(
-                request,
-                "paper_form.html",
-                {"form": form, "message": "Invalid source, please try again."},
-            )
-
-        request.session["from_external"] = True
-        request.session["external_title"] = title
-        request.session["external_abstract"] = abstract
-        request.session["external_url"] = url
-        request.session["download_link"] = download_link
-        request.session[
-            "external_authors"
-        ] = authors  # comma separate list of author names, first to last name
+        # Retrieve the paper info in the background so that a slow source website
+        # does not block this worker. The browser waits on the job's status page which
+        # redirects to paper_create once the info is available.
+        job_id = import_jobs.submit(get_paper_info, url, source_website, user_id=user.id)
 
-        print("Authors: {}".format(authors))
-
-        return HttpResponseRedirect(reverse("paper_create"))
+        return HttpResponseRedirect(reverse("paper_import_status", kwargs={"job_id": job_id}))
     else:  # GET
         request.session["from_external"] = False
         form = PaperImportForm()
@@ -1652,38 +1023,101 @@ def paper_create_from_url(request):
     return render(request, "paper_form.html", {"form": form})
 
 
-def _person_find(person_name, exact_match=False):
+@login_required
+def paper_import_status(request, job_id):
     """
-    Searches the DB for a person whose name matches the given name
-    :param person_name:
+    Shows the status of a paper import job submitted by paper_create_from_url. Once the
+    paper info has been retrieved, it is stored in the session and the user is sent to
+    paper_create to verify it. AJAX requests get the status as JSON.
+    :param request:
+    :param job_id: The ID of the import job.
     :return:
     """
-    person_name = person_name.lower()
-    person_name_tokens = [w for w in person_name.split()]
-    if exact_match:
-        if len(person_name_tokens) > 2:
-            query = "MATCH (p:Person) WHERE  LOWER(p.last_name) IN { person_tokens } AND LOWER(p.first_name) IN { person_tokens } AND LOWER(p.middle_name) IN { person_tokens } RETURN p LIMIT 20"
-        else:
-            query = "MATCH (p:Person) WHERE  LOWER(p.last_name) IN { person_tokens } AND LOWER(p.first_name) IN { person_tokens } RETURN p LIMIT 20"
-    else:
-        query = "MATCH (p:Person) WHERE  LOWER(p.last_name) IN { person_tokens } OR LOWER(p.first_name) IN { person_tokens } OR LOWER(p.middle_name) IN { person_tokens } RETURN p LIMIT 20"
+    job = import_jobs.get_job(job_id)
+    if job is None or job["user_id"] != request.user.id:
+        raise Http404("Import job does not exist")
 
-    results, meta = db.cypher_query(query, dict(person_tokens=person_name_tokens))
+    if request.is_ajax():
+        return JsonResponse({"status": job["status"]})
 
-    if len(results) > 0:
-        print("Found {} matching people".format(len(results)))
-        people = [Person.inflate(row[0]) for row in results]
-        return people
+    if job["status"] in (import_jobs.PENDING, import_jobs.RUNNING):
+        return render(request, "paper_import_status.html", {"job_id": job_id})
+
+    if job["status"] == import_jobs.TIMEOUT:
+        message = "The source website did not respond in time, please try again."
+    elif job["status"] == import_jobs.FAILED or job["result"] is None:
+        message = "Invalid source, please try again."
     else:
-        return None
+        title, authors, abstract, download_link = job["result"]
+        if title is None or authors is None or abstract is None:
+            message = "Invalid source, please try again."
+        else:
+            url, source_website = job["args"]
+            request.session["from_external"] = True
+            request.session["external_title"] = title
+            request.session["external_abstract"] = abstract
+            request.session["external_url"] = url
+            request.session["download_link"] = download_link
+            request.session[
+                "external_authors"
+            ] = authors  # comma separate list of author names, first to last name
+
+            print("Authors: {}".format(authors))
+
+            return HttpResponseRedirect(reverse("paper_create"))
+
+    form = PaperImportForm()
+    return render(request, "paper_form.html", {"form": form, "message": message})
+
+
+@staff_member_required
+def paper_bulk_import(request):
+    """
+    Imports the papers in an uploaded file of paper URLs, arXiv IDs or BibTeX entries.
+    The import runs as a background job, see catalog.importers.bulk.
+    :param request:
+    :return:
+    """
+    if request.method == "POST":
+        form = PaperBulkImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            text = form.cleaned_data["papers_file"].read().decode("utf-8", errors="replace")
+            job_id = import_jobs.submit(
+                import_papers, text, request.user.id, user_id=request.user.id, timeout=BULK_IMPORT_TIMEOUT
+            )
+            return HttpResponseRedirect(reverse("paper_bulk_import_status", kwargs={"job_id": job_id}))
+    else:  # GET
+        form = PaperBulkImportForm()
+
+    return render(request, "paper_bulk_import.html", {"form": form})
+
+
+@staff_member_required
+def paper_bulk_import_status(request, job_id):
+    """
+    Shows the progress of a bulk import and, once it has finished, a summary of the result.
+    :param request:
+    :param job_id: The ID of the bulk import job.
+    :return:
+    """
+    job = import_jobs.get_job(job_id)
+    if job is None or job["user_id"] != request.user.id:
+        raise Http404("Import job does not exist")
+
+    if request.is_ajax():
+        return JsonResponse({"status": job["status"]})
+
+    return render(
+        request,
+        "paper_bulk_import_status.html",
+        {"job_id": job_id, "status": job["status"], "summary": job["result"], "error": job.get("error")},
+    )
 
 
 #
 # Dataset Views
 #
 def datasets(request):
-    all_datasets = Dataset.nodes.order_by("-publication_date")[:50]
-
     message = None
     if request.method == "POST":
         form = SearchDatasetsForm(request.POST)
@@ -1708,10 +1142,22 @@ def datasets(request):
         print("Received GET request")
         form = SearchDatasetsForm()
 
+    # the page is only loaded when it is shown, not for a search that finds something
+    all_datasets, next_cursor = get_page(Dataset, request.GET.get("after"))
+    if request.is_ajax() and request.method == "GET":
+        return render(
+            request, "datasets_page.html", {"datasets": all_datasets, "next_cursor": next_cursor}
+        )
+
     return render(
         request,
         "datasets.html",
-        {"datasets": all_datasets, "form": form, "message": message},
+        {
+            "datasets": all_datasets,
+            "next_cursor": next_cursor,
+            "form": form,
+            "message": message,
+        },
     )
 
 
@@ -1727,12 +1173,8 @@ def dataset_detail(request, id):
         # we should be checking for > 1 and failing gracefully.
         all_datasets = [Dataset.inflate(row[0]) for row in results]
         dataset = all_datasets[0]
-    else:  # go back to the paper index page
-        return render(
-            request,
-            "datasets.html",
-            {"datasets": Dataset.nodes.all(), "num_datasets": len(Dataset.nodes.all())},
-        )
+    else:  # go back to the dataset index page
+        return detail_not_found(request, "Dataset", "datasets_index")
 
     #
     # TO DO: Retrieve and list all papers that evaluate on this dataset.
@@ -1852,6 +1294,7 @@ def dataset_delete(request, id):
     # Cypher query to delete the paper node
     query = "MATCH (d:Dataset) WHERE ID(d)={id} DETACH DELETE d"
     results, meta = db.cypher_query(query, dict(id=id))
+    invalidate_count(Dataset)
 
     return HttpResponseRedirect(reverse("datasets_index"))
 
@@ -1908,8 +1351,6 @@ def dataset_update(request, id):
 # Venue Views
 #
 def venues(request):
-    all_venues = Venue.nodes.order_by("-publication_date")[:50]
-
     message = None
     if request.method == "POST":
         form = SearchVenuesForm(request.POST)
@@ -1951,36 +1392,34 @@ def venues(request):
         form = SearchVenuesForm()
         message = None
 
-    return render(request, "venues.html", {"venues": all_venues, "form": form, "message": message})
+    # the page is only loaded when it is shown, not for a search that finds something
+    all_venues, next_cursor = get_page(Venue, request.GET.get("after"))
+    if request.is_ajax() and request.method == "GET":
+        return render(
+            request, "venues_page.html", {"venues": all_venues, "next_cursor": next_cursor}
+        )
+
+    return render(
+        request,
+        "venues.html",
+        {"venues": all_venues, "next_cursor": next_cursor, "form": form, "message": message},
+    )
 
 
 def venue_detail(request, id):
     papers_published_at_venue = None
-    # Retrieve the paper from the database
-    query = "MATCH (a) WHERE ID(a)={id} RETURN a"
-    results, meta = db.cypher_query(query, dict(id=id))
-    if len(results) > 0:
-        # There should be only one results because ID should be unique. Here we check that at
-        # least one result has been returned and take the first result as the correct match.
-        # Now, it should not happen that len(results) > 1 since IDs are meant to be unique.
-        # For the MVP we are going to ignore the latter case and just continue but ultimately,
-        # we should be checking for > 1 and failing gracefully.
-        all_venues = [Venue.inflate(row[0]) for row in results]
-        venue = all_venues[0]
-    else:  # go back to the venue index page
-        return render(
-            request,
-            "venues.html",
-            {"venues": Venue.nodes.all(), "num_venues": len(Venue.nodes.all())},
-        )
+    # Retrieve the venue and all of its neighbours from the database with a single query
+    node, neighbours = get_backend().get_node_with_neighbours(id, "Venue")
+    if node is None:  # go back to the venue index page
+        return detail_not_found(request, "Venue", "venues_index")
+    venue = Venue.inflate(node)
 
     #
-    # TO DO: Retrieve all papers published at this venue and list them
+    # Retrieve all papers published at this venue and list them
     #
-    query = "MATCH (p:Paper)-[r:was_published_at]->(v:Venue) where id(v)={id} return p"
-    results, meta = db.cypher_query(query, dict(id=id))
-    if len(results) > 0:
-        papers_published_at_venue = [Paper.inflate(row[0]) for row in results]
+    papers = select_neighbours(neighbours, "Paper", outgoing=False)
+    if len(papers) > 0:
+        papers_published_at_venue = [Paper.inflate(paper) for paper in papers]
         print("Number of papers published at this venue {}".format(len(papers_published_at_venue)))
         for p in papers_published_at_venue:
             print("Title: {}".format(p.title))
@@ -2064,6 +1503,7 @@ def venue_delete(request, id):
     # Cypher query to delete the paper node
     query = "MATCH (v:Venue) WHERE ID(v)={id} DETACH DELETE v"
     results, meta = db.cypher_query(query, dict(id=id))
+    invalidate_count(Venue)
 
     return HttpResponseRedirect(reverse("venues_index"))
 
@@ -2134,7 +1574,7 @@ def comments(request):
         return render(
             request,
             "comments.html",
-            {"comments": Comment.nodes.all(), "num_comments": len(Comment.nodes.all())},
+            {"comments": Comment.nodes.all(), "num_comments": count_nodes(Comment)},
         )
     else:
         # other users are sent back to the paper index
@@ -2233,105 +1673,18 @@ def comment_update(request, id):
 # Utility Views (admin required)
 #
 @login_required
+@staff_member_required
+@require_POST
 def build(request):
-    try:
-        d1 = Dataset()
-        d1.name = "Yelp"
-        d1.source_type = "N"
-        d1.save()
-
-        v1 = Venue()
-        v1.name = "Neural Information Processing Systems"
-        v1.publication_date = date(2017, 12, 15)
-        v1.type = "C"
-        v1.publisher = "NIPS Foundation"
-        v1.keywords = "machine learning, machine learning, computational neuroscience"
-        v1.website = "https://nips.cc"
-        v1.peer_reviewed = "Y"
-        v1.save()
-
-        v2 = Venue()
-        v2.name = "International Conference on Machine Learning"
-        v2.publication_date = date(2016, 5, 24)
-        v2.type = "C"
-        v2.publisher = "International Machine Learning Society (IMLS)"
-        v2.keywords = "machine learning, computer science"
-        v2.peer_reviewed = "Y"
-        v2.website = "https://icml.cc/2016/"
-        v2.save()
-
-        p1 = Paper()
-        p1.title = "The best paper in the world."
-        p1.abstract = "Abstract goes here"
-        p1.keywords = "computer science, machine learning, graphs"
-        p1.save()
-
-        p1.evaluates_on.connect(d1)
-        p1.was_published_at.connect(v1)
-
-        p2 = Paper()
-        p2.title = "The second best paper in the world."
-        p2.abstract = "Abstract goes here"
-        p2.keywords = "statistics, robust methods"
-        p2.save()
-
-        p2.cites.connect(p1)
-        p2.was_published_at.connect(v2)
-
-        p3 = Paper()
-        p3.title = "I wish I could write a paper with a great title."
-        p3.abstract = "Abstract goes here"
-        p3.keywords = "machine learning, neural networks, convolutional neural networks"
-        p3.save()
-
-        p3.cites.connect(p1)
-        p3.was_published_at.connect(v1)
-
-        a1 = Person()
-        a1.first_name = "Pantelis"
-        a1.last_name = "Elinas"
-        a1.save()
-
-        a1.authors.connect(p1)
-
-        a2 = Person()
-        a2.first_name = "Ke"
-        a2.last_name = "Sun"
-        a2.save()
-
-        a2.authors.connect(p1)
-        a2.authors.connect(p2)
-
-        a3 = Person()
-        a3.first_name = "Bill"
-        a3.last_name = "Gates"
-        a3.save()
-
-        a3.authors.connect(p3)
-        a3.advisor_of.connect(a1)
-
-        a4 = Person()
-        a4.first_name = "Steve"
-        a4.last_name = "Jobs"
-        a4.save()
-
-        a4.authors.connect(p2)
-        a4.authors.connect(p3)
-
-        a4.co_authors_with.connect(a3)
-
-        c1 = Comment()
-        c1.author = "Pantelis Elinas"
-        c1.text = "This paper is flawless"
-        c1.save()
-
-        c1.discusses.connect(p1)
-
-    except Exception:
-        pass
-
-    num_papers = len(Paper.nodes.all())
-    num_people = len(Person.nodes.all())
+    # adds a small synthetic catalog for trying out the app, use the generate_catalog
+    # command for larger ones
+    # the same seed gives the same nodes, uid included, so a catalog that already has
+    # papers gets new ones from a fresh seed
+    seed = 0 if count_nodes(Paper) == 0 else random.randrange(2 ** 32)
+    generate_catalog(BUILD_NUM_PAPERS, seed=seed)
+
+    num_papers = count_nodes(Paper)
+    num_people = count_nodes(Person)
 
     return render(
         request, "build.html", {"num_papers": num_papers, "num_people": num_people}
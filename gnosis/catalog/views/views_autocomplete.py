@@ -0,0 +1,42 @@
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.views.decorators.cache import cache_page
+from catalog.search import autocomplete as search_autocomplete
+
+
+# The number of suggestions returned
+AUTOCOMPLETE_LIMIT = 10
+# Nothing is suggested for fewer characters than this since almost everything matches
+AUTOCOMPLETE_MIN_LENGTH = 2
+# Seconds the suggestions for the same text are cached, by Django and by the browser
+AUTOCOMPLETE_CACHE_TIMEOUT = 60
+
+# kind -> name of the URL of the detail page
+_DETAIL_URLS = {
+    "papers": "paper_detail",
+    "people": "person_detail",
+    "venues": "venue_detail",
+    "datasets": "dataset_detail",
+    "codes": "code_detail",
+}
+
+
+@cache_page(AUTOCOMPLETE_CACHE_TIMEOUT)
+def autocomplete(request, kind):
+    """
+    Suggests papers, people, venues, datasets or codes whose names start with the text
+    typed so far, given as the q query parameter.
+    :param request:
+    :param kind: One of papers, people, venues, datasets or codes.
+    :return: JSON {"results": [{"id": node ID, "label": name, "url": detail page URL}]}
+    """
+    if kind not in _DETAIL_URLS:
+        raise Http404
+
+    query_string = request.GET.get("q", "").strip()
+    results = []
+    if len(query_string) >= AUTOCOMPLETE_MIN_LENGTH:
+        for node_id, label in search_autocomplete(kind, query_string, AUTOCOMPLETE_LIMIT):
+            results.append(dict(id=node_id, label=label, url=reverse(_DETAIL_URLS[kind], args=[node_id])))
+
+    return JsonResponse({"results": results})
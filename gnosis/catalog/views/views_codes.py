@@ -7,15 +7,15 @@ from catalog.forms import SearchCodesForm
 from django.urls import reverse
 from django.http import HttpResponseRedirect
 from neomodel import db
+from catalog.views.not_found import detail_not_found
+from catalog.counts import invalidate_count
+from catalog.pagination import get_page
 
 
 #
 # Code Views
 #
 def codes(request):
-    # all_codes = Code.nodes.all()
-    all_codes = Code.nodes.order_by("-created")[:50]
-
     message = None
     if request.method == "POST":
         form = SearchCodesForm(request.POST)
@@ -35,8 +35,17 @@ def codes(request):
         print("Received GET request")
         form = SearchCodesForm()
 
+    # the page is only loaded when it is shown, not for a search that finds something
+    all_codes, next_cursor = get_page(Code, request.GET.get("after"))
+    if request.is_ajax() and request.method == "GET":
+        return render(
+            request, "codes_page.html", {"codes": all_codes, "next_cursor": next_cursor}
+        )
+
     return render(
-        request, "codes.html", {"codes": all_codes, "form": form, "message": message}
+        request,
+        "codes.html",
+        {"codes": all_codes, "next_cursor": next_cursor, "form": form, "message": message},
     )
 
 
@@ -52,12 +61,8 @@ def code_detail(request, id):
         # we should be checking for > 1 and failing gracefully.
         all_codes = [Code.inflate(row[0]) for row in results]
         code = all_codes[0]
-    else:  # go back to the paper index page
-        return render(
-            request,
-            "codes.html",
-            {"codes": Code.nodes.all(), "num_codes": len(Code.nodes.all())},
-        )
+    else:  # go back to the code index page
+        return detail_not_found(request, "Code", "codes_index")
 
     #
     # TO DO: Retrieve and list all papers that evaluate on this dataset.
@@ -188,5 +193,6 @@ def code_delete(request, id):
     # Cypher query to delete the paper node
     query = "MATCH (c:Code) WHERE ID(c)={id} DETACH DELETE c"
     results, meta = db.cypher_query(query, dict(id=id))
+    invalidate_count(Code)
 
     return HttpResponseRedirect(reverse("codes_index"))
@@ -0,0 +1,57 @@
+from django.http import Http404, JsonResponse, HttpResponseBadRequest
+from django.views.decorators.cache import cache_page
+from catalog.queries import get_node_neighbourhood, RELATIONSHIP_TYPES
+from catalog.cytoscape import graph_elements, node_type
+
+
+# Server side limits on the size of the neighbourhoods that can be requested
+MAX_HOPS = 3
+MAX_LIMIT = 2000
+MAX_FAN_OUT = 200
+
+
+def _get_int_parameter(request, name, default, maximum):
+    """
+    Reads a positive integer from the query string clamping it to [1, maximum].
+    """
+    try:
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        value = default
+    return min(max(value, 1), maximum)
+
+
+#
+# Graph Views
+#
+@cache_page(60 * 5)
+def graph_neighbourhood(request, id):
+    """
+    Returns the neighbourhood of any node as JSON Cytoscape elements, e.g.,
+
+        catalog/graph/<id>/neighbourhood?hops=2&types=cites,authors&limit=500&fan_out=50
+
+    hops is the maximum distance from the node, types restricts the relationships that
+    are followed, limit is the maximum number of nodes returned and fan_out the maximum
+    number of relationships followed from every node at each hop.
+    """
+    hops = _get_int_parameter(request, "hops", 1, MAX_HOPS)
+    limit = _get_int_parameter(request, "limit", 500, MAX_LIMIT)
+    fan_out = _get_int_parameter(request, "fan_out", 50, MAX_FAN_OUT)
+
+    relationship_types = None
+    if request.GET.get("types", ""):
+        relationship_types = [t.strip() for t in request.GET["types"].split(",") if t.strip()]
+        unknown_types = [t for t in relationship_types if t not in RELATIONSHIP_TYPES]
+        if len(unknown_types) > 0:
+            return HttpResponseBadRequest(
+                "Unknown relationship types: {}".format(", ".join(unknown_types))
+            )
+
+    nodes, edges, truncated = get_node_neighbourhood(
+        id, hops=hops, relationship_types=relationship_types, limit=limit, fan_out=fan_out
+    )
+    if id not in nodes or node_type(nodes[id][0]) is None:
+        raise Http404
+
+    return JsonResponse({"elements": graph_elements(nodes, edges), "truncated": truncated})
@@ -0,0 +1,35 @@
+import hmac
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from catalog import metrics
+from catalog.instrumentation import get_fingerprints
+
+
+# The header with METRICS_TOKEN that lets, e.g., a monitoring agent see the metrics
+METRICS_TOKEN_HEADER = "HTTP_X_METRICS_TOKEN"
+
+
+def _has_metrics_token(request):
+    # the address of the request is not checked since behind a proxy on the same host
+    # every request comes from 127.0.0.1
+    token = getattr(settings, "METRICS_TOKEN", "")
+    return bool(token) and hmac.compare_digest(request.META.get(METRICS_TOKEN_HEADER, ""), token)
+
+
+def metrics_summary(request):
+    """
+    Shows the counters and summaries of this process, e.g., the number and time of the
+    Cypher queries of every view, and the fingerprints of the recorded queries. Only
+    staff and requests with METRICS_TOKEN in the X-Metrics-Token header, e.g., from a
+    monitoring agent, can see them.
+    :param request:
+    :return: A JSON response with keys counters, summaries and queries.
+    """
+    if not (request.user.is_staff or _has_metrics_token(request)):
+        raise Http404
+
+    return JsonResponse(dict(
+        counters=metrics.get_counters(),
+        summaries=metrics.get_summaries(),
+        queries=get_fingerprints(),
+    ))
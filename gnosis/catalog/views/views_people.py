@@ -7,6 +7,12 @@ from catalog.forms import SearchPeopleForm
 from django.urls import reverse
 from django.http import HttpResponseRedirect
 from neomodel import db
+from catalog.views.not_found import detail_not_found
+from catalog.counts import invalidate_count
+from catalog.pagination import get_page
+from catalog.backends import get_backend
+from catalog.queries import select_neighbours
+from catalog.search import search_people
 from django.shortcuts import redirect
 from django.contrib import messages
 
@@ -15,23 +21,12 @@ def _person_find(person_name, exact_match=False):
     """
     Searches the DB for a person whose name matches the given name
     :param person_name:
-    :return:
+    :return: <list> The matching people from best to worst match, or None if there are none.
     """
-    person_name = person_name.lower()
-    person_name_tokens = [w for w in person_name.split()]
-    if exact_match:
-        if len(person_name_tokens) > 2:
-            query = "MATCH (p:Person) WHERE  LOWER(p.last_name) IN { person_tokens } AND LOWER(p.first_name) IN { person_tokens } AND LOWER(p.middle_name) IN { person_tokens } RETURN p LIMIT 20"
-        else:
-            query = "MATCH (p:Person) WHERE  LOWER(p.last_name) IN { person_tokens } AND LOWER(p.first_name) IN { person_tokens } RETURN p LIMIT 20"
-    else:
-        query = "MATCH (p:Person) WHERE  LOWER(p.last_name) IN { person_tokens } OR LOWER(p.first_name) IN { person_tokens } OR LOWER(p.middle_name) IN { person_tokens } RETURN p LIMIT 20"
-
-    results, meta = db.cypher_query(query, dict(person_tokens=person_name_tokens))
+    people = search_people(person_name, exact_match=exact_match)
 
-    if len(results) > 0:
-        print("Found {} matching people".format(len(results)))
-        people = [Person.inflate(row[0]) for row in results]
+    if len(people) > 0:
+        print("Found {} matching people".format(len(people)))
         return people
     else:
         return None
@@ -80,7 +75,6 @@ def person_find(request):
 # Person Views
 #
 def persons(request):
-    people = Person.nodes.order_by("-created")[:50]
     message = None
     if request.method == "POST":
         form = SearchPeopleForm(request.POST)
@@ -106,38 +100,32 @@ def persons(request):
         print("Received GET request")
         form = SearchPeopleForm()
 
+    # the page is only loaded when it is shown, not for a search that finds something
+    people, next_cursor = get_page(Person, request.GET.get("after"))
+    if request.is_ajax() and request.method == "GET":
+        return render(
+            request, "people_page.html", {"people": people, "next_cursor": next_cursor}
+        )
+
     return render(
-        request, "people.html", {"people": people, "form": form, "message": message}
+        request,
+        "people.html",
+        {"people": people, "next_cursor": next_cursor, "form": form, "message": message},
     )
 
 
 def person_detail(request, id):
-    # Retrieve the paper from the database
-    papers_authored = []
-    query = "MATCH (a) WHERE ID(a)={id} RETURN a"
-    results, meta = db.cypher_query(query, dict(id=id))
-    if len(results) > 0:
-        # There should be only one results because ID should be unique. Here we check that at
-        # least one result has been returned and take the first result as the correct match.
-        # Now, it should not happen that len(results) > 1 since IDs are meant to be unique.
-        # For the MVP we are going to ignore the latter case and just continue but ultimately,
-        # we should be checking for > 1 and failing gracefully.
-        all_people = [Person.inflate(row[0]) for row in results]
-        person = all_people[0]
-    else:  # go back to the paper index page
-        return render(
-            request,
-            "people.html",
-            {"people": Person.nodes.all(), "num_people": len(Person.nodes.all())},
-        )
+    # Retrieve the person and all of their neighbours from the database with a single query
+    node, neighbours = get_backend().get_node_with_neighbours(id, "Person")
+    if node is None:  # go back to the person index page
+        return detail_not_found(request, "Person", "persons_index")
+    person = Person.inflate(node)
 
     #
     # Retrieve all papers co-authored by this person and list them
     #
-    query = "MATCH (a:Person)-[r:authors]->(p:Paper) where id(a)={id} return p"
-    results, meta = db.cypher_query(query, dict(id=id))
-    if len(results) > 0:
-        papers_authored = [Paper.inflate(row[0]) for row in results]
+    papers_authored = [Paper.inflate(paper) for paper in select_neighbours(neighbours, "Paper", outgoing=True)]
+    if len(papers_authored) > 0:
         print("Number of papers co-authored by {}: {}".format(person.last_name, len(papers_authored)))
         for p in papers_authored:
             print("Title: {}".format(p.title))
@@ -219,5 +207,6 @@ def person_delete(request, id):
     # Cypher query to delete the paper node
     query = "MATCH (p:Person) WHERE ID(p)={id} DETACH DELETE p"
     results, meta = db.cypher_query(query, dict(id=id))
+    invalidate_count(Person)
 
     return HttpResponseRedirect(reverse("persons_index"))
@@ -50,6 +50,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'catalog.middleware.CypherQueryMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -93,6 +94,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/2.0/topics/cache/
+# The cache must be shared by all web workers since it holds, e.g., the state of the paper
+# import jobs that any worker may be polled for, see catalog/importers/jobs.py. The files
+# are shared by the workers of one host; use memcached for servers on several hosts.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', os.path.join(BASE_DIR, 'django_cache')),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
 
@@ -149,4 +164,81 @@ NOSE_ARGS = [
     '--with-coverage',
     '--cover-package=catalog',
     '--cover-html',
-]
\ No newline at end of file
+]
+
+
+# Importing papers
+# see catalog/importers/
+
+# Cache of the publisher pages downloaded when importing papers, see catalog/importers/http_cache.py
+SCRAPER_CACHE_DIR = os.environ.get('SCRAPER_CACHE_DIR', os.path.join(BASE_DIR, 'scraper_cache'))
+
+# Pages younger than this many seconds are used without contacting the publisher
+SCRAPER_CACHE_TTL = 7 * 24 * 60 * 60
+
+# The least recently used pages are removed when the cache grows larger than this
+SCRAPER_CACHE_MAX_SIZE = 500 * 1024 * 1024
+
+# Only use cached pages and never contact the publishers, e.g., for running tests offline
+SCRAPER_CACHE_OFFLINE = os.environ.get('SCRAPER_CACHE_OFFLINE', '') == '1'
+
+# The source adapters used to import papers, tried in order, see catalog/importers/adapters.py
+PAPER_SOURCE_ADAPTERS = [
+    'catalog.importers.adapters.ArxivAdapter',
+    'catalog.importers.adapters.NipsAdapter',
+    'catalog.importers.adapters.JmlrAdapter',
+    'catalog.importers.adapters.IeeeAdapter',
+    'catalog.importers.adapters.AcmAdapter',
+]
+
+# The BeautifulSoup parser used by the source adapters, or None for lxml if it is installed and html.parser otherwise
+SCRAPER_HTML_PARSER = None
+
+# The dates of the last arXiv harvests, see catalog/importers/arxiv.py
+ARXIV_HARVEST_STATE_FILE = os.environ.get('ARXIV_HARVEST_STATE_FILE', os.path.join(BASE_DIR, 'arxiv_harvest.json'))
+
+
+# Graph storage
+# see catalog/backends/__init__.py
+
+# Where the graph used by the catalog's helpers is stored
+GRAPH_BACKEND = os.environ.get('GRAPH_BACKEND', 'catalog.backends.neo4j.Neo4jBackend')
+
+
+# Requests for missing pages
+# see catalog/views/not_found.py
+
+# The number of reverse proxies in front of the server, each adding the address it got the
+# request from to the X-Forwarded-For header. With 0, clients are told apart by the address
+# of the connection, which behind a proxy is the proxy's for every client.
+NUM_PROXIES = int(os.environ.get('NUM_PROXIES', '0'))
+
+
+# Monitoring DB queries
+# see catalog/middleware.py and catalog/metrics.py
+
+# Add the number and time of the Cypher queries of every request to the response in the
+# X-Cypher-Queries header also when DEBUG is off
+CYPHER_QUERY_HEADER = os.environ.get('CYPHER_QUERY_HEADER', '') == '1'
+
+# Requests with this token in the X-Metrics-Token header may see the metrics of the app at
+# /catalog/metrics/ without logging in as staff. With no token, only staff can see them.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# One JSON line per request with the Cypher queries it made
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'catalog.cypher': {
+            'handlers': ['console'],
+            'level': os.environ.get('CYPHER_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,54 @@
+"""
+Assertions on the number of Cypher queries sent by the code under test, similar to
+Django's assertNumQueries for SQL queries, e.g.,
+
+    class PaperViewTest(CypherQueriesMixin, TestCase):
+
+        def test_paper_detail(self):
+            with self.assertMaxCypherQueries(1):
+                self.client.get(url)
+
+A test fails if a change adds queries, e.g., one query per paper of a list, and the
+failure lists the queries that were sent, most frequent first.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from catalog.instrumentation import record_queries
+
+
+def describe_queries(queries):
+    """
+    :param queries: <list> Query tuples as recorded by catalog.instrumentation.record_queries.
+    :return: <str> One line per distinct query with the number of times it was sent.
+    """
+    counts = Counter(query.fingerprint for query in queries)
+
+    return "\n".join("{:4d}x {}".format(count, text) for text, count in counts.most_common())
+
+
+class CypherQueriesMixin:
+
+    @contextmanager
+    def assertNumCypherQueries(self, num):
+        """
+        Fails if the code in the block does not send exactly num Cypher queries.
+        :return: <list> The Query tuples of the queries sent in the block, e.g., to check
+        their rows or times.
+        """
+        with record_queries() as queries:
+            yield queries
+        if len(queries) != num:
+            self.fail("{} Cypher queries sent, {} expected:\n{}".format(len(queries), num, describe_queries(queries)))
+
+    @contextmanager
+    def assertMaxCypherQueries(self, num):
+        """
+        Fails if the code in the block sends more than num Cypher queries.
+        :return: <list> The Query tuples of the queries sent in the block.
+        """
+        with record_queries() as queries:
+            yield queries
+        if len(queries) > num:
+            self.fail("{} Cypher queries sent, at most {} expected:\n{}".format(
+                len(queries), num, describe_queries(queries)
+            ))
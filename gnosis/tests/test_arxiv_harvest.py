@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+from django.test import TestCase
+from neomodel import db
+from catalog.importers import arxiv
+
+
+RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<responseDate>2019-05-01T00:00:00Z</responseDate>
+<ListRecords>
+{records}
+<resumptionToken cursor="0" completeListSize="3">{token}</resumptionToken>
+</ListRecords>
+</OAI-PMH>
+"""
+
+RECORD = """<record>
+<header><identifier>oai:arXiv.org:{id}</identifier><datestamp>2019-04-30</datestamp><setSpec>cs</setSpec></header>
+<metadata>
+<arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+<id>{id}</id>
+<authors>
+<author><keyname>Harvesttestauthor</keyname><forenames>Ada</forenames></author>
+<author><keyname>Harvesttestauthor</keyname><forenames>Charles  B.</forenames></author>
+</authors>
+<title>Harvest test paper
+ {id}</title>
+<abstract>  The abstract of
+ {id}.
+</abstract>
+</arXiv>
+</metadata>
+</record>"""
+
+DELETED_RECORD = """<record>
+<header status="deleted"><identifier>oai:arXiv.org:{id}</identifier><datestamp>2019-04-30</datestamp></header>
+</record>"""
+
+
+class OaiHandler(BaseHTTPRequestHandler):
+    """ Stands in for the arXiv OAI-PMH endpoint with a list of three records in two responses """
+    requests = []
+    busy = False
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        OaiHandler.requests.append(params)
+        if OaiHandler.busy:
+            # arXiv asks harvesters to slow down with 503 and Retry-After
+            OaiHandler.busy = False
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if params.get("resumptionToken") == "page2":
+            body = RESPONSE.format(records=RECORD.format(id="1901.00003"), token="")
+        else:
+            records = RECORD.format(id="1901.00001") + DELETED_RECORD.format(id="1901.00002")
+            body = RESPONSE.format(records=records, token="page2")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+# To run this test, use command: python manage.py test tests.test_arxiv_harvest
+class ArxivHarvestTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(("127.0.0.1", 0), OaiHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = "http://127.0.0.1:{}/oai2".format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        OaiHandler.requests = []
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def test_harvest_responses(self):
+        OaiHandler.busy = True
+        responses = list(arxiv.harvest_responses("cs", from_date="2019-04-01", base_url=self.url))
+
+        self.assertEquals([token for papers, token in responses], ["page2", None])
+        papers = [paper for papers, token in responses for paper in papers]
+        self.assertEquals(len(papers), 2)
+        self.assertEquals(papers[0], dict(
+            title="Harvest test paper 1901.00001",
+            authors=["Ada Harvesttestauthor", "Charles B. Harvesttestauthor"],
+            abstract="The abstract of 1901.00001.",
+            download_link="https://arxiv.org/pdf/1901.00001",
+            source_link="https://arxiv.org/abs/1901.00001",
+        ))
+        # the first request was refused and repeated
+        self.assertEquals(OaiHandler.requests[0], OaiHandler.requests[1])
+        self.assertEquals(
+            OaiHandler.requests[1],
+            dict(verb="ListRecords", metadataPrefix="arXiv", set="cs", **{"from": "2019-04-01"}),
+        )
+        self.assertEquals(OaiHandler.requests[2], dict(verb="ListRecords", resumptionToken="page2"))
+
+    def test_harvest(self):
+        """ For this test, a neo4j database must be running """
+        state_file = os.path.join(self.state_dir, "arxiv_harvest.json")
+        try:
+            with self.settings(ARXIV_HARVEST_STATE_FILE=state_file):
+                summary = arxiv.harvest("cs", base_url=self.url)
+                self.assertEquals(
+                    summary, dict(responses=2, papers_added=2, people_added=2, papers_skipped=0, papers_without_authors=0)
+                )
+                state = arxiv.load_state()["cs"]
+                self.assertEquals(state["resumption_token"], None)
+                self.assertEquals(state["from"], state["started"])
+
+                # the next harvest only asks for the papers changed since
+                summary = arxiv.harvest("cs", base_url=self.url)
+                self.assertEquals(summary["papers_skipped"], 2)
+                self.assertEquals(OaiHandler.requests[-2]["from"], state["from"])
+        finally:
+            db.cypher_query("MATCH (p:Paper) WHERE p.title STARTS WITH 'Harvest test paper' DETACH DELETE p")
+            db.cypher_query("MATCH (a:Person {last_name: 'Harvesttestauthor'}) DETACH DELETE a")
@@ -0,0 +1,41 @@
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from neomodel import db
+from catalog.models import Paper, Person
+
+
+# To run this test, use command: python manage.py test tests.test_autocomplete
+class AutocompleteTest(TestCase):
+    """ For these tests, a neo4j database with the indexes of install_indexes must be running """
+
+    def setUp(self):
+        cache.clear()
+
+    def get_results(self, kind, query_string):
+        response = self.client.get("/catalog/autocomplete/{}/".format(kind), {"q": query_string})
+        self.assertEquals(response.status_code, 200)
+        self.assertIn("max-age", response["Cache-Control"])
+        return json.loads(response.content.decode("utf-8"))["results"]
+
+    def test_autocomplete(self):
+        paper = Paper(title="Autocompletetest paper about graphs", abstract="Abstract", download_link="https://google.com")
+        paper.save()
+        person = Person(first_name="Autocompletetest", last_name="Person")
+        person.save()
+        try:
+            results = self.get_results("papers", "autocompletetest pap")
+            self.assertEquals(results, [dict(
+                id=paper.id, label="Autocompletetest paper about graphs", url="/catalog/paper/{}/".format(paper.id)
+            )])
+            results = self.get_results("people", "autocompletet")
+            self.assertEquals([result["label"] for result in results], ["Autocompletetest Person"])
+            # too short to suggest anything
+            self.assertEquals(self.get_results("papers", "a"), [])
+        finally:
+            db.cypher_query("MATCH (p:Paper) WHERE p.title STARTS WITH 'Autocompletetest' DETACH DELETE p")
+            db.cypher_query("MATCH (a:Person {first_name: 'Autocompletetest'}) DETACH DELETE a")
+
+    def test_unknown_kind(self):
+        response = self.client.get("/catalog/autocomplete/comments/", {"q": "graph"})
+        self.assertEquals(response.status_code, 404)
@@ -0,0 +1,90 @@
+from django.test import TestCase
+from neomodel import db
+from catalog.models import Paper
+from catalog.importers.bulk import parse_import_file, parse_bibtex, write_papers
+
+
+BIBTEX = """
+@article{grover2016node2vec,
+  title={node2vec: Scalable {Feature} Learning for Networks},
+  author={Grover, Aditya and Leskovec, Jure},
+  abstract = "Prediction tasks over nodes and edges in networks.",
+  year = 2016
+}
+
+@inproceedings{perozzi2014deepwalk,
+  title = {DeepWalk: Online Learning of Social Representations},
+  eprint = {1403.6652},
+}
+"""
+
+
+# To run this test, use command: python manage.py test tests.test_bulk_import
+class BulkImportTest(TestCase):
+    def test_parse_bibtex(self):
+        entries = parse_bibtex(BIBTEX)
+        self.assertEquals(len(entries), 2)
+        self.assertEquals(entries[0]["author"], "Grover, Aditya and Leskovec, Jure")
+        self.assertEquals(entries[0]["year"], "2016")
+        self.assertEquals(entries[1]["eprint"], "1403.6652")
+
+    def test_parse_import_file(self):
+        entries = parse_import_file(BIBTEX)
+        paper = entries[0]["paper"]
+        self.assertEquals(paper["title"], "node2vec: Scalable Feature Learning for Networks")
+        self.assertEquals(paper["authors"], ["Aditya Grover", "Jure Leskovec"])
+        # the second entry has no abstract so it must be downloaded
+        self.assertEquals(entries[1], {"url": "https://arxiv.org/abs/1403.6652"})
+
+        entries = parse_import_file(
+            "# papers to import\n"
+            "1607.00653\n"
+            "arXiv:astro-ph/9204001\n"
+            "\n"
+            "http://www.jmlr.org/papers/v20/15-192.html\n"
+        )
+        self.assertEquals(
+            [entry["url"] for entry in entries],
+            [
+                "https://arxiv.org/abs/1607.00653",
+                "https://arxiv.org/abs/astro-ph/9204001",
+                "http://www.jmlr.org/papers/v20/15-192.html",
+            ],
+        )
+
+    def test_write_papers(self):
+        """ For this test, a neo4j database must be running """
+        papers = [
+            dict(title="Bulk import test paper one", authors=["Bulkfirst Testauthor", "Bulk Middle Testauthor"],
+                 abstract="One.", download_link="https://google.com", source_link=None),
+            dict(title="Bulk import test paper two", authors=["Bulkfirst Testauthor"],
+                 abstract="Two.", download_link="https://google.com", source_link=None),
+            # duplicate title
+            dict(title="BULK IMPORT TEST PAPER ONE", authors=["Someone Else"],
+                 abstract="One again.", download_link="https://google.com", source_link=None),
+            # no authors
+            dict(title="Bulk import test paper four", authors=[],
+                 abstract="Four.", download_link="https://google.com", source_link=None),
+        ]
+        try:
+            self.assertEquals(write_papers(papers), (2, 2, 1, 1))
+
+            query = (
+                "MATCH (a:Person {last_name: 'Testauthor'})-[:authors]->(p:Paper) "
+                "WHERE p.title STARTS WITH 'Bulk import test paper' "
+                "RETURN a.first_name, a.middle_name, count(p) ORDER BY a.first_name"
+            )
+            results, meta = db.cypher_query(query)
+            self.assertEquals(results, [["Bulk", "['Middle']", 1], ["Bulkfirst", None, 2]])
+
+            # importing the same papers again adds nothing
+            self.assertEquals(write_papers(papers), (0, 0, 3, 1))
+
+            # papers saved through the model are found by their title key
+            Paper(title="Bulk import test paper: Três", abstract="Three.", download_link="https://google.com").save()
+            self.assertEquals(write_papers([dict(papers[1], title="bulk import test paper tres")]), (0, 0, 1, 0))
+        finally:
+            db.cypher_query(
+                "MATCH (p:Paper) WHERE p.title STARTS WITH 'Bulk import test paper' DETACH DELETE p"
+            )
+            db.cypher_query("MATCH (a:Person {last_name: 'Testauthor'}) DETACH DELETE a")
@@ -0,0 +1,22 @@
+from django.test import TestCase
+
+from catalog.models import Paper
+from catalog.counts import count_nodes
+
+
+# To run this test, use command: python manage.py test tests.test_counts
+class CountsTest(TestCase):
+    def test_count_follows_create_and_delete(self):
+        num_papers = count_nodes(Paper)
+        # the second call is answered from the cache
+        self.assertEquals(count_nodes(Paper), num_papers)
+
+        paper = Paper()
+        paper.title = "No title"
+        paper.abstract = "The abstract is missing."
+        paper.download_link = "https://google.com"
+        paper.save()
+        self.assertEquals(count_nodes(Paper), num_papers + 1)
+
+        paper.delete()
+        self.assertEquals(count_nodes(Paper), num_papers)
@@ -0,0 +1,88 @@
+import json
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from catalog import metrics
+from catalog.instrumentation import fingerprint, record_queries, summarize, _instrumented, REPEATED_QUERY_THRESHOLD, \
+    Query
+from catalog.middleware import QUERY_HEADER, _update_metrics
+
+
+def _fake_cypher_query(query, params=None):
+    return [[1], [2]], ["n"]
+
+
+# To run this test, use command: python manage.py test tests.test_cypher_instrumentation
+class CypherInstrumentationTest(TestCase):
+
+    def test_fingerprint(self):
+        text, digest = fingerprint("MATCH (p:Paper)   WHERE ID(p)=42 AND p.title = 'Deep \\'walk\\''\n RETURN p")
+        self.assertEquals(text, "MATCH (p:Paper) WHERE ID(p)=? AND p.title = ? RETURN p")
+        self.assertEquals(fingerprint("MATCH (p:Paper) WHERE ID(p)=7 AND p.title = \"x\" RETURN p")[1], digest)
+        self.assertNotEqual(fingerprint("MATCH (p:Person) WHERE ID(p)=7 RETURN p")[1], digest)
+
+    def test_record_queries(self):
+        cypher_query = _instrumented(_fake_cypher_query)
+        cypher_query("MATCH (p:Paper) RETURN p")  # not recorded
+        with record_queries() as queries:
+            for i in range(REPEATED_QUERY_THRESHOLD):
+                cypher_query("MATCH (p:Paper) WHERE ID(p)={}".format(i))
+            with record_queries() as inner_queries:
+                cypher_query("UNWIND {ids} AS id RETURN id", dict(ids=[1, 2, 3], limit=10))
+
+        self.assertEquals(len(queries), REPEATED_QUERY_THRESHOLD + 1)
+        self.assertEquals(len(inner_queries), 1)
+        self.assertEquals(inner_queries[0].param_items, 4)
+        self.assertEquals(inner_queries[0].rows, 2)
+
+        summary = summarize(queries)
+        self.assertEquals(summary["queries"], REPEATED_QUERY_THRESHOLD + 1)
+        self.assertEquals(summary["rows"], 2 * (REPEATED_QUERY_THRESHOLD + 1))
+        self.assertEquals(list(summary["repeated"].values()), [REPEATED_QUERY_THRESHOLD])
+
+    def test_observe(self):
+        metrics.observe("test.observe", 2.0)
+        metrics.observe("test.observe", 4.0)
+        summary = metrics.get_summaries()["test.observe"]
+        self.assertEquals(summary["count"], 2)
+        self.assertEquals(summary["mean"], 3.0)
+        self.assertEquals(summary["max"], 4.0)
+
+    def test_update_metrics(self):
+        cypher_query = _instrumented(_fake_cypher_query)
+        with record_queries() as queries:
+            cypher_query("MATCH (p:Paper) WHERE p.title = 'Update metrics test' RETURN p")
+        # a query whose fingerprint was not remembered, e.g., after MAX_FINGERPRINTS others
+        queries.append(Query("MATCH (p:Person) RETURN p", None, "MATCH (p:Person) RETURN p", "forgotten", 0, 1, 1.0))
+
+        _update_metrics("update_metrics_test", summarize(queries), queries)
+        summaries = metrics.get_summaries()
+        self.assertIn("cypher.query_time_ms.{}".format(queries[0].digest), summaries)
+        self.assertNotIn("cypher.query_time_ms.forgotten", summaries)
+
+    @override_settings(CYPHER_QUERY_HEADER=True)
+    def test_middleware(self):
+        """ For this test, a neo4j database must be running """
+        response = self.client.get("/catalog/papers/")
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(response[QUERY_HEADER].startswith("count="))
+        self.assertIn("repeated=0", response[QUERY_HEADER])
+
+        with self.settings(METRICS_TOKEN="secret"):
+            response = self.client.get("/catalog/metrics/", HTTP_X_METRICS_TOKEN="secret")
+        self.assertEquals(response.status_code, 200)
+        counters = json.loads(response.content.decode("utf-8"))["counters"]
+        self.assertTrue(counters["cypher.requests.papers_index"] >= 1)
+
+    def test_metrics_access(self):
+        # requests from a proxy on the same host are not trusted
+        response = self.client.get("/catalog/metrics/", REMOTE_ADDR="127.0.0.1")
+        self.assertEquals(response.status_code, 404)
+        with self.settings(METRICS_TOKEN="secret"):
+            self.assertEquals(self.client.get("/catalog/metrics/", HTTP_X_METRICS_TOKEN="wrong").status_code, 404)
+            self.assertEquals(self.client.get("/catalog/metrics/", HTTP_X_METRICS_TOKEN="secret").status_code, 200)
+        # no token is set so an empty token is not accepted
+        self.assertEquals(self.client.get("/catalog/metrics/", HTTP_X_METRICS_TOKEN="").status_code, 404)
+
+        User.objects.create_user("metrics", "metrics@example.com", "metrics", is_staff=True)
+        self.client.login(username="metrics", password="metrics")
+        self.assertEquals(self.client.get("/catalog/metrics/").status_code, 200)
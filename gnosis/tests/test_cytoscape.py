@@ -0,0 +1,14 @@
+from django.test import TestCase
+from catalog.cytoscape import node_element
+
+
+# To run this test, use command: python manage.py test tests.test_cytoscape
+class CytoscapeTest(TestCase):
+    def test_person_middle_name(self):
+        # people added as paper authors have their middle names stored as the string of a
+        # list, other people as a plain string
+        for middle_name, expected in [("['Kumar', 'L.']", " Kumar L."), ("Kumar", " Kumar"), (None, "")]:
+            element = node_element(7, "Person", dict(first_name="Aditya", middle_name=middle_name,
+                                                      last_name="Grover"), "authors")
+            self.assertEquals(element["data"]["middle_name"], expected)
+            self.assertEquals(element["data"]["href"], "/catalog/person/7/")
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.error import URLError
+from django.test import TestCase
+from catalog.importers import http_cache
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """ Serves the same page with an ETag and counts the requests """
+    requests = []
+
+    def do_GET(self):
+        PageHandler.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(b"<html>paper page</html>")
+
+    def log_message(self, format, *args):
+        pass
+
+
+# To run this test, use command: python manage.py test tests.test_http_cache
+class HttpCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = "http://127.0.0.1:{}/paper?b=2&a=1".format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        PageHandler.requests = []
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_normalize_url(self):
+        self.assertEquals(
+            http_cache.normalize_url("HTTPS://ArXiv.org:443/abs/1607.00653?b=2&a=1#section"),
+            "https://arxiv.org/abs/1607.00653?a=1&b=2",
+        )
+
+    def test_fresh_page_is_not_downloaded_again(self):
+        with self.settings(SCRAPER_CACHE_DIR=self.cache_dir, SCRAPER_CACHE_TTL=60):
+            self.assertEquals(http_cache.fetch(self.url), b"<html>paper page</html>")
+            self.assertEquals(http_cache.fetch(self.url + "#abstract"), b"<html>paper page</html>")
+        self.assertEquals(PageHandler.requests, [None])
+
+    def test_stale_page_is_revalidated(self):
+        with self.settings(SCRAPER_CACHE_DIR=self.cache_dir, SCRAPER_CACHE_TTL=0):
+            self.assertEquals(http_cache.fetch(self.url), b"<html>paper page</html>")
+            self.assertEquals(http_cache.fetch(self.url), b"<html>paper page</html>")
+        self.assertEquals(PageHandler.requests, [None, '"v1"'])
+
+    def test_offline(self):
+        with self.settings(SCRAPER_CACHE_DIR=self.cache_dir, SCRAPER_CACHE_TTL=0):
+            http_cache.fetch(self.url)
+        with self.settings(SCRAPER_CACHE_DIR=self.cache_dir, SCRAPER_CACHE_OFFLINE=True):
+            self.assertEquals(http_cache.fetch(self.url), b"<html>paper page</html>")
+            with self.assertRaises(URLError):
+                http_cache.fetch(self.url.replace("paper", "other"))
+        self.assertEquals(len(PageHandler.requests), 1)
+
+    def test_evict(self):
+        with self.settings(SCRAPER_CACHE_DIR=self.cache_dir):
+            http_cache.fetch(self.url)
+            http_cache.evict(max_size=0)
+            http_cache.fetch(self.url)
+        self.assertEquals(len(PageHandler.requests), 2)
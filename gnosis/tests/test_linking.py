@@ -0,0 +1,82 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from neomodel import db
+from catalog.models import Paper, Person, Dataset
+from catalog.linking import link_nodes, paper_triples
+
+
+# To run this test, use command: python manage.py test tests.test_linking
+class LinkingTest(TestCase):
+
+    def test_paper_triples(self):
+        self.assertEquals(paper_triples(1, "cites", [2, 3]), [(1, "cites", 2), (1, "cites", 3)])
+        self.assertEquals(paper_triples(1, "authors", [2]), [(2, "authors", 1)])
+        self.assertEquals(paper_triples(1, "implements", [4]), [(4, "implements", 1)])
+
+    def test_unknown_relationship(self):
+        with self.assertRaises(ValueError):
+            link_nodes([(1, "cites", 2), (1, "likes", 2)])
+        self.assertEquals(link_nodes([]), {})
+
+    def test_link_nodes(self):
+        """ For this test, a neo4j database must be running """
+        paper = Paper(title="Linking test paper", abstract="Abstract", download_link="https://google.com")
+        paper.save()
+        cited = []
+        for i in range(30):
+            cited_paper = Paper(title="Linking test cited paper {}".format(i), abstract="Abstract",
+                                download_link="https://google.com")
+            cited_paper.save()
+            cited.append(cited_paper)
+        person = Person(first_name="Linking", last_name="Test")
+        person.save()
+        dataset = Dataset(name="Linking test dataset", keywords="K", description="D", source_type="N")
+        dataset.save()
+        try:
+            triples = paper_triples(paper.id, "cites", [p.id for p in cited])
+            triples += [(person.id, "authors", paper.id), (paper.id, "evaluates_on", dataset.id)]
+            # duplicates and the wrong labels are ignored
+            triples += [(person.id, "authors", paper.id), (dataset.id, "cites", paper.id)]
+            linked = link_nodes(triples)
+            self.assertEquals(len(linked), 32)
+            self.assertTrue(all(linked.values()))
+            self.assertEquals(len(paper.cites), 30)
+            self.assertEquals(len(paper.evaluates_on), 1)
+            self.assertEquals(len(person.authors), 1)
+            self.assertTrue(all(p.id == paper.id for p in person.authors))
+
+            # linking again does not add edges
+            linked = link_nodes(triples)
+            self.assertEquals(len(linked), 32)
+            self.assertFalse(any(linked.values()))
+            self.assertEquals(len(paper.cites), 30)
+        finally:
+            db.cypher_query("MATCH (p:Paper) WHERE p.title STARTS WITH 'Linking test' DETACH DELETE p")
+            person.delete()
+            dataset.delete()
+
+    def test_paper_connect_selected(self):
+        """ For this test, a neo4j database must be running """
+        User.objects.create_user(username="testuser", password="2HJ1vRV0Z&3iD")
+        self.client.login(username="testuser", password="2HJ1vRV0Z&3iD")
+        paper = Paper(title="Linking test paper", abstract="Abstract", download_link="https://google.com")
+        paper.save()
+        people = []
+        for i in range(3):
+            person = Person(first_name="Linking", last_name="Test{}".format(i))
+            person.save()
+            people.append(person)
+        try:
+            response = self.client.post(
+                "/catalog/paper/{}/connect/selected".format(paper.id),
+                {"link_type": "authors", "ids": [person.id for person in people]},
+            )
+            self.assertEquals(response.status_code, 302)
+            results, meta = db.cypher_query(
+                "MATCH (:Person)-[r:authors]->(p:Paper) WHERE ID(p)={id} RETURN count(r)", dict(id=paper.id)
+            )
+            self.assertEquals(results[0][0], 3)
+        finally:
+            paper.delete()
+            for person in people:
+                person.delete()
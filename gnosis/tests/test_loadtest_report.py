@@ -0,0 +1,91 @@
+import os
+import sys
+from django.test import TestCase
+
+# the loadtest package is in the top directory of the repository, next to gnosis/
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPOSITORY_DIR not in sys.path:
+    sys.path.append(REPOSITORY_DIR)
+
+from loadtest.client import Sample
+from loadtest.report import percentile, summarize, compare, MIN_REQUESTS, MIN_REGRESSION_MS
+
+
+def _samples(url_name, times_ms, errors=0):
+    samples = [Sample(url_name, "GET", 200, time_ms, None) for time_ms in times_ms]
+    samples += [Sample(url_name, "GET", 500, 1.0, "HTTP 500") for _ in range(errors)]
+    return samples
+
+
+def _stats(requests, **percentiles):
+    stats = dict(requests=requests, errors=0, rps=1.0, max=None, p50=None, p95=None, p99=None)
+    stats.update(percentiles)
+    return stats
+
+
+# To run this test, use command: python manage.py test tests.test_loadtest_report
+class LoadTestReportTest(TestCase):
+    """ These tests do not need a running server """
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEquals(percentile(values, 50), 50)
+        self.assertEquals(percentile(values, 95), 95)
+        self.assertEquals(percentile(values, 99), 99)
+        self.assertEquals(percentile(values, 100), 100)
+        # nearest rank, the smallest value with at least pct% of the values at or below it
+        self.assertEquals(percentile([10, 20, 30], 50), 20)
+        self.assertEquals(percentile([10, 20, 30], 95), 30)
+        self.assertEquals(percentile([10, 20, 30], 0), 10)
+        self.assertEquals(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize(self):
+        samples = _samples("home", [float(t) for t in range(100, 0, -1)], errors=2) + _samples("paper_detail", [5.0])
+        summary = summarize(samples, seconds=10.0)
+
+        self.assertEquals(set(summary), {"home", "paper_detail"})
+        # failed requests are counted but their times are not part of the percentiles
+        self.assertEquals(summary["home"]["requests"], 102)
+        self.assertEquals(summary["home"]["errors"], 2)
+        self.assertEquals(summary["home"]["rps"], 10.2)
+        self.assertEquals((summary["home"]["p50"], summary["home"]["p95"], summary["home"]["p99"]), (50.0, 95.0, 99.0))
+        self.assertEquals(summary["home"]["max"], 100.0)
+        self.assertEquals(summary["paper_detail"]["p99"], 5.0)
+
+        # a URL name whose requests all failed has no percentiles
+        summary = summarize(_samples("search", [], errors=3), seconds=0)
+        self.assertEquals(summary["search"]["requests"], 3)
+        self.assertIsNone(summary["search"]["p50"])
+        self.assertIsNone(summary["search"]["max"])
+        self.assertIsNone(summary["search"]["rps"])
+
+    def test_compare(self):
+        baseline = dict(home=_stats(MIN_REQUESTS, p50=100.0, p95=200.0, p99=300.0))
+
+        # within the tolerance
+        summary = dict(home=_stats(MIN_REQUESTS, p50=119.0, p95=200.0, p99=300.0))
+        self.assertEquals(compare(summary, baseline), [])
+
+        # more than 20% slower
+        summary = dict(home=_stats(MIN_REQUESTS, p50=121.0, p95=250.0, p99=300.0))
+        self.assertEquals(compare(summary, baseline), [("home", "p50", 100.0, 121.0), ("home", "p95", 200.0, 250.0)])
+        self.assertEquals(compare(summary, baseline, tolerance=0.5), [])
+
+    def test_compare_thresholds(self):
+        # fast URLs must be MIN_REGRESSION_MS slower, however large the fraction
+        baseline = dict(home=_stats(MIN_REQUESTS, p50=1.0))
+        summary = dict(home=_stats(MIN_REQUESTS, p50=1.0 + MIN_REGRESSION_MS))
+        self.assertEquals(compare(summary, baseline), [])
+        summary = dict(home=_stats(MIN_REQUESTS, p50=1.5 + MIN_REGRESSION_MS))
+        self.assertEquals(compare(summary, baseline), [("home", "p50", 1.0, 1.5 + MIN_REGRESSION_MS)])
+
+        # URL names with too few requests in the run or in the baseline are not compared
+        slow = dict(home=_stats(MIN_REQUESTS, p50=1000.0))
+        self.assertEquals(compare(slow, dict(home=_stats(MIN_REQUESTS - 1, p50=100.0))), [])
+        self.assertEquals(compare(dict(home=_stats(MIN_REQUESTS - 1, p50=1000.0)),
+                                  dict(home=_stats(MIN_REQUESTS, p50=100.0))), [])
+
+        # nor are URL names missing from the baseline or percentiles without a value
+        self.assertEquals(compare(dict(search=_stats(MIN_REQUESTS, p50=1000.0)), baseline), [])
+        self.assertEquals(compare(dict(home=_stats(MIN_REQUESTS)), baseline), [])
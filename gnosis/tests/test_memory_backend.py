@@ -0,0 +1,215 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from catalog.backends import get_backend
+from catalog.counts import count_nodes
+from catalog.linking import link_nodes, paper_triples
+from catalog.models import Paper, Person, Venue, Code
+from catalog.authors import resolve_author
+from catalog.pagination import get_page
+from catalog.queries import get_paper_with_neighbours, select_neighbours, get_papers_page_with_authors_and_venue, \
+    get_recent_papers_with_authors_and_venue, get_node_neighbourhood
+from catalog.search import search_papers, search_people, autocomplete
+import datetime as dt
+
+
+# To run this test, use command: python manage.py test tests.test_memory_backend
+@override_settings(GRAPH_BACKEND="catalog.backends.memory.MemoryBackend")
+class MemoryBackendTest(TestCase):
+    """ These tests do not need a neo4j database """
+
+    def setUp(self):
+        cache.clear()
+        self.backend = get_backend()
+        self.backend.clear()
+
+    def test_nodes(self):
+        paper = self.backend.create(Paper, title="DeepWalk", abstract="Abstract", download_link="https://google.com")
+        self.assertEquals(count_nodes(Paper), 1)
+        self.assertIsNotNone(paper.created)
+
+        node = self.backend.get_node(paper.id, "Paper")
+        self.assertEquals(node.properties["title"], "DeepWalk")
+        self.assertEquals(node.properties["title_key"], "deepwalk")
+        self.assertIsNone(self.backend.get_node(paper.id, "Person"))
+
+        self.backend.update_node(paper.id, dict(title="node2vec", keywords=None))
+        self.assertEquals(Paper.inflate(self.backend.get_node(paper.id)).title, "node2vec")
+
+        self.assertTrue(self.backend.delete_node(paper.id))
+        self.assertFalse(self.backend.delete_node(paper.id))
+        self.assertIsNone(self.backend.get_node(paper.id))
+        self.assertEquals(self.backend.count_nodes("Paper"), 0)
+
+    def test_created(self):
+        # created is the time a node is created, not the time catalog.models was imported
+        paper = self.backend.create(Paper, title="DeepWalk", abstract="Abstract", download_link="https://google.com")
+        later = self.backend.create(Paper, title="node2vec", abstract="Abstract", download_link="https://google.com")
+        self.assertGreater(later.created, paper.created)
+
+    def test_person_keys(self):
+        person = self.backend.create(Person, first_name="Andrés", middle_name="Kumar", last_name="Muñoz-Medina")
+        node = self.backend.get_node(person.id, "Person")
+        self.assertEquals(node.properties["first_name_key"], "andres")
+        self.assertEquals(node.properties["middle_name_key"], "kumar")
+        self.assertEquals(node.properties["last_name_key"], "munoz medina")
+        self.assertEquals(node.properties["block_key"], "munoz medina|a")
+
+    def test_link_nodes(self):
+        paper = self.backend.create(Paper, title="DeepWalk", abstract="Abstract", download_link="https://google.com")
+        cited = [
+            self.backend.create(Paper, title="Paper {}".format(i), abstract="Abstract", download_link="https://google.com")
+            for i in range(30)
+        ]
+        person = self.backend.create(Person, first_name="Bryan", last_name="Perozzi")
+        code = self.backend.create(Code, website="https://github.com/phanein/deepwalk", keywords="K", description="D")
+
+        triples = paper_triples(paper.id, "cites", [p.id for p in cited])
+        triples += [(person.id, "authors", paper.id), (code.id, "implements", paper.id)]
+        # the wrong labels are ignored
+        triples += [(paper.id, "authors", person.id)]
+        linked = link_nodes(triples)
+        self.assertEquals(len(linked), 32)
+        self.assertTrue(all(linked.values()))
+        self.assertFalse(any(link_nodes(triples).values()))
+
+        node, neighbours = self.backend.get_node_with_neighbours(cited[0].id)
+        self.assertEquals([(n.id, r, outgoing) for n, r, outgoing in neighbours], [(paper.id, "cites", False)])
+
+        paper, neighbours = get_paper_with_neighbours(paper.id)
+        self.assertEquals(len(neighbours), 32)
+        self.assertEquals([n.id for n in select_neighbours(neighbours, "Person", outgoing=False)], [person.id])
+        self.assertEquals(len(select_neighbours(neighbours, "Paper", outgoing=True)), 30)
+
+        # deleting a node removes its relationships
+        self.backend.delete_node(person.id)
+        paper, neighbours = get_paper_with_neighbours(paper.id)
+        self.assertEquals(len(neighbours), 31)
+        self.assertEquals(get_paper_with_neighbours(person.id), (None, []))
+
+    def test_search(self):
+        for title in ["DeepWalk: online learning of social representations",
+                      "node2vec: scalable feature learning for networks",
+                      "Learning to learn"]:
+            self.backend.create(Paper, title=title, abstract="About graphs", download_link="https://google.com")
+
+        papers, has_next = search_papers("learning")
+        self.assertEquals(len(papers), 3)
+        self.assertEquals(papers[0].title, "Learning to learn")
+
+        papers, has_next = search_papers("the scal")
+        self.assertEquals([paper.title for paper in papers], ["node2vec: scalable feature learning for networks"])
+
+        papers, has_next = search_papers("graphs", page_size=2)
+        self.assertEquals(len(papers), 2)
+        self.assertTrue(has_next)
+        self.assertEquals(search_papers("graphs", field="title"), ([], False))
+        self.assertEquals(search_papers("the"), ([], False))
+
+    def test_paper_detail(self):
+        paper = self.backend.create(Paper, title="DeepWalk", abstract="Abstract", download_link="https://google.com")
+        person = self.backend.create(Person, first_name="Bryan", last_name="Perozzi")
+        venue = self.backend.create(Venue, name="KDD", publication_date=dt.date(2014, 8, 24), type="C",
+                                    publisher="ACM", keywords="K", peer_reviewed="Y")
+        link_nodes([(person.id, "authors", paper.id), (paper.id, "was_published_at", venue.id)])
+
+        response = self.client.get("/catalog/paper/{}/".format(paper.id))
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.context["authors"], "B. Perozzi")
+        self.assertEquals(response.context["venue"].name, "KDD")
+
+    def _create_papers(self):
+        venue = self.backend.create(Venue, name="KDD", publication_date=dt.date(2014, 8, 24), type="C",
+                                    publisher="ACM", keywords="K", peer_reviewed="Y")
+        people = [self.backend.create(Person, first_name="Bryan", last_name="Perozzi"),
+                  self.backend.create(Person, first_name="Steven", last_name="Skiena")]
+        papers = [
+            self.backend.create(Paper, title="Paper {}".format(i), abstract="Abstract", download_link="https://google.com",
+                                created=dt.datetime(2019, 1, 1 + i))
+            for i in range(5)
+        ]
+        link_nodes([(person.id, "authors", papers[0].id) for person in people] +
+                   [(papers[0].id, "was_published_at", venue.id)])
+        return venue, people, papers
+
+    def test_pages(self):
+        venue, people, papers = self._create_papers()
+
+        page, next_cursor = get_papers_page_with_authors_and_venue(page_size=3)
+        self.assertEquals([paper.title for paper, authors, venue_name in page], ["Paper 4", "Paper 3", "Paper 2"])
+        page, next_cursor = get_papers_page_with_authors_and_venue(next_cursor, page_size=3)
+        self.assertEquals([paper.title for paper, authors, venue_name in page], ["Paper 1", "Paper 0"])
+        self.assertIsNone(next_cursor)
+        self.assertEquals(page[1][1], "B. Perozzi, S. Skiena")
+        self.assertEquals(page[1][2], "KDD, 2014-08-24")
+
+        self.assertEquals([paper.title for paper, authors, venue_name in get_recent_papers_with_authors_and_venue(2)],
+                          ["Paper 4", "Paper 3"])
+        people_page, next_cursor = get_page(Person, page_size=1)
+        self.assertEquals(len(people_page), 1)
+        self.assertIsNotNone(next_cursor)
+
+        for path in ["/home/", "/catalog/papers/", "/catalog/persons/", "/catalog/venues/",
+                     "/catalog/person/{}/".format(people[0].id), "/catalog/venue/{}/".format(venue.id)]:
+            response = self.client.get(path)
+            self.assertEquals(response.status_code, 200, path)
+        self.assertEquals(response.context["papers"][0].title, "Paper 0")
+
+    def test_papers_search(self):
+        self._create_papers()
+        # a search that finds papers shows them, also when it is sent with AJAX
+        for headers in [{}, {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}]:
+            response = self.client.post("/catalog/papers/", dict(paper_title="paper 3"), **headers)
+            self.assertEquals(response.status_code, 200)
+            self.assertTemplateUsed(response, "paper_results.html")
+        # load more still gets the next page of the list
+        response = self.client.get("/catalog/papers/", HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertTemplateUsed(response, "papers_page.html")
+
+    def test_neighbourhood(self):
+        venue, people, papers = self._create_papers()
+
+        nodes, edges, truncated = get_node_neighbourhood(people[0].id, hops=2)
+        self.assertEquals(set(nodes), {people[0].id, people[1].id, papers[0].id, venue.id})
+        self.assertIn((people[1].id, papers[0].id, "authors"), edges)
+        self.assertFalse(truncated)
+
+        nodes, edges, truncated = get_node_neighbourhood(people[0].id, hops=2, limit=2)
+        self.assertEquals(len(nodes), 2)
+        self.assertTrue(truncated)
+        self.assertEquals(get_node_neighbourhood(-1), ({}, [], False))
+
+    def test_search_people(self):
+        venue, people, papers = self._create_papers()
+        self.backend.create(Person, first_name="Perozzi", last_name="Bryanson")
+
+        self.assertEquals([str(person) for person in search_people("perozzi")], ["Bryan Perozzi", "Perozzi Bryanson"])
+        self.assertEquals([str(person) for person in search_people("bryan perozzi", exact_match=True)],
+                          ["Bryan Perozzi"])
+        # misspelled names are found with the person_search index
+        self.assertEquals([str(person) for person in search_people("skeina")], ["Steven Skiena"])
+        self.assertEquals(autocomplete("people", "ski"), [(people[1].id, "Steven Skiena")])
+        self.assertEquals(autocomplete("papers", "paper 3"), [(papers[3].id, "Paper 3")])
+
+    def test_resolve_author(self):
+        venue, people, papers = self._create_papers()
+        namesake = self.backend.create(Person, first_name="Bryan", last_name="Perozzi")
+
+        # two people have the same name but only one has written with Skiena
+        self.assertEquals(resolve_author("Bryan Perozzi"), (None, True))
+        person, ambiguous = resolve_author("B. Perozzi", co_authors=["Steven Skiena"])
+        self.assertEquals(person.id, people[0].id)
+        self.assertNotEquals(person.id, namesake.id)
+
+    def test_build(self):
+        User.objects.create_superuser("build", "build@example.com", "build")
+        self.client.login(username="build", password="build")
+        self.assertEquals(self.client.get("/catalog/build").status_code, 405)
+
+        # building twice adds new nodes rather than the same ones again
+        self.assertEquals(self.client.post("/catalog/build").status_code, 200)
+        num_papers = count_nodes(Paper)
+        self.assertEquals(self.client.post("/catalog/build").status_code, 200)
+        self.assertEquals(count_nodes(Paper), 2 * num_papers)
+        uids = [self.backend.get_node(node_id).properties["uid"] for node_id in self.backend.node_ids("Paper")]
+        self.assertEquals(len(set(uids)), 2 * num_papers)
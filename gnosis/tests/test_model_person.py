@@ -139,3 +139,27 @@ class PersonModelTest(TestCase):
         people = Person.nodes.filter(first_name="first")
         self.assertEquals(len(people), 0)
 
+
+    def test_name_keys_on_save(self):
+        """ For this test, a neo4j database must be running """
+        person = Person(first_name="Andrés", middle_name="Kumar", last_name="Muñoz-Medina")
+
+        # This will create an entry in the db and set the name keys.
+        person.save()
+
+        person = Person.nodes.get(uid=person.uid)
+        self.assertEquals(person.first_name_key, "andres")
+        self.assertEquals(person.middle_name_key, "kumar")
+        self.assertEquals(person.last_name_key, "munoz medina")
+        self.assertEquals(person.name_key, "munoz medina|andres|kumar")
+        self.assertEquals(person.block_key, "munoz medina|a")
+
+        # The keys follow the name when it is changed.
+        person.first_name = "Anna"
+        person.save()
+
+        person = Person.nodes.get(uid=person.uid)
+        self.assertEquals(person.first_name_key, "anna")
+        self.assertEquals(person.block_key, "munoz medina|a")
+
+        person.delete()
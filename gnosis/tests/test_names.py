@@ -0,0 +1,92 @@
+from django.test import TestCase
+from neomodel import db
+from catalog.models import Paper, Person
+from catalog.names import fold, middle_names, name_key, block_key, names_compatible, person_keys, \
+    title_key, split_name
+from catalog.authors import resolve_author
+from catalog.search import search_people
+
+
+# To run this test, use command: python manage.py test tests.test_names
+class NamesTest(TestCase):
+    def test_fold(self):
+        self.assertEquals(fold("Andrés Muñoz-Medina"), "andres munoz medina")
+        self.assertEquals(fold(None), "")
+
+    def test_keys(self):
+        self.assertEquals(middle_names("['Muñoz']"), ["Muñoz"])
+        self.assertEquals(middle_names("K. L."), ["K.", "L."])
+        self.assertEquals(name_key("Andrés", "['Muñoz']", "Medina"), "medina|andres|munoz")
+        self.assertEquals(name_key("ANDRES", ["Munoz"], "Medina"), "medina|andres|munoz")
+        self.assertEquals(block_key("Andrés", "Medina"), "medina|a")
+
+    def test_split_name(self):
+        self.assertEquals(split_name("Aditya Kumar Grover"), ("Aditya", ["Kumar"], "Grover"))
+        self.assertEquals(split_name(" Grover "), ("Grover", None, "Grover"))
+        with self.assertRaises(ValueError):
+            split_name("  ")
+
+    def test_person_keys(self):
+        keys = person_keys("José", None, "O'Brien")
+        self.assertEquals(keys["first_name_key"], "jose")
+        self.assertEquals(keys["middle_name_key"], None)
+        self.assertEquals(keys["last_name_key"], "o brien")
+
+    def test_title_key(self):
+        self.assertEquals(title_key("node2vec: Scalable Feature Learning for Networks"),
+                          "node2vec scalable feature learning for networks")
+        self.assertEquals(title_key("NODE2VEC - scalable feature learning for networks."),
+                          "node2vec scalable feature learning for networks")
+        self.assertEquals(title_key(""), None)
+
+    def test_names_compatible(self):
+        self.assertTrue(names_compatible(("A.", None, "Grover"), ("Aditya", None, "Grover")))
+        self.assertTrue(names_compatible(("Aditya", None, "Grover"), ("Aditya", "['K.']", "Grover")))
+        self.assertFalse(names_compatible(("Anna", None, "Grover"), ("Aditya", None, "Grover")))
+        self.assertFalse(names_compatible(("Aditya", ["Kumar"], "Grover"), ("Aditya", ["Lal"], "Grover")))
+
+    def test_resolve_author(self):
+        """ For this test, a neo4j database must be running """
+        people = []
+        try:
+            # two people with the same name, only the second has written with Jure Namestest
+            for first_name, last_name in [("Ada", "Namestest"), ("Ada", "Namestest"), ("Jure", "Namestest")]:
+                person = Person(first_name=first_name, last_name=last_name)
+                person.save()
+                people.append(person)
+            paper = Paper(title="Names test paper", abstract="Abstract", download_link="https://google.com")
+            paper.save()
+            people[1].authors.connect(paper)
+            people[2].authors.connect(paper)
+
+            self.assertEquals(people[0].name_key, "namestest|ada|")
+            self.assertEquals(resolve_author("Ada Namestest"), (None, True))
+            person, ambiguous = resolve_author("Ada Namestest", ["Ada Namestest", "Jure Namestest"])
+            self.assertEquals(person.id, people[1].id)
+            person, ambiguous = resolve_author("A. Namestest", ["Jure Namestest"])
+            self.assertEquals(person.id, people[1].id)
+            self.assertEquals(resolve_author("Jure Namestest")[0].id, people[2].id)
+            self.assertEquals(resolve_author("Anna Namestest"), (None, False))
+        finally:
+            db.cypher_query("MATCH (p:Paper {title: 'Names test paper'}) DETACH DELETE p")
+            db.cypher_query("MATCH (a:Person {last_name: 'Namestest'}) DETACH DELETE a")
+
+    def test_search_people(self):
+        """ For this test, a neo4j database must be running """
+        try:
+            for first_name, middle_name, last_name in [
+                ("Zoë", None, "Searchtest"), ("Searchtestzoe", None, "Smith"), ("Zoe", "Searchtest", "Jones")
+            ]:
+                Person(first_name=first_name, middle_name=middle_name, last_name=last_name).save()
+
+            # whole last names rank above first and middle names, then prefixes
+            people = search_people("ZOE SEARCHTEST")
+            self.assertEquals(
+                [str(person) for person in people], ["Zoë Searchtest", "Zoe Searchtest Jones", "Searchtestzoe Smith"]
+            )
+            self.assertEquals([str(person) for person in search_people("zoe searchtest", exact_match=True)],
+                              ["Zoë Searchtest"])
+            self.assertEquals([str(person) for person in search_people("searchtestz")], ["Searchtestzoe Smith"])
+        finally:
+            db.cypher_query("MATCH (a:Person) WHERE a.last_name = 'Searchtest' OR a.first_name = 'Searchtestzoe' "
+                            "OR a.middle_name = 'Searchtest' DETACH DELETE a")
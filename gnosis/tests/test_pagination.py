@@ -0,0 +1,40 @@
+from collections import namedtuple
+from django.test import TestCase
+from catalog.pagination import encode_cursor, decode_cursor, keyset_query, split_page
+
+
+# stands in for the raw nodes returned by db.cypher_query
+Node = namedtuple("Node", ["id", "properties"])
+
+
+class PaginationTest(TestCase):
+    def test_cursor_round_trip(self):
+        node = Node(id=42, properties={"created": 1546300800.123456})
+        self.assertEqual(decode_cursor(encode_cursor(node)), (1546300800.123456, 42))
+
+    def test_invalid_cursor_is_first_page(self):
+        self.assertIsNone(decode_cursor(None))
+        self.assertIsNone(decode_cursor(""))
+        self.assertIsNone(decode_cursor("not a cursor"))
+        self.assertIsNone(decode_cursor("1.5_abc"))
+
+    def test_keyset_query_seeks_past_cursor(self):
+        query, params = keyset_query("Paper", "p", None, 10)
+        self.assertNotIn("cursor_created", query)
+        self.assertNotIn("SKIP", query)
+        self.assertEqual(params, dict(page_limit=11))
+
+        query, params = keyset_query("Paper", "p", "1.5_7", 10)
+        self.assertIn("p.created < {cursor_created} OR ID(p) < {cursor_id}", query)
+        self.assertEqual(params, dict(page_limit=11, cursor_created=1.5, cursor_id=7))
+
+    def test_split_page(self):
+        rows = [[Node(id=i, properties={"created": 10.0 - i})] for i in range(4)]
+
+        page, next_cursor = split_page(rows, 3)
+        self.assertEqual(len(page), 3)
+        self.assertEqual(next_cursor, "8.0_2")
+
+        page, next_cursor = split_page(rows, 4)
+        self.assertEqual(len(page), 4)
+        self.assertIsNone(next_cursor)
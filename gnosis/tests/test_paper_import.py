@@ -3,9 +3,25 @@ from django.contrib.auth.models import User
 from catalog.views.views import(
     _find_paper,
     paper_create_from_url,
+    paper_import_status,
 )
+from catalog.importers import jobs as import_jobs
 from neomodel.exceptions import RequiredProperty
 from django.http import HttpRequest
+from django.urls import resolve
+
+
+def import_paper(request):
+    """
+    Submits the import of the paper at request.POST["url"], waits for the import job
+    and returns the response of its status page.
+    """
+    response = paper_create_from_url(request)
+    if 'location' not in response._headers:  # the url was rejected before submitting a job
+        return response
+    job_id = resolve(response["location"]).kwargs["job_id"]
+    import_jobs.wait(job_id, timeout=import_jobs.IMPORT_JOB_TIMEOUT)
+    return paper_import_status(request, job_id)
 
 
 # Create your tests here.
@@ -28,7 +44,7 @@ class PaperImport(TestCase):
 
         # test for arxiv url
         request.POST["url"] = "https://arxiv.org/abs/1607.00653"
-        re = paper_create_from_url(request)
+        re = import_paper(request)
         self.assertTrue('location' in re._headers)      # check if it redirects to the paper create page
 
         # test whether specific entries are accurate
@@ -43,7 +59,7 @@ class PaperImport(TestCase):
         request.POST["url"] = "papers.nips.cc/paper/7286-efficient-algorithms-for-" \
                               "non-convex-isotonic-regression-through-submodular-optimization"
 
-        re = paper_create_from_url(request)
+        re = import_paper(request)
         self.assertTrue('location' in re._headers)     # check if it redirects to the paper create page
 
         # test whether specific entries are accurate
@@ -60,7 +76,7 @@ class PaperImport(TestCase):
         # test for JMLR url
         request.POST["url"] = "http://www.jmlr.org/papers/v20/15-192.html"
 
-        re = paper_create_from_url(request)
+        re = import_paper(request)
         self.assertTrue('location' in re._headers)  # check if it redirects to the paper create page
 
         # test whether specific entries are accurate
@@ -83,7 +99,7 @@ class PaperImport(TestCase):
         # test unsupported url
         url = "www.google.com"
         request.POST["url"] = url
-        re = paper_create_from_url(request)
+        re = import_paper(request)
         # check that it does not redirect to the paper create page
         self.assertFalse('location' in re._headers)
 
@@ -129,7 +145,7 @@ class PaperImport(TestCase):
             ]
         for url in invalid_urls:
             request.POST["url"] = url
-            re = paper_create_from_url(request)
+            re = import_paper(request)
             # check that it does not redirect to the paper create page
             self.assertFalse('location' in re._headers)
 
@@ -168,5 +184,5 @@ class PaperImport(TestCase):
             ]
         for url in valid_urls:
             request.POST["url"] = url
-            paper_create_from_url(request)
+            import_paper(request)
             self.assertEquals(request.session["from_external"], True)
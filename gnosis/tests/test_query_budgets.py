@@ -0,0 +1,72 @@
+import datetime as dt
+from django.core.cache import cache
+from django.test import TestCase
+from neomodel import db
+from catalog.models import Paper, Person, Venue
+from tests.cypher_queries import CypherQueriesMixin
+
+
+# The number of papers, authors, etc. created for each test. A view that sends a query
+# per row sends more queries than its budget.
+NUM_ROWS = 5
+
+
+# To run this test, use command: python manage.py test tests.test_query_budgets
+class QueryBudgetTest(CypherQueriesMixin, TestCase):
+    """ For these tests, a neo4j database must be running """
+
+    def setUp(self):
+        # the node counts are cached so they are only queried if the cache is empty
+        cache.clear()
+        self.venue = Venue(name="Budget test venue", publication_date=dt.date(2018, 12, 1), type="J",
+                           publisher="Budget test", keywords="K", peer_reviewed="N")
+        self.venue.save()
+        self.people = []
+        for i in range(NUM_ROWS):
+            person = Person(first_name="Budget", last_name="Test{}".format(i))
+            person.save()
+            self.people.append(person)
+        self.papers = []
+        for i in range(NUM_ROWS):
+            paper = Paper(title="Budget test paper {}".format(i), abstract="Abstract",
+                          download_link="https://google.com")
+            paper.save()
+            paper.was_published_at.connect(self.venue)
+            for person in self.people:
+                person.authors.connect(paper)
+            self.papers.append(paper)
+
+    def tearDown(self):
+        db.cypher_query("MATCH (p:Paper) WHERE p.title STARTS WITH 'Budget test' DETACH DELETE p")
+        db.cypher_query("MATCH (a:Person {first_name: 'Budget'}) DETACH DELETE a")
+        db.cypher_query("MATCH (v:Venue {publisher: 'Budget test'}) DETACH DELETE v")
+
+    def test_papers(self):
+        # a page of papers with their authors and venues, and the number of papers
+        with self.assertMaxCypherQueries(2):
+            response = self.client.get("/catalog/papers/")
+        self.assertEquals(response.status_code, 200)
+
+    def test_paper_detail(self):
+        # the paper with all its neighbours
+        with self.assertMaxCypherQueries(1):
+            response = self.client.get("/catalog/paper/{}/".format(self.papers[0].id))
+        self.assertEquals(response.status_code, 200)
+
+    def test_person_detail(self):
+        # the person with their papers
+        with self.assertMaxCypherQueries(1):
+            response = self.client.get("/catalog/person/{}/".format(self.people[0].id))
+        self.assertEquals(response.status_code, 200)
+
+    def test_venue_detail(self):
+        # the venue with its papers
+        with self.assertMaxCypherQueries(1):
+            response = self.client.get("/catalog/venue/{}/".format(self.venue.id))
+        self.assertEquals(response.status_code, 200)
+
+    def test_home(self):
+        # the numbers of papers and people, and the latest papers with their authors and venues
+        with self.assertMaxCypherQueries(3):
+            response = self.client.get("/home/")
+        self.assertEquals(response.status_code, 200)
@@ -0,0 +1,60 @@
+import json
+import os
+from django.test import TestCase
+from catalog.importers.scrapers import parse_paper_page
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "scrapers")
+
+
+def load_cases():
+    with open(os.path.join(FIXTURES_DIR, "cases.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+# To run this test, use command: python manage.py test tests.test_scraper_fixtures
+class ScraperFixturesTest(TestCase):
+    """
+    Parses the saved publisher pages in tests/fixtures/scrapers and compares the result with
+    cases.json. It does not need Neo4j or a network connection.
+    """
+
+    def test_saved_pages(self):
+        for case in load_cases():
+            with self.subTest(file=case["file"]):
+                title, authors, abstract, download_link = parse_paper_page(
+                    read_fixture(case["file"]), case["url"], case["source_website"]
+                )
+                if not case.get("valid", True):
+                    self.assertIsNone(title)
+                    self.assertIsNone(authors)
+                    self.assertIsNone(abstract)
+                    continue
+                expected = case["expected"]
+                self.assertEquals(title, expected["title"])
+                self.assertEquals(authors, expected["authors"])
+                self.assertEquals(abstract, expected["abstract"])
+                self.assertEquals(download_link, expected["download_link"])
+
+    def test_every_source_is_covered(self):
+        sources = {case["source_website"] for case in load_cases() if case.get("valid", True)}
+        self.assertEquals(sources, {"arxiv", "nips", "jmlr", "ieee", "acm"})
+
+    def test_ieee_abstract_with_quotes(self):
+        # the metadata is parsed as JSON so escaped quotes do not end the abstract early
+        page = """<html><head><title>A Paper - IEEE Journals &amp; Magazine</title></head><body><script>
+        xplGlobal.document.metadata={"authors":[{"name":"Ada Lovelace"}],"sections":{"abstract":"true"},
+        "title":"A Paper","abstract":"We call it \\"graph\\",\\"net\\".","pdfUrl":"/stamp/stamp.jsp?arnumber=1",
+        "xploreDocumentType":"Journals & Magazine"};</script></body></html>"""
+        title, authors, abstract, download_link = parse_paper_page(
+            page, "https://ieeexplore.ieee.org/document/1", "ieee"
+        )
+        self.assertEquals(title, "A Paper")
+        self.assertEquals(authors, "Ada Lovelace")
+        self.assertEquals(abstract, 'We call it "graph","net".')
+        self.assertEquals(download_link, "https://ieeexplore.ieee.org/stamp/stamp.jsp?arnumber=1")
@@ -0,0 +1,70 @@
+from django.test import TestCase
+from catalog.importers.adapters import SourceAdapter, ArxivAdapter, get_adapter, read_citation_meta
+from catalog.importers.scrapers import get_source_website, parse_paper_page
+
+
+class ExampleAdapter(SourceAdapter):
+    name = "example"
+    url_prefixes = ("https://papers.example.org/",)
+
+    def get_title(self, bs4obj):
+        return bs4obj.find("h1").get_text()
+
+    def get_authors(self, bs4obj):
+        return bs4obj.find("p").get_text()
+
+    def get_abstract(self, bs4obj):
+        return bs4obj.find("blockquote").get_text()
+
+
+class TreeCountingArxivAdapter(ArxivAdapter):
+    trees = 0
+
+    def parse_tree(self, bs4obj, url):
+        TreeCountingArxivAdapter.trees += 1
+        return super().parse_tree(bs4obj, url)
+
+
+META_PAGE = """<html><head>
+<meta name="citation_title" content="A Paper">
+<meta name="citation_author" content="Lovelace, Ada">
+<meta name="citation_author" content="Babbage, Charles">
+<meta name="citation_abstract" content="We describe
+an engine.">
+<meta name="citation_pdf_url" content="https://arxiv.org/pdf/1234.5678">
+</head><body><h1 class="title">Title:Another Title</h1></body></html>"""
+
+
+# To run this test, use command: python manage.py test tests.test_source_adapters
+class SourceAdaptersTest(TestCase):
+
+    def test_adapters_from_settings(self):
+        with self.settings(PAPER_SOURCE_ADAPTERS=["tests.test_source_adapters.ExampleAdapter"]):
+            self.assertEquals(
+                get_source_website("papers.example.org/1"), ("https://papers.example.org/1", "example")
+            )
+            self.assertEquals(get_source_website("https://arxiv.org/abs/1607.00653")[1], None)
+            paper = parse_paper_page(
+                "<h1>A Paper</h1><p>Ada Lovelace</p><blockquote> An engine.\n</blockquote>",
+                "https://papers.example.org/1",
+                "example",
+            )
+            self.assertEquals(paper, ("A Paper", "Ada Lovelace", "An engine.", "https://papers.example.org/1"))
+
+        self.assertEquals(get_source_website("http://www.jmlr.org/papers/v20/15-192.html"),
+                          ("http://www.jmlr.org/papers/v20/15-192.html", "jmlr"))
+        self.assertEquals(get_adapter("example"), None)
+
+    def test_citation_meta(self):
+        meta = read_citation_meta(META_PAGE)
+        self.assertEquals(meta["citation_author"], ["Lovelace, Ada", "Babbage, Charles"])
+
+        adapters = ["tests.test_source_adapters.TreeCountingArxivAdapter"]
+        with self.settings(PAPER_SOURCE_ADAPTERS=adapters):
+            paper = parse_paper_page(META_PAGE.encode("utf-8"), "https://arxiv.org/abs/1234.5678", "arxiv")
+        # everything is in the meta tags so the page is not parsed into a tree
+        self.assertEquals(TreeCountingArxivAdapter.trees, 0)
+        self.assertEquals(
+            paper,
+            ("A Paper", "Ada Lovelace,Charles Babbage", "We describe an engine.", "https://arxiv.org/pdf/1234.5678"),
+        )
@@ -0,0 +1,61 @@
+from collections import Counter
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from catalog.backends import get_backend
+from catalog.counts import count_nodes
+from catalog.models import Paper, Person, Venue
+from catalog.queries import get_paper_with_neighbours, select_neighbours
+from catalog.synthetic import generate_catalog, MAX_AUTHORS
+
+
+# To run this test, use command: python manage.py test tests.test_synthetic_catalog
+@override_settings(GRAPH_BACKEND="catalog.backends.memory.MemoryBackend")
+class SyntheticCatalogTest(TestCase):
+    """ These tests do not need a neo4j database """
+
+    def setUp(self):
+        cache.clear()
+        self.backend = get_backend()
+        self.backend.clear()
+
+    def _papers(self):
+        return [self.backend.get_node_with_neighbours(node_id) for node_id in self.backend.node_ids("Paper")]
+
+    def test_generate_catalog(self):
+        summary = generate_catalog(2000, seed=1, batch_size=500)
+        self.assertEquals(summary["Paper"], 2000)
+        self.assertEquals(count_nodes(Paper), 2000)
+        self.assertEquals(count_nodes(Person), summary["Person"])
+        self.assertEquals(count_nodes(Venue), summary["Venue"])
+
+        citations = Counter()
+        for node, neighbours in self._papers():
+            paper = Paper.inflate(node)
+            self.assertTrue(paper.title)
+            authors = [n for n, relationship, outgoing in neighbours if relationship == "authors"]
+            self.assertTrue(1 <= len(authors) <= MAX_AUTHORS)
+            citations[paper.id] = len([1 for n, relationship, outgoing in neighbours
+                                       if relationship == "cites" and not outgoing])
+
+        # a few papers are cited far more often than the average paper
+        mean = sum(citations.values()) / len(citations)
+        self.assertTrue(max(citations.values()) > 10 * mean)
+
+        paper, neighbours = get_paper_with_neighbours(self.backend.node_ids("Paper")[-1])
+        self.assertTrue(all(Person.inflate(node).first_name for node in select_neighbours(neighbours, "Person", False)))
+
+    def test_same_seed_same_catalog(self):
+        def titles_and_degrees():
+            return [
+                (node.properties["title"], node.properties["uid"], len(neighbours))
+                for node, neighbours in self._papers()
+            ]
+
+        generate_catalog(500, seed=7)
+        first = titles_and_degrees()
+        self.backend.clear()
+        generate_catalog(500, seed=7)
+        self.assertEquals(titles_and_degrees(), first)
+        self.backend.clear()
+        generate_catalog(500, seed=8)
+        self.assertNotEqual(titles_and_degrees(), first)
@@ -82,4 +82,4 @@ class CodeViewTest(TestCase):
         self.assertEquals(response.status_code, 200)
         self.assertTrue(request.session["last-viewed-code"] == 1)
         response = code_detail(request, -1)
-        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.status_code, 302)  # redirected to the index
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.test import TestCase, override_settings
+from catalog import metrics
+from catalog.views.not_found import detail_not_found, NOT_FOUND_LIMIT
+
+
+# To run this test, use command: python manage.py test tests.test_view_not_found
+class NotFoundViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_redirects_to_index(self):
+        misses = metrics.get_counter("detail_not_found.Paper")
+        request = HttpRequest()
+        request.META["REMOTE_ADDR"] = "10.0.0.1"
+        response = detail_not_found(request, "Paper", "papers_index")
+        self.assertEquals(response.status_code, 302)
+        self.assertEquals(response["Location"], "/catalog/papers/")
+        self.assertEquals(metrics.get_counter("detail_not_found.Paper"), misses + 1)
+
+    def test_rate_limit(self):
+        request = HttpRequest()
+        request.META["REMOTE_ADDR"] = "10.0.0.2"
+        for i in range(NOT_FOUND_LIMIT):
+            response = detail_not_found(request, "Venue", "venues_index")
+            self.assertEquals(response.status_code, 302)
+        response = detail_not_found(request, "Venue", "venues_index")
+        self.assertEquals(response.status_code, 429)
+
+        # other clients are not affected
+        request = HttpRequest()
+        request.META["REMOTE_ADDR"] = "10.0.0.3"
+        response = detail_not_found(request, "Venue", "venues_index")
+        self.assertEquals(response.status_code, 302)
+
+    @override_settings(NUM_PROXIES=1)
+    def test_rate_limit_behind_proxy(self):
+        # the proxy is the client of every request, the X-Forwarded-For address it adds tells
+        # the clients apart and the addresses set by the clients themselves are ignored
+        for i in range(NOT_FOUND_LIMIT + 1):
+            request = HttpRequest()
+            request.META["REMOTE_ADDR"] = "127.0.0.1"
+            request.META["HTTP_X_FORWARDED_FOR"] = "10.0.{}.4, 10.0.0.4".format(i)
+            response = detail_not_found(request, "Venue", "venues_index")
+        self.assertEquals(response.status_code, 429)
+
+        request = HttpRequest()
+        request.META["REMOTE_ADDR"] = "127.0.0.1"
+        request.META["HTTP_X_FORWARDED_FOR"] = "10.0.0.5"
+        response = detail_not_found(request, "Venue", "venues_index")
+        self.assertEquals(response.status_code, 302)
@@ -55,7 +55,7 @@ class PersonViewTest(TestCase):
         self.assertEquals(response.status_code, 200)  # test if response is correct
         self.assertEquals(request.session["last-viewed-person"], 1)
         response = person_detail(request, -1)
-        self.assertEquals(response.status_code, 200)  # test if response is correct
+        self.assertEquals(response.status_code, 302)  # redirected to the index
 
     def test_persons(self):
         request = HttpRequest()
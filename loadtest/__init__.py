@@ -0,0 +1,14 @@
+"""
+Load testing Gnosis with scripted user journeys.
+
+Virtual users, each in its own thread with its own session, repeat the journeys in
+loadtest/journeys.py against a running server, e.g., from the home page to a search, a
+paper, one of its authors, and, for logged in users, connecting the author and adding
+the paper to a collection. The time of every request is recorded by the name of its URL
+in catalog/urls.py and the p50, p95 and p99 latencies of every URL name are compared
+with a baseline saved by an earlier run.
+
+Only the standard library is used for the requests. Django is set up with the project's
+settings, without starting a server, so that URLs are built and named by reverse and
+resolve. See the Load testing section of README.md for how to run it.
+"""
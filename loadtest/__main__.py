@@ -0,0 +1,151 @@
+"""
+Runs the load test against a running server, e.g., from the top directory of the repository,
+
+    python -m loadtest --users 20 --duration 60 --username loadtest --password ...
+
+prints the latencies of every URL name and compares them with the baseline. The exit
+status is 1 if a percentile is slower than the baseline allows or too many requests failed.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from loadtest.client import Client, setup_django
+from loadtest import report
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Load test Gnosis with scripted user journeys.")
+    parser.add_argument("--host", default="http://127.0.0.1:8000", help="The server to test.")
+    parser.add_argument("--users", type=int, default=10, help="The number of virtual users.")
+    parser.add_argument("--duration", type=float, default=60, help="How many seconds to run for.")
+    parser.add_argument("--curators", type=float, default=0.2,
+                        help="The fraction of the users that log in, connect authors and add papers to a collection.")
+    parser.add_argument("--username", default=os.environ.get("LOADTEST_USERNAME"), help="The user that curators log in as.")
+    parser.add_argument("--password", default=os.environ.get("LOADTEST_PASSWORD"))
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="The most seconds a user waits between journeys, chosen at random.")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the choices of the users.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="The baseline to compare with.")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the baseline.")
+    parser.add_argument("--tolerance", type=float, default=report.TOLERANCE,
+                        help="How much slower, as a fraction of the baseline, a percentile can be.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="The fraction of requests that can fail.")
+
+    return parser.parse_args(argv)
+
+
+def _user(index, name, args, samples, end, failures, lock):
+    from loadtest.journeys import JOURNEYS, JourneyError, login
+
+    rng = random.Random("{}-{}".format(args.seed, index))
+    client = Client(args.host, samples)
+    # users do not all start at the same moment
+    time.sleep(rng.uniform(0, args.think))
+    try:
+        if name == "curator":
+            login(client, args.username, args.password)
+        while time.monotonic() < end:
+            try:
+                JOURNEYS[name](client, rng)
+            except JourneyError as e:
+                with lock:
+                    failures[str(e)] += 1
+            time.sleep(rng.uniform(0, args.think))
+    except JourneyError as e:
+        with lock:
+            failures[str(e)] += 1
+
+
+def run(args):
+    """
+    Runs the users for args.duration seconds.
+    :return: <tuple> (samples, seconds, failures) where failures counts the journeys that
+    stopped with a JourneyError by message.
+    """
+    from loadtest.journeys import ensure_collection, login
+
+    num_curators = int(round(args.users * args.curators))
+    if num_curators > 0:
+        if not args.username or not args.password:
+            sys.exit("Curators log in, set --username and --password or use --curators 0")
+        # the requests made to prepare the run are not part of the results
+        client = Client(args.host, [])
+        login(client, args.username, args.password)
+        ensure_collection(client)
+
+    samples = []
+    failures = Counter()
+    lock = threading.Lock()
+    start = time.monotonic()
+    end = start + args.duration
+    threads = []
+    for index in range(args.users):
+        name = "curator" if index < num_curators else "reader"
+        thread = threading.Thread(target=_user, args=(index, name, args, samples, end, failures, lock), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+    return samples, time.monotonic() - start, failures
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    setup_django()
+
+    from django.urls import reverse
+    probe = Client(args.host, [])
+    if probe.get(reverse("home")).status is None:
+        sys.exit("Cannot reach {}, is the server running?".format(args.host))
+
+    print("Running {} users against {} for {} seconds".format(args.users, args.host, args.duration))
+    samples, seconds, failures = run(args)
+    if len(samples) == 0:
+        sys.exit("No requests were made")
+
+    summary = report.summarize(samples, seconds)
+    baseline = None if args.save_baseline else report.load_baseline(args.baseline)
+    errors = sum(1 for sample in samples if sample.error is not None)
+
+    print()
+    print(report.format_summary(summary, baseline))
+    print()
+    print("{} requests in {:.1f} seconds, {:.1f} requests per second, {} errors".format(
+        len(samples), seconds, len(samples) / seconds, errors))
+    for message, count in failures.most_common():
+        print("{} journeys failed: {}".format(count, message))
+
+    status = 0
+    if errors > args.max_error_rate * len(samples):
+        print("Too many requests failed")
+        status = 1
+
+    if args.save_baseline:
+        settings = dict(users=args.users, duration=args.duration, curators=args.curators, think=args.think,
+                        seed=args.seed)
+        report.save_baseline(args.baseline, summary, settings)
+        print("Saved the baseline in {}".format(args.baseline))
+    elif baseline is None:
+        print("No baseline in {}, save one with --save-baseline".format(args.baseline))
+    else:
+        regressions = report.compare(summary, baseline, tolerance=args.tolerance)
+        for name, key, base, value in regressions:
+            print("{} {} is {} ms, the baseline is {} ms".format(name, key, value, base))
+        if len(regressions) > 0:
+            status = 1
+        else:
+            print("No regressions against the baseline")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
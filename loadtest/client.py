@@ -0,0 +1,171 @@
+"""
+An HTTP client for one virtual user that records the time of every request.
+
+Every client keeps its own cookies, and therefore its own session and CSRF token, like
+a browser. Redirects are followed as separate requests so that, e.g., the redirect of
+paper_connect_author_selected to paper_detail is timed as two requests of two URL names.
+"""
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin, urlsplit
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+
+GNOSIS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gnosis")
+
+# A request that takes longer than this many seconds fails
+TIMEOUT = 30
+# At most this many redirects are followed for one request
+MAX_REDIRECTS = 5
+
+Response = namedtuple("Response", ["url_name", "status", "path", "body"])
+Sample = namedtuple("Sample", ["url_name", "method", "status", "time_ms", "error"])
+
+_HREF = re.compile(r"""href=["']?([^"'\s>]+)""")
+
+
+def setup_django():
+    """
+    Sets up Django with the project's settings so that reverse and resolve use the URLs
+    in gnosis/urls.py and catalog/urls.py. No server is started and no database is used.
+    """
+    if GNOSIS_DIR not in sys.path:
+        sys.path.insert(0, GNOSIS_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "gnosis.settings")
+
+    import django
+    django.setup()
+
+
+def url_name(path):
+    """
+    :param path: <str> The path of a URL, with or without a query string.
+    :return: <tuple> (url_name, kwargs) of the view for the path, or (None, {}) if no URL
+    matches it, e.g., a static file.
+    """
+    from django.urls import resolve, Resolver404
+
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return None, {}
+
+    return match.url_name, match.kwargs
+
+
+def links(body, name):
+    """
+    :param body: <str> An HTML page.
+    :param name: <str> A URL name, e.g., paper_detail.
+    :return: <list> (path, kwargs) for every distinct link in the page to a URL with the
+    name, in the order they appear.
+    """
+    found = []
+    seen = set()
+    for path in _HREF.findall(body):
+        if path in seen or not path.startswith("/"):
+            continue
+        seen.add(path)
+        link_name, kwargs = url_name(path)
+        if link_name == name:
+            found.append((path, kwargs))
+
+    return found
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    # redirects raise HTTPError so that Client follows and times them one at a time
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Client:
+    """
+    The HTTP client of one virtual user.
+    """
+
+    def __init__(self, host, samples):
+        """
+        :param host: <str> The server, e.g., http://127.0.0.1:8000
+        :param samples: <list> Every request is appended to it as a Sample. Appending to a
+        list is atomic so clients in different threads can share one list.
+        """
+        self.host = host.rstrip("/")
+        self.samples = samples
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return None
+
+    def get(self, path, follow=True):
+        return self.request("GET", path, follow=follow)
+
+    def post(self, path, data, follow=True):
+        return self.request("POST", path, data=data, follow=follow)
+
+    def request(self, method, path, data=None, follow=True):
+        """
+        Sends a request, records its time by the URL name of its path and follows any
+        redirect with a GET request.
+        :param method: <str> GET or POST.
+        :param path: <str> The path of the URL, e.g., /catalog/paper/12/
+        :param data: <dict> The form data of a POST request. The CSRF token of the
+        session is added to it.
+        :param follow: <bool> If True, redirects are followed.
+        :return: <Response> The response of the last request. The status is None if the
+        server could not be reached.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response, location = self._send(method, path, data)
+            if location is None or not follow:
+                return response
+            url = urlsplit(urljoin(self.host + path, location))
+            method, path, data = "GET", url.path + ("?" + url.query if url.query else ""), None
+
+        return response
+
+    def _send(self, method, path, data):
+        url = self.host + path
+        headers = {"Referer": url}
+        body = None
+        if method == "POST":
+            data = dict(data or {})
+            token = self.csrf_token()
+            if token is not None:
+                data.setdefault("csrfmiddlewaretoken", token)
+            body = urlencode(data).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        name = url_name(path)[0] or "unknown"
+        if method == "POST":
+            name = "{} POST".format(name)
+
+        status, text, location, error = None, "", None, None
+        start = time.perf_counter()
+        try:
+            with self.opener.open(Request(url, data=body, headers=headers, method=method), timeout=TIMEOUT) as response:
+                status = response.status
+                text = response.read().decode("utf-8", errors="replace")
+        except HTTPError as e:
+            status = e.code
+            text = e.read().decode("utf-8", errors="replace")
+            if status in (301, 302, 303, 307, 308):
+                location = e.headers.get("Location")
+            else:
+                error = "HTTP {}".format(status)
+        except (URLError, OSError) as e:
+            error = str(getattr(e, "reason", e))
+        time_ms = (time.perf_counter() - start) * 1000
+
+        self.samples.append(Sample(name, method, status, time_ms, error))
+
+        return Response(name, status, path, text), location
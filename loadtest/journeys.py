@@ -0,0 +1,131 @@
+"""
+The user journeys of the load test.
+
+A journey is a function journey(client, rng) that makes the requests of one visit to the
+site with the Client of a virtual user and a random.Random for its choices. It follows
+the links in the pages it gets, like a user would, so it works with any catalog, e.g.,
+one made by python manage.py generate_catalog. It raises JourneyError if a page it
+needs is missing, e.g., the home page lists no papers.
+
+The curator journey writes to the catalog. It only links authors that are linked already
+and adds papers to the collection of the load test user, but it should still be run
+against a catalog that can be thrown away.
+"""
+import html
+import json
+import re
+from django.urls import reverse
+from loadtest.client import links
+
+
+# The name of the collection that the curator journey adds papers to
+COLLECTION_NAME = "Load test"
+# At most this many words of a paper title are searched for
+SEARCH_WORDS = 2
+
+_ANCHOR = re.compile(r"""<a href=["']?([^"'\s>]+)["']?>([^<]+)</a>""")
+
+
+class JourneyError(Exception):
+    pass
+
+
+def _pick(rng, items, description):
+    if len(items) == 0:
+        raise JourneyError("No {} found".format(description))
+    return rng.choice(items)
+
+
+def _paper_titles(body):
+    # the titles of the papers a page links to, path -> title
+    return {path: html.unescape(text).strip() for path, text in _ANCHOR.findall(body) if "/paper/" in path}
+
+
+def login(client, username, password):
+    """
+    Logs a client in.
+    :raises JourneyError: If the username or password is wrong.
+    """
+    path = reverse("login")
+    client.get(path)
+    response = client.post(path, dict(username=username, password=password), follow=False)
+    if response.status != 302:
+        raise JourneyError("Could not log in as {}".format(username))
+
+
+def ensure_collection(client):
+    """
+    Creates the collection that the curator journey adds papers to, unless the logged in
+    user has a collection already.
+    """
+    response = client.get(reverse("collections"))
+    if len(links(response.body, "collection_detail")) == 0:
+        client.post(reverse("collection_create"), dict(name=COLLECTION_NAME, keywords="", description=""))
+
+
+def _browse(client, rng):
+    # home -> search -> paper_detail -> person_detail, returns the paper and the person
+    response = client.get(reverse("home"))
+    titles = _paper_titles(response.body)
+    papers = links(response.body, "paper_detail")
+    path, kwargs = _pick(rng, papers, "papers on the home page, is the catalog empty?")
+
+    # search for a few words of the title of one of the recent papers
+    words = titles.get(path, "").split()
+    if len(words) > 0:
+        start = rng.randrange(len(words))
+        response = client.post(reverse("home"), dict(paper_title=" ".join(words[start:start + SEARCH_WORDS])))
+        results = links(response.body, "paper_detail")
+        if len(results) > 0:
+            path, kwargs = rng.choice(results)
+
+    client.get(path)
+    # the paper page gets its ego network asynchronously
+    response = client.get(reverse("paper_ego_network", kwargs=kwargs))
+    try:
+        elements = json.loads(response.body)
+    except ValueError:
+        raise JourneyError("The ego network of paper {} is not JSON".format(kwargs["id"]))
+    people = [element["data"] for element in elements if element["data"].get("type") == "Person"]
+    person = _pick(rng, people, "authors of paper {}".format(kwargs["id"]))
+
+    client.get(person["href"])
+
+    return kwargs["id"], person
+
+
+def reader(client, rng):
+    """
+    An anonymous user who searches for a paper and looks at one of its authors.
+    """
+    _browse(client, rng)
+
+
+def curator(client, rng):
+    """
+    A logged in user who, after the reader's journey, connects the paper with the author,
+    found by name, and adds the paper to a collection.
+    """
+    paper_id, person = _browse(client, rng)
+
+    # connect author
+    path = reverse("paper_connect_author", kwargs={"id": paper_id})
+    client.get(path)
+    name = "{} {}".format(person["first_name"], person["last_name"])
+    response = client.post(path, dict(person_name=name))
+    people = links(response.body, "paper_connect_author_selected")
+    same = [link for link in people if str(link[1]["aid"]) == person["id"]]
+    connect_path, _ = _pick(rng, same or people, "people named {}".format(name))
+    client.get(connect_path)
+
+    # add to collection
+    response = client.get(reverse("paper_add_to_collection", kwargs={"id": paper_id}))
+    collections = links(response.body, "paper_add_to_collection_selected")
+    add_path, _ = _pick(rng, collections, "collections, was ensure_collection called?")
+    client.get(add_path)
+
+
+JOURNEYS = {
+    "reader": reader,
+    "curator": curator,
+}
@@ -0,0 +1,144 @@
+"""
+The latency percentiles of a load test and their comparison with a baseline.
+
+Requests are summarized by URL name, with " POST" appended for POST requests since, e.g.,
+a search is a POST to the home page. The baseline is the summary of an earlier run saved
+as JSON, e.g., loadtest/baseline.json.
+"""
+import json
+import math
+
+
+PERCENTILES = (50, 95, 99)
+# A percentile regresses if it is more than this fraction slower than in the baseline
+TOLERANCE = 0.2
+# and more than this many milliseconds slower, so that very fast URLs do not fail on noise
+MIN_REGRESSION_MS = 5.0
+# URL names with fewer requests in a run or in the baseline are not compared
+MIN_REQUESTS = 20
+
+
+def percentile(values, pct):
+    """
+    :param values: <list> Sorted numbers.
+    :param pct: <int> A percentile between 0 and 100.
+    :return: The nearest-rank percentile of the values, or None if there are none.
+    """
+    if len(values) == 0:
+        return None
+    rank = max(1, int(math.ceil(pct / 100 * len(values))))
+    return values[rank - 1]
+
+
+def summarize(samples, seconds):
+    """
+    :param samples: <list> The Sample tuples of the requests of a run.
+    :param seconds: <float> How long the run took.
+    :return: <dict> For every URL name, the number of requests and errors, the requests
+    per second, and the p50, p95, p99 and max latencies in milliseconds of the requests
+    that did not fail.
+    """
+    times = {}
+    errors = {}
+    for sample in samples:
+        times.setdefault(sample.url_name, [])
+        errors.setdefault(sample.url_name, 0)
+        if sample.error is None:
+            times[sample.url_name].append(sample.time_ms)
+        else:
+            errors[sample.url_name] += 1
+
+    summary = {}
+    for name, name_times in times.items():
+        name_times.sort()
+        requests = len(name_times) + errors[name]
+        summary[name] = dict(
+            requests=requests,
+            errors=errors[name],
+            rps=round(requests / seconds, 2) if seconds > 0 else None,
+            max=round(name_times[-1], 1) if name_times else None,
+        )
+        for pct in PERCENTILES:
+            value = percentile(name_times, pct)
+            summary[name]["p{}".format(pct)] = round(value, 1) if value is not None else None
+
+    return summary
+
+
+def _cell(value):
+    return "-" if value is None else str(value)
+
+
+def format_summary(summary, baseline=None):
+    """
+    :param summary: <dict> As returned by summarize.
+    :param baseline: <dict> A summary of an earlier run. If given, its p95 is shown too.
+    :return: <str> A table with a row per URL name, the slowest p95 first.
+    """
+    stats_columns = ["requests", "errors", "rps"] + ["p{}".format(pct) for pct in PERCENTILES] + ["max"]
+    columns = ["url name"] + stats_columns
+    if baseline is not None:
+        columns.append("base p95")
+
+    rows = []
+    for name, stats in sorted(summary.items(), key=lambda item: -(item[1]["p95"] or 0)):
+        row = [name] + [_cell(stats[column]) for column in stats_columns]
+        if baseline is not None:
+            row.append(_cell(baseline.get(name, {}).get("p95")))
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows + [columns]) for i in range(len(columns))]
+    lines = ["  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths)))
+             for row in [columns] + rows]
+
+    return "\n".join(lines)
+
+
+def compare(summary, baseline, tolerance=TOLERANCE, min_regression_ms=MIN_REGRESSION_MS):
+    """
+    :param summary: <dict> As returned by summarize.
+    :param baseline: <dict> A summary of an earlier run.
+    :param tolerance: <float> How much slower, as a fraction of the baseline, a percentile
+    can be.
+    :param min_regression_ms: <float> Differences of fewer milliseconds are ignored.
+    :return: <list> (url_name, percentile, baseline ms, ms) for every percentile of a URL
+    name with at least MIN_REQUESTS requests in both summaries that is slower than the
+    tolerance allows, e.g.,
+    ("paper_detail", "p95", 40.0, 65.2).
+    """
+    regressions = []
+    for name in sorted(summary):
+        if name not in baseline or min(summary[name]["requests"], baseline[name]["requests"]) < MIN_REQUESTS:
+            continue
+        for pct in PERCENTILES:
+            key = "p{}".format(pct)
+            value, base = summary[name][key], baseline[name].get(key)
+            if value is None or base is None:
+                continue
+            if value > base * (1 + tolerance) and value - base > min_regression_ms:
+                regressions.append((name, key, base, value))
+
+    return regressions
+
+
+def load_baseline(path):
+    """
+    :param path: <str> The path of a baseline saved by save_baseline.
+    :return: <dict> The summary in the baseline, or None if there is no baseline.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)["summary"]
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, summary, settings):
+    """
+    Saves a summary as the baseline that later runs are compared with.
+    :param settings: <dict> The settings of the run, e.g., the number of users, which are
+    saved with the summary since the latencies depend on them.
+    """
+    with open(path, "w") as f:
+        json.dump(dict(settings=settings, summary=summary), f, indent=2, sort_keys=True)
+        f.write("\n")